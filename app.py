@@ -9,17 +9,25 @@ st.set_page_config(
 )
 
 # ===================== IMPORTS =====================
-from smartops.utils import initialize_app, show_page_header
-from smartops.home import show_home
-from smartops.social_links import show_social_links_manager
-from smartops.python_automation import show_python_automation
-from smartops.ai_assistant import show_ai_assistant
-from smartops.machine_learning import show_machine_learning, show_titanic_survival
-from smartops.computer_vision import show_computer_vision
-from smartops.devops_tools import show_devops_tools
-from smartops.web_js_tasks import show_web_js_tasks
-from smartops.linux_command_manager import show_linux_command_manager
-from smartops.project_links import show_project_links
+import time
+_START = time.perf_counter()
+from smartops.utils import initialize_app, show_page_header, timed_import, show_import_report
+
+# Page modules are imported on first visit, so heavy dependencies
+# (TensorFlow, OpenCV, MediaPipe...) only load for the pages that use them.
+PAGES = {
+    "🏠 Home": ("smartops.home", "show_home"),
+    "🔗 Social Links": ("smartops.social_links", "show_social_links_manager"),
+    "🐍 Python Automation": ("smartops.python_automation", "show_python_automation"),
+    "🤖 AI Assistant": ("smartops.ai_assistant", "show_ai_assistant"),
+    "📊 Machine Learning": ("smartops.machine_learning", "show_machine_learning"),
+    "🚢 Titanic Survival": ("smartops.machine_learning", "show_titanic_survival"),
+    "👁️ Computer Vision": ("smartops.computer_vision", "show_computer_vision"),
+    "🛠️ DevOps Tools": ("smartops.devops_tools", "show_devops_tools"),
+    "🌐 Web/JS Tasks": ("smartops.web_js_tasks", "show_web_js_tasks"),
+    "🐧 Linux Command Manager": ("smartops.linux_command_manager", "show_linux_command_manager"),
+    "📁 Project Links": ("smartops.project_links", "show_project_links"),
+}
 
 # ===================== MAIN =====================
 def main():
@@ -30,47 +38,16 @@ def main():
     with st.sidebar:
         st.title("🔧 SmartOps MenuBase")
         st.markdown("---")
-        page = st.radio(
-            "Navigation",
-            [
-                "🏠 Home",
-                "🔗 Social Links",
-                "🐍 Python Automation",
-                "🤖 AI Assistant",
-                "📊 Machine Learning",
-                "🚢 Titanic Survival",
-                "👁️ Computer Vision",
-                "🛠️ DevOps Tools",
-                "🌐 Web/JS Tasks",
-                "🐧 Linux Command Manager",
-                "📁 Project Links",
-            ],
-            key="page_selector",
-        )
+        page = st.radio("Navigation", list(PAGES), key="page_selector")
 
     # Render pages
-    if page == "🏠 Home":
-        show_home()
-    elif page == "🔗 Social Links":
-        show_social_links_manager()
-    elif page == "🐍 Python Automation":
-        show_python_automation()
-    elif page == "🤖 AI Assistant":
-        show_ai_assistant()
-    elif page == "📊 Machine Learning":
-        show_machine_learning()
-    elif page == "🚢 Titanic Survival":
-        show_titanic_survival()
-    elif page == "👁️ Computer Vision":
-        show_computer_vision()
-    elif page == "🛠️ DevOps Tools":
-        show_devops_tools()
-    elif page == "🌐 Web/JS Tasks":
-        show_web_js_tasks()
-    elif page == "🐧 Linux Command Manager":
-        show_linux_command_manager()
-    elif page == "📁 Project Links":
-        show_project_links()
+    module_name, func_name = PAGES[page]
+    getattr(timed_import(module_name), func_name)()
+
+    with st.sidebar:
+        with st.expander("⏱️ Import Costs"):
+            st.caption(f"This run: {(time.perf_counter() - _START) * 1000:.0f} ms")
+            show_import_report()
 
 # ===================== RUN APP =====================
 if __name__ == "__main__":
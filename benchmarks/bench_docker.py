@@ -0,0 +1,108 @@
+"""
+List/inspect latency of the Docker backends used by the DevOps page.
+
+Runs the same operations through the CLI backend (one `docker` process per
+call) and the Engine API backend (HTTP to the daemon) and reports median and
+p95 latency per operation. Locally the CLI is spawned with subprocess and the
+API talks to the unix socket; with --ssh both go over one paramiko connection,
+the CLI through exec channels and the API through `docker system dial-stdio`.
+
+    python -m benchmarks.bench_docker                          # local daemon
+    python -m benchmarks.bench_docker --ssh root@10.0.0.5 --password secret
+    python -m benchmarks.bench_docker --repeat 50 --output docker_latest.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+DEFAULT_OUTPUT = os.path.join(HERE, "docker_latest.json")
+
+
+def _local_run(command):
+    proc = subprocess.run(command, shell=True, capture_output=True, text=True)
+    return proc.returncode, proc.stdout + proc.stderr
+
+
+def _backends(args):
+    from smartops.docker_backend import CliBackend, _local_api, _ssh_api
+    from smartops.ssh_stream import run_command
+
+    if not args.ssh:
+        return {"cli": CliBackend(_local_run), "api": _local_api()}, None
+    import paramiko
+    user, _, host = args.ssh.rpartition("@")
+    host, _, port = host.partition(":")
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    client.connect(host, port=int(port or 22), username=user or "root", password=args.password, timeout=10)
+    cli = CliBackend(lambda command: run_command(client, command, timeout=60))
+    return {"cli": cli, "api": _ssh_api(client)}, client
+
+
+def _time(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {"median_ms": statistics.median(samples) * 1000,
+            "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000,
+            "calls": repeat}
+
+
+def run_benchmarks(backends, repeat):
+    containers = backends["cli"].list_containers()
+    target = next(iter(containers), None)
+    ops = {"list": lambda b: b.list_containers(),
+           "list_filtered": lambda b: b.list_containers(list(containers)[:5])}
+    if target:
+        ops["inspect"] = lambda b: b.inspect(target)
+    results = {}
+    for op, fn in ops.items():
+        for name, backend in backends.items():
+            fn(backend)  # warm up connections before timing
+            key = f"{op}@{name}"
+            results[key] = _time(lambda: fn(backend), repeat)
+            print(f"{key:22s} {results[key]['median_ms']:9.2f} ms median  {results[key]['p95_ms']:9.2f} ms p95", flush=True)
+        cli, api = results[f"{op}@cli"]["median_ms"], results[f"{op}@api"]["median_ms"]
+        print(f"{'':22s} api is {cli / api if api else float('inf'):.1f}x faster than cli for {op}")
+    return {"containers": len(containers), "results": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ssh", default=None, help="user@host[:port]; default is the local daemon")
+    parser.add_argument("--password", default=os.getenv("SMARTOPS_BENCH_PASSWORD"))
+    parser.add_argument("--repeat", type=int, default=20, help="timed calls per operation and backend")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, ROOT)
+    from smartops.utils import DOCKER_AVAILABLE
+    if not DOCKER_AVAILABLE:
+        print("The docker package is not installed; only the CLI backend exists.")
+        return 1
+
+    backends, client = _backends(args)
+    try:
+        report = run_benchmarks(backends, args.repeat)
+    finally:
+        if client is not None:
+            client.close()
+    report["meta"] = {"python": platform.python_version(), "platform": platform.platform(),
+                      "target": args.ssh or "local", "timestamp": time.time()}
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
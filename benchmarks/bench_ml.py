@@ -0,0 +1,270 @@
+"""
+Benchmarks for the ML page pipelines (Titanic, Churn, Salary).
+
+Each stage runs in a fresh spawned process against the bundled CSVs and
+synthetic copies scaled up by resampling rows, recording wall time, peak
+RSS and throughput. Results are compared against a JSON baseline and the
+run exits non-zero when any stage regresses past the threshold.
+
+    python -m benchmarks.bench_ml                       # compare with baseline
+    python -m benchmarks.bench_ml --update-baseline     # record a new baseline
+    python -m benchmarks.bench_ml --scales 1,10 --stages titanic_train,salary_cv
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+DATASETS = {
+    "titanic": os.path.join(ROOT, "data", "Titanic-Dataset.csv"),
+    "churn": os.path.join(ROOT, "data", "Churn_Modelling.csv"),
+    "salary": os.path.join(ROOT, "data", "SalaryData.csv"),
+}
+DEFAULT_BASELINE = os.path.join(HERE, "ml_baseline.json")
+DEFAULT_OUTPUT = os.path.join(HERE, "ml_latest.json")
+
+
+# ================== STAGES ==================
+# name -> (dataset, setup(path) -> inputs, run(inputs) -> rows processed)
+def _read(path):
+    return pd.read_csv(path)
+
+
+def _titanic_ingest(path):
+    from smartops.ingest import load_csv
+    return len(load_csv(path)[0])
+
+
+def _titanic_features(df):
+    from smartops.ml_pipeline import TitanicFeatures
+    return len(TitanicFeatures().fit_transform(df))
+
+
+def _titanic_train(df):
+    from smartops.ml_pipeline import train_titanic
+    train_titanic(df)
+    return len(df)
+
+
+def _titanic_score_setup(path):
+    from smartops.ml_pipeline import train_titanic
+    df = _read(path)
+    trained = train_titanic(df.head(10_000))
+    return trained["model"], trained["features"], df
+
+
+def _titanic_score(inputs):
+    from smartops.ml_pipeline import score_passengers
+    model, features, df = inputs
+    return len(score_passengers(model, features, df))
+
+
+def _churn_prepare(df):
+    from smartops.ml_pipeline import prepare_churn
+    prepare_churn(df)
+    return len(df)
+
+
+def _churn_train_setup(path):
+    from smartops.ml_pipeline import prepare_churn
+    X_train, _, y_train, _, _ = prepare_churn(_read(path))
+    return X_train, y_train
+
+
+def _churn_train(inputs):
+    from smartops.ml_pipeline import build_churn_model
+    X_train, y_train = inputs
+    build_churn_model(X_train.shape[1]).fit(X_train, y_train, batch_size=32, epochs=1, verbose=0)
+    return len(X_train)
+
+
+def _salary_xy(path):
+    df = _read(path)
+    return df.drop(columns=["Salary"]), df["Salary"]
+
+
+def _salary_train(inputs):
+    from smartops.ml_pipeline import train_salary
+    train_salary(*inputs)
+    return len(inputs[1])
+
+
+def _salary_cv(inputs):
+    from smartops.ml_pipeline import compare_salary_models
+    compare_salary_models(*inputs, folds=3)
+    return len(inputs[1])
+
+
+STAGES = {
+    "titanic_ingest": ("titanic", lambda path: path, _titanic_ingest),
+    "titanic_features": ("titanic", _read, _titanic_features),
+    "titanic_train": ("titanic", _read, _titanic_train),
+    "titanic_score": ("titanic", _titanic_score_setup, _titanic_score),
+    "churn_prepare": ("churn", _read, _churn_prepare),
+    "churn_train": ("churn", _churn_train_setup, _churn_train),
+    "salary_train": ("salary", _salary_xy, _salary_train),
+    "salary_cv": ("salary", _salary_xy, _salary_cv),
+}
+NEEDS_TF = {"churn_train"}
+
+
+# ================== RUNNER ==================
+def scaled_copy(dataset, scale, workdir):
+    """Write `scale` times the rows of a bundled CSV (resampled with replacement) and return its path."""
+    src = DATASETS[dataset]
+    if scale == 1:
+        return src
+    path = os.path.join(workdir, f"{dataset}_x{scale}.csv")
+    if not os.path.exists(path):
+        df = pd.read_csv(src)
+        df.sample(n=len(df) * scale, replace=True, random_state=scale).to_csv(path, index=False)
+    return path
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak / (1024 ** 2 if sys.platform == "darwin" else 1024)
+
+
+def _run_stage(stage, path, repeat, warmup=1):
+    sys.path.insert(0, ROOT)
+    _, setup, run = STAGES[stage]
+    inputs = setup(path)
+    # Untimed runs first, so lazy imports and first-call compilation stay out of the timings
+    for _ in range(warmup):
+        run(inputs)
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = run(inputs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return {"wall_s": best, "peak_rss_mb": _peak_rss_mb(), "rows": rows, "rows_per_s": rows / best if best else 0.0}
+
+
+def _stage_process(queue, stage, path, repeat, warmup):
+    try:
+        queue.put((True, _run_stage(stage, path, repeat, warmup)))
+    except BaseException as e:
+        queue.put((False, f"{type(e).__name__}: {e}"))
+
+
+def _in_fresh_process(ctx, stage, path, repeat, warmup):
+    """
+    Run one stage in its own non-daemon process: a fresh process keeps peak RSS from
+    leaking between measurements, and non-daemon lets joblib start its loky workers
+    (pool workers are daemonic, which silently forces n_jobs=1).
+    """
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_stage_process, args=(queue, stage, path, repeat, warmup))
+    proc.start()
+    try:
+        ok, result = queue.get()
+    finally:
+        proc.join()
+    if not ok:
+        raise RuntimeError(f"{stage} failed: {result}")
+    return result
+
+
+def run_benchmarks(stages, scales, repeat=3, workdir=None, warmup=1):
+    ctx = mp.get_context("spawn")
+    # Scaled copies are large (the 1000x churn CSV is ~700 MB); a workdir we created is removed afterwards
+    own_workdir = workdir is None
+    workdir = workdir or tempfile.mkdtemp(prefix="smartops-bench-")
+    results = {}
+    try:
+        for stage in stages:
+            dataset = STAGES[stage][0]
+            for scale in scales:
+                path = scaled_copy(dataset, scale, workdir)
+                result = _in_fresh_process(ctx, stage, path, repeat, warmup)
+                key = f"{stage}@{scale}x"
+                results[key] = result
+                print(f"{key:28s} {result['wall_s']:9.3f}s  {result['peak_rss_mb']:8.1f} MB  "
+                      f"{result['rows_per_s']:12,.0f} rows/s", flush=True)
+    finally:
+        if own_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return (key, metric, baseline, current) for every metric more than `threshold` worse than baseline."""
+    regressions = []
+    for key, current in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        for metric in ("wall_s", "peak_rss_mb"):
+            if base.get(metric) and current[metric] > base[metric] * (1 + threshold):
+                regressions.append((key, metric, base[metric], current[metric]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stages", default=",".join(STAGES), help="comma-separated stage names")
+    parser.add_argument("--scales", default="1,10,100,1000", help="comma-separated row multipliers")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage; the fastest is kept")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs per stage before timing")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--workdir", default=None, help="where scaled CSV copies are written")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, ROOT)
+    from smartops.utils import TF_AVAILABLE
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(unknown)}")
+    if not TF_AVAILABLE:
+        skipped = [s for s in stages if s in NEEDS_TF]
+        stages = [s for s in stages if s not in NEEDS_TF]
+        if skipped:
+            print(f"TensorFlow not installed, skipping: {', '.join(skipped)}")
+    scales = [int(s) for s in args.scales.split(",")]
+
+    results = run_benchmarks(stages, scales, args.repeat, args.workdir, args.warmup)
+    report = {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(),
+                 "cpus": os.cpu_count(), "timestamp": time.time()},
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one.")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.threshold)
+    for key, metric, base, current in regressions:
+        print(f"REGRESSION {key} {metric}: {base:.3f} -> {current:.3f} (+{(current / base - 1) * 100:.0f}%)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
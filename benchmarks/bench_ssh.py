@@ -0,0 +1,217 @@
+"""
+Throughput benchmarks for remote execution against a local fake SSH server.
+
+The fake server (benchmarks/fake_ssh.py) runs in its own process, so CPU
+figures are the client side only: the pooled paramiko connection,
+RemoteCommand, execute_ssh_command_with_stream, execute_docker_command and
+the Linux page's StreamRenderer loop. Each scenario reports some of
+commands/s, MB/s of streamed output, time to first byte and client CPU per
+command, MB or session. Results are compared against a JSON baseline and the
+run exits non-zero when any metric regresses past the threshold.
+
+    python -m benchmarks.bench_ssh                      # compare with baseline
+    python -m benchmarks.bench_ssh --update-baseline    # record a new baseline
+    python -m benchmarks.bench_ssh --scenarios stream_ssh,linux_loop --mb 256
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+DEFAULT_BASELINE = os.path.join(HERE, "ssh_baseline.json")
+DEFAULT_OUTPUT = os.path.join(HERE, "ssh_latest.json")
+# metric -> True when higher is better
+METRICS = {"cmds_per_s": True, "mb_per_s": True, "ttfb_ms": False, "cpu_ms_per_cmd": False,
+           "cpu_s_per_mb": False, "cpu_ms_per_session": False, "dial_ms": False}
+
+
+class _NullHolder:
+    """Stands in for st.empty() so the renderer's formatting cost is measured without a browser."""
+
+    def code(self, *args, **kwargs):
+        pass
+
+    def caption(self, *args, **kwargs):
+        pass
+
+
+class _Measure:
+    def __enter__(self):
+        self.wall, self.cpu = time.perf_counter(), time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        self.wall = time.perf_counter() - self.wall
+        self.cpu = time.process_time() - self.cpu
+
+
+# ================== SCENARIOS ==================
+# name -> run(ctx) -> metrics; ctx has client, port and the parsed args
+def _exec_small(ctx):
+    from smartops.ssh_stream import RemoteCommand
+    ttfb = []
+    with _Measure() as m:
+        for _ in range(ctx.count):
+            cmd = RemoteCommand(ctx.client, "bench:64")
+            for _ in cmd:
+                pass
+            ttfb.append(cmd.first_byte_at - cmd.started)
+    return {"cmds_per_s": ctx.count / m.wall, "ttfb_ms": statistics.median(ttfb) * 1000,
+            "cpu_ms_per_cmd": m.cpu / ctx.count * 1000}
+
+
+def _exec_parallel(ctx):
+    from smartops.ssh_stream import run_command
+    with _Measure() as m, ThreadPoolExecutor(ctx.threads) as pool:
+        list(pool.map(lambda _: run_command(ctx.client, "bench:64"), range(ctx.count)))
+    return {"cmds_per_s": ctx.count / m.wall, "cpu_ms_per_cmd": m.cpu / ctx.count * 1000}
+
+
+def _docker_cmd(ctx):
+    from smartops.devops_tools import execute_docker_command
+    with _Measure() as m:
+        for _ in range(ctx.count):
+            status, out = execute_docker_command(ctx.client, "ps -a --no-trunc --format '{{json .}}'")
+            if status != 0:
+                raise RuntimeError(out)
+    return {"cmds_per_s": ctx.count / m.wall, "cpu_ms_per_cmd": m.cpu / ctx.count * 1000}
+
+
+def _stream(ctx, stderr_pct):
+    from smartops.devops_tools import execute_ssh_command_with_stream
+    size = ctx.mb * 1024 * 1024
+    start, first = time.perf_counter(), None
+    with _Measure() as m:
+        for _ in execute_ssh_command_with_stream(ctx.client, f"bench:{size}:0:{stderr_pct}"):
+            if first is None:
+                first = time.perf_counter()
+    mb = size / 1024 ** 2
+    return {"mb_per_s": mb / m.wall, "cpu_s_per_mb": m.cpu / mb, "ttfb_ms": (first - start) * 1000}
+
+
+def _linux_loop(ctx):
+    from smartops.ssh_stream import RemoteCommand, STDERR
+    from smartops.stream_render import StreamRenderer
+    size = ctx.mb * 1024 * 1024
+    renderer = StreamRenderer(_NullHolder(), _NullHolder())
+    with _Measure() as m:
+        command = RemoteCommand(ctx.client, f"bench:{size}")
+        for stream, text in command:
+            if stream != STDERR:
+                renderer.feed(text, command.bytes_received)
+        os.remove(renderer.close())
+    mb = size / 1024 ** 2
+    return {"mb_per_s": mb / m.wall, "cpu_s_per_mb": m.cpu / mb,
+            "ttfb_ms": (command.first_byte_at - command.started) * 1000}
+
+
+def _sessions(ctx):
+    import paramiko
+    from smartops.ssh_stream import run_command
+    count = max(1, ctx.count // 20)
+    with _Measure() as m:
+        for _ in range(count):
+            client = paramiko.SSHClient()
+            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            client.connect("127.0.0.1", ctx.port, "bench", "bench", look_for_keys=False, allow_agent=False)
+            run_command(client, "bench:64")
+            client.close()
+    return {"dial_ms": m.wall / count * 1000, "cpu_ms_per_session": m.cpu / count * 1000}
+
+
+SCENARIOS = {
+    "exec_small": _exec_small,
+    "exec_parallel": _exec_parallel,
+    "docker_cmd": _docker_cmd,
+    "stream_ssh": lambda ctx: _stream(ctx, 0),
+    "stream_stderr": lambda ctx: _stream(ctx, 30),
+    "linux_loop": _linux_loop,
+    "sessions": _sessions,
+}
+
+
+# ================== RUNNER ==================
+def run_benchmarks(scenarios, args, port):
+    from smartops.ssh_pool import get_ssh_pool
+    _, args.client = get_ssh_pool().connect("127.0.0.1", "bench", "bench", port=port)
+    args.port = port
+    results = {}
+    for name in scenarios:
+        runs = [SCENARIOS[name](args) for _ in range(args.repeat)]
+        # Keep the best value of each metric across repeats
+        result = {k: (max if METRICS[k] else min)(r[k] for r in runs) for k in runs[0]}
+        results[name] = result
+        print(f"{name:16s} " + "  ".join(f"{k}={v:,.2f}" for k, v in result.items()), flush=True)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return (scenario, metric, baseline, current) for every metric more than `threshold` worse than baseline."""
+    regressions = []
+    for name, current in results.items():
+        for metric, value in current.items():
+            base = baseline.get(name, {}).get(metric)
+            if not base:
+                continue
+            worse = value < base / (1 + threshold) if METRICS[metric] else value > base * (1 + threshold)
+            if worse:
+                regressions.append((name, metric, base, value))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated scenario names")
+    parser.add_argument("--count", type=int, default=200, help="commands per command-rate scenario")
+    parser.add_argument("--threads", type=int, default=8, help="client threads for exec_parallel")
+    parser.add_argument("--mb", type=int, default=64, help="MB streamed by the throughput scenarios")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scenario; the best is kept")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed regression, 0.25 = 25%%")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, ROOT)
+    from benchmarks.fake_ssh import fake_ssh_process
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = [s for s in scenarios if s not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    with fake_ssh_process() as port:
+        results = run_benchmarks(scenarios, args, port)
+    report = {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(),
+                 "cpus": os.cpu_count(), "timestamp": time.time()},
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one.")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.threshold)
+    for name, metric, base, current in regressions:
+        print(f"REGRESSION {name} {metric}: {base:.3f} -> {current:.3f}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+"""
+In-process SSH stand-in for benchmarking remote execution without a real host.
+
+FakeSSHServer listens on 127.0.0.1, accepts password logins and answers exec
+requests with synthetic output: `docker --version`, `docker ps --format
+'{{json .}}'` and `docker events` are faked closely enough for the DevOps
+page, `docker logs` returns a few log lines (one of them 100 000 characters
+long) and with `--follow` keeps adding one every 50 ms, `sleep <s>` stays
+silent for that long, and every other command streams `output_bytes` of text after `latency`
+seconds, with `stderr_ratio` of it on stderr. A command of the form
+`bench:<bytes>[:<latency ms>[:<stderr %>]]` overrides those per call.
+
+    with FakeSSHServer(output_bytes=1 << 20) as server:
+        client.connect("127.0.0.1", server.port, server.username, server.password)
+
+`fake_ssh_process(...)` runs the same server in a spawned process so its CPU
+time is not charged to the client being measured.
+"""
+import contextlib
+import json
+import logging
+import multiprocessing as mp
+import socket
+import threading
+import time
+
+import paramiko
+
+BLOCK_SIZE = 32 * 1024
+LINE = b"smartops benchmark output line 0123456789 abcdefghijklmnopqrstuvwxyz ABCDEFGHIJKLMNOP\n"
+_BLOCK = (LINE * (BLOCK_SIZE // len(LINE) + 1))[:BLOCK_SIZE]
+_HOST_KEY = None
+_HOST_KEY_LOCK = threading.Lock()
+
+
+def _host_key():
+    global _HOST_KEY
+    with _HOST_KEY_LOCK:
+        if _HOST_KEY is None:
+            _HOST_KEY = paramiko.RSAKey.generate(2048)
+        return _HOST_KEY
+
+
+class _Interface(paramiko.ServerInterface):
+    def __init__(self, server):
+        self.server = server
+
+    def get_allowed_auths(self, username):
+        return "password"
+
+    def check_auth_password(self, username, password):
+        ok = (username, password) == (self.server.username, self.server.password)
+        return paramiko.AUTH_SUCCESSFUL if ok else paramiko.AUTH_FAILED
+
+    def check_channel_request(self, kind, chanid):
+        return paramiko.OPEN_SUCCEEDED if kind == "session" else paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_pty_request(self, channel, term, width, height, pixelwidth, pixelheight, modes):
+        return True
+
+    def check_channel_exec_request(self, channel, command):
+        # Only queued here: paramiko sends the exec reply after this returns, so nothing may be written yet
+        self.server._queue_command(channel, command.decode("utf-8", errors="replace"))
+        return True
+
+
+class FakeSSHServer:
+    def __init__(self, output_bytes=64 * 1024, latency=0.0, stderr_ratio=0.0, containers=20,
+                 username="bench", password="bench", port=0):
+        self.output_bytes = output_bytes
+        self.latency = latency
+        self.stderr_ratio = stderr_ratio
+        self.containers = containers
+        self.username = username
+        self.password = password
+        self.port = port
+        self.sessions = 0
+        self.commands = 0
+        self.bytes_sent = 0
+        self._stop = threading.Event()
+        self._sock = None
+        self._transports = []
+        self._commands = {}
+        self._channels = set()
+        self._lock = threading.Lock()
+        self._queued = threading.Condition(self._lock)
+
+    # ---- lifecycle ----
+    def start(self):
+        _host_key()
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(("127.0.0.1", self.port))
+        self._sock.listen(128)
+        self._sock.settimeout(0.5)
+        self.port = self._sock.getsockname()[1]
+        threading.Thread(target=self._serve, daemon=True, name="fake-ssh").start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._sock.close()
+        with self._lock:
+            transports = list(self._transports)
+        for t in transports:
+            t.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _serve(self):
+        while not self._stop.is_set():
+            try:
+                sock, _ = self._sock.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            # As sshd does; otherwise Nagle plus delayed ACKs add ~40 ms to every small reply
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            threading.Thread(target=self._session, args=(sock,), daemon=True).start()
+
+    def _session(self, sock):
+        transport = paramiko.Transport(sock)
+        transport.add_server_key(_host_key())
+        with self._lock:
+            self._transports.append(transport)
+            self.sessions += 1
+        try:
+            transport.start_server(server=_Interface(self))
+            # The transport only keeps weak references to channels; hold each one until its command is done
+            while transport.is_active() and not self._stop.is_set():
+                channel = transport.accept(timeout=1)
+                if channel is not None:
+                    with self._lock:
+                        self._channels.add(channel)
+                    threading.Thread(target=self._exec, args=(channel,), daemon=True).start()
+        except Exception:
+            pass
+        finally:
+            transport.close()
+            with self._lock:
+                self._transports.remove(transport)
+
+    # ---- fake commands ----
+    def _queue_command(self, channel, command):
+        with self._queued:
+            self._commands[channel.get_id()] = command
+            self._queued.notify_all()
+
+    def _exec(self, channel, wait=10):
+        try:
+            with self._queued:
+                if not self._queued.wait_for(lambda: channel.get_id() in self._commands or channel.closed, wait):
+                    return
+                command = self._commands.pop(channel.get_id(), None)
+                if command is None:
+                    return
+                self.commands += 1
+            status = self._dispatch(channel, command.strip())
+            channel.send_exit_status(status)
+            channel.shutdown_write()
+            # Let the client close first: closing here could beat paramiko's exec reply to the wire,
+            # and the client would see the channel closed before exec_command returned
+            deadline = time.monotonic() + wait
+            while not channel.closed and time.monotonic() < deadline:
+                time.sleep(0.005)
+        except Exception:
+            pass
+        finally:
+            channel.close()
+            with self._lock:
+                self._channels.discard(channel)
+                self._commands.pop(channel.get_id(), None)
+
+    def _dispatch(self, channel, command):
+        if command.startswith("bench:"):
+            parts = command.split(":")[1:] + ["", "", ""]
+            size = int(parts[0] or self.output_bytes)
+            latency = float(parts[1]) / 1000 if parts[1] else self.latency
+            ratio = float(parts[2]) / 100 if parts[2] else self.stderr_ratio
+            return self._stream(channel, size, latency, ratio)
+        if command == "docker --version":
+            return self._send(channel, b"Docker version 24.0.7, build fake\n")
+        if command.startswith("docker ps"):
+            rows = [json.dumps({"ID": f"{i:064x}", "Names": f"bench-{i}", "Image": "nginx:latest",
+                                "State": "running", "Status": "Up 2 hours", "Ports": "80/tcp"})
+                    for i in range(self.containers)]
+            return self._send(channel, ("\n".join(rows) + "\n").encode("utf-8"))
+        if command.startswith("docker events"):
+            while not channel.closed and not self._stop.is_set():
+                time.sleep(0.1)
+            return 0
+        if command.startswith("docker logs"):
+            return self._logs(channel, follow="--follow" in command.split())
+        if command.startswith("sleep "):
+            deadline = time.monotonic() + float(command.split()[1])
+            while not channel.closed and not self._stop.is_set() and time.monotonic() < deadline:
+                time.sleep(0.05)
+            return 0
+        if command == "false":
+            return 1
+        return self._stream(channel, self.output_bytes, self.latency, self.stderr_ratio)
+
+    def _logs(self, channel, follow):
+        self._send(channel, b"INFO started\n")
+        self._send(channel, b"ERROR failed to bind\n", stderr=True)
+        self._send(channel, b"x" * 100_000 + b"\nWARN slow request")
+        n = 0
+        while follow and not channel.closed and not self._stop.is_set():
+            time.sleep(0.05)
+            n += 1
+            self._send(channel, f"\nINFO tick {n}".encode("utf-8"))
+        return 0
+
+    def _send(self, channel, data, stderr=False):
+        (channel.sendall_stderr if stderr else channel.sendall)(data)
+        with self._lock:
+            self.bytes_sent += len(data)
+        return 0
+
+    def _stream(self, channel, size, latency, stderr_ratio):
+        if latency:
+            time.sleep(latency)
+        sent = err_sent = 0
+        while sent < size:
+            block = _BLOCK[:min(BLOCK_SIZE, size - sent)]
+            # Keep the running stderr share at stderr_ratio without randomness
+            to_stderr = err_sent < (sent + len(block)) * stderr_ratio
+            self._send(channel, block, stderr=to_stderr)
+            sent += len(block)
+            err_sent += len(block) if to_stderr else 0
+        return 0
+
+
+def _serve_process(config, ready):
+    # Clients hanging up mid-read is routine here; keep paramiko's server-side errors off the report
+    logging.getLogger("paramiko").addHandler(logging.NullHandler())
+    server = FakeSSHServer(**config).start()
+    ready.put(server.port)
+    server._stop.wait()
+
+
+@contextlib.contextmanager
+def fake_ssh_process(**config):
+    """FakeSSHServer in a spawned process; yields its port."""
+    ctx = mp.get_context("spawn")
+    ready = ctx.Queue()
+    proc = ctx.Process(target=_serve_process, args=(config, ready), daemon=True)
+    proc.start()
+    try:
+        yield ready.get(timeout=60)
+    finally:
+        proc.terminate()
+        proc.join()
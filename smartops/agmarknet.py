@@ -0,0 +1,104 @@
+import json
+import os
+import threading
+import time
+
+import streamlit as st
+
+URL = "https://agmarknet.gov.in/"
+DATA_FILE = os.path.join("data", ".cache", "agmarknet.json")
+TTL_SECONDS = 6 * 3600
+RETRY_SECONDS = 10 * 60
+MAX_CHARS = 5000
+
+
+def scrape(url=URL, timeout=10):
+    import requests
+    from bs4 import BeautifulSoup
+
+    response = requests.get(url, timeout=timeout)
+    response.raise_for_status()
+    return BeautifulSoup(response.text, "html.parser").get_text()[:MAX_CHARS]
+
+
+class AgmarknetCache:
+    """
+    Scraped agmarknet text for the Agriculture Assistant prompt. The last copy
+    is kept in DATA_FILE so a restart serves it immediately; a background thread
+    re-scrapes once it is older than `ttl`, so no page render waits on the site.
+    """
+
+    def __init__(self, path=DATA_FILE, ttl=TTL_SECONDS):
+        self.path = path
+        self.ttl = ttl
+        self.text = ""
+        self.fetched_at = None
+        self.error = None
+        self.refreshing = False
+        self._force = False
+        self._wake = threading.Event()
+        self._load()
+        threading.Thread(target=self._refresh_loop, daemon=True, name="agmarknet").start()
+
+    def _load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r") as f:
+                    saved = json.load(f)
+                self.text, self.fetched_at = saved["text"], saved["fetched_at"]
+            except (OSError, ValueError, KeyError):
+                pass
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"text": self.text, "fetched_at": self.fetched_at}, f)
+        os.replace(tmp, self.path)
+
+    def age(self):
+        return time.time() - self.fetched_at if self.fetched_at else None
+
+    def stale(self):
+        age = self.age()
+        return age is None or age > self.ttl
+
+    def refresh(self):
+        """Ask the background thread to scrape now."""
+        self._force = True
+        self._wake.set()
+
+    def _refresh_loop(self):
+        while True:
+            if self._force or self.stale():
+                self._force = False
+                self.refreshing = True
+                try:
+                    self.text = scrape()
+                    self.fetched_at = time.time()
+                    self.error = None
+                    self._save()
+                except Exception as e:
+                    self.error = str(e)
+                finally:
+                    self.refreshing = False
+            age = self.age()
+            wait = self.ttl - age if age is not None and not self.error else RETRY_SECONDS
+            self._wake.wait(timeout=max(1, wait))
+            self._wake.clear()
+
+
+@st.cache_resource
+def get_agmarknet_cache():
+    return AgmarknetCache()
+
+
+def staleness_caption(cache):
+    if cache.refreshing and not cache.text:
+        return "⏳ Fetching agmarknet market data in the background..."
+    age = cache.age()
+    if age is None:
+        return f"⚠️ agmarknet data unavailable{f': {cache.error}' if cache.error else ''}. Answers use general knowledge."
+    age_text = f"{age / 60:.0f} min" if age < 7200 else f"{age / 3600:.1f} h"
+    suffix = " · refreshing now" if cache.refreshing else (" · last refresh failed" if cache.error else "")
+    return f"📡 agmarknet data fetched {age_text} ago{suffix}"
@@ -2,40 +2,40 @@
 import os
 import streamlit as st
 from dotenv import load_dotenv
-import requests
-from bs4 import BeautifulSoup
-
-# =================== Load Gemini API Key ===================
-load_dotenv()
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-if not GEMINI_API_KEY:
-    st.error("⚠️ GEMINI_API_KEY not found in .env. Add GEMINI_API_KEY=your_key and restart app.")
-    st.stop()
-
-import google.generativeai as genai
-genai.configure(api_key=GEMINI_API_KEY)
-
-# Try initializing model
-try:
-    model = genai.GenerativeModel("gemini-2.0-flash")
-except Exception as e:
-    st.error(f"Failed to initialize Gemini model: {e}")
-    st.stop()
-
-# =================== Agriculture Data Scraping ===================
-try:
-    url = "https://agmarknet.gov.in/"
-    response = requests.get(url, timeout=10)
-    soup = BeautifulSoup(response.text, "html.parser")
-    agriculture_data = soup.get_text()[:5000]  # limit to 5000 chars
-except Exception:
-    agriculture_data = ""
+from smartops.agmarknet import get_agmarknet_cache, staleness_caption, TTL_SECONDS as AGMARKNET_TTL
+from smartops.llm_stream import stream_response, show_latency_stats
+from smartops.llm_cache import cached_response, show_cache_stats
+
+MODEL_NAME = "gemini-2.0-flash"
+# How long cached answers are reused; agriculture follows the scrape refresh interval.
+# Answers to typed questions (dreams, agriculture) are cached in memory only, never on disk.
+SLEEP_TIPS_TTL = 7 * 24 * 3600
+DREAM_TTL = 24 * 3600
+
+# =================== Gemini Client (created on first use) ===================
+@st.cache_resource
+def get_gemini_model():
+    load_dotenv()
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        raise RuntimeError("GEMINI_API_KEY not found in .env. Add GEMINI_API_KEY=your_key and reload this page.")
+    import google.generativeai as genai
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(MODEL_NAME)
 
 # =================== Main Function ===================
 def show_ai_assistant():
     st.title("🤖 AI Assistant Suite")
     st.markdown("This app contains three sections: **General AI Chat**, **Dream Analyzer**, and **Agriculture Assistant**.")
 
+    try:
+        model = get_gemini_model()
+    except Exception as e:
+        st.error(f"⚠️ {e}")
+        return
+    agmarknet = get_agmarknet_cache()
+    bypass = st.toggle("Bypass response cache", help="Always ask Gemini; the fresh answer replaces the cached one.")
+
     tab1, tab2, tab3 = st.tabs(["💬 AI Chat", "💤 Dream Analyzer", "🌾 Agriculture Assistant"])
 
     # =================== Tab 1: AI Chat ===================
@@ -60,11 +60,10 @@ def show_ai_assistant():
             with st.chat_message("assistant"):
                 placeholder = st.empty()
                 try:
-                    resp = model.generate_content(prompt)
-                    text = getattr(resp, "text", "No response generated")
-                    placeholder.markdown(text)
+                    text = stream_response(model, prompt, placeholder, "chat") or "No response generated"
                 except Exception as e:
-                    placeholder.markdown("Error occurred")
+                    text = "Error occurred"
+                    placeholder.markdown(text)
                     st.error(e)
                 st.session_state.messages.append({"role": "assistant", "content": text})
 
@@ -77,20 +76,20 @@ def show_ai_assistant():
     with tab2:
         st.subheader("Dream Analyzer + Sleep Tips")
         dream = st.text_area("Describe your dream:", height=150)
+        st.caption(f"Interpretations are cached in server memory for up to {DREAM_TTL // 3600} h and never written to disk.")
         if st.button("🔍 Analyze Dream"):
             if dream.strip():
                 try:
-                    dream_resp = model.generate_content(
-                        f"I had this dream: {dream}. Please interpret it psychologically using symbols, emotions, and subconscious patterns."
-                    )
                     st.markdown("### 🔮 Interpretation")
-                    st.write(dream_resp.text)
-
-                    tips_resp = model.generate_content(
-                        "Suggest 5 short tips for better sleep and peaceful dreams."
+                    cached_response(
+                        model,
+                        f"I had this dream: {dream}. Please interpret it psychologically using symbols, emotions, and subconscious patterns.",
+                        st.empty(), "dream", ttl=DREAM_TTL, bypass=bypass, persist=False,
                     )
+
                     st.markdown("### 💤 Sweet Sleep Tips")
-                    st.markdown(tips_resp.text)
+                    cached_response(model, "Suggest 5 short tips for better sleep and peaceful dreams.", st.empty(), "sleep_tips",
+                                    ttl=SLEEP_TIPS_TTL, bypass=bypass)
                 except Exception as e:
                     st.error(f"Error: {e}")
             else:
@@ -100,6 +99,10 @@ def show_ai_assistant():
     with tab3:
         st.subheader("AI Agriculture Assistant")
         st.write("Ask anything related to agriculture, mandi prices, crops, government schemes, etc.")
+        c1, c2 = st.columns([4, 1])
+        c1.caption(staleness_caption(agmarknet))
+        if c2.button("🔄 Refresh data", disabled=agmarknet.refreshing):
+            agmarknet.refresh()
 
         userprompt = st.text_input("Enter your agriculture-related question:")
         if userprompt:
@@ -108,15 +111,20 @@ You are an expert AI assistant in Indian agriculture and agri-marketing.
 Help farmers, students, and policymakers with accurate answers.
 
 Use the following scraped website data if relevant:
-{agriculture_data}
+{agmarknet.text}
 
 User question: {userprompt}
 
 Provide a clear and helpful answer.
 """
             try:
-                response = model.generate_content(prompt)
                 st.markdown("### 🤖 Answer")
-                st.write(response.text)
+                cached_response(model, prompt, st.empty(), "agriculture", ttl=AGMARKNET_TTL, bypass=bypass,
+                                persist=False)
             except Exception as e:
                 st.error(f"❌ Error: {str(e)}")
+
+    with st.expander("⏱️ Response Latency"):
+        show_latency_stats()
+    with st.expander("🗃️ Response Cache"):
+        show_cache_stats()
@@ -0,0 +1,130 @@
+import errno
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+ARTIFACT_DIR = os.getenv("SMARTOPS_ARTIFACT_DIR", "artifacts")
+
+
+def spec_hash(spec):
+    """Short stable hash of a JSON-serialisable spec (architecture, hyperparameters...)."""
+    return hashlib.sha256(json.dumps(spec, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:12]
+
+
+class ArtifactStore:
+    """
+    Versioned on-disk store for trained models.
+
+    Layout: <root>/<name>/<dataset hash>-<architecture hash>/v0001/
+        meta.json     dataset hash, architecture, hyperparameters, timestamp
+        scaler.pkl    fitted preprocessing object
+        weights.npz   model weights as a list of numpy arrays
+        metrics.json  evaluation results
+    """
+
+    def __init__(self, root=ARTIFACT_DIR):
+        self.root = root
+
+    def _family_dir(self, name, dataset_hash, architecture):
+        return os.path.join(self.root, name, f"{dataset_hash[:16]}-{spec_hash(architecture)}")
+
+    def _versions(self, family_dir):
+        if not os.path.isdir(family_dir):
+            return []
+        return sorted(d for d in os.listdir(family_dir) if d.startswith("v") and d[1:].isdigit())
+
+    def save(self, name, dataset_hash, architecture, params, scaler, weights, metrics, before_publish=None):
+        """
+        Write a new version and return its path. `before_publish(tmp_dir)` may add
+        extra files or veto the version by raising; nothing is published then.
+        """
+        family_dir = self._family_dir(name, dataset_hash, architecture)
+        os.makedirs(family_dir, exist_ok=True)
+        # Unique scratch directory per writer; the dot prefix keeps it out of _versions
+        tmp = tempfile.mkdtemp(prefix=".tmp-", dir=family_dir)
+        try:
+            meta = {
+                "name": name,
+                "version": None,
+                "dataset_hash": dataset_hash,
+                "architecture": architecture,
+                "params": params,
+                "params_hash": spec_hash(params),
+                "created": time.time(),
+            }
+            with open(os.path.join(tmp, "scaler.pkl"), "wb") as f:
+                pickle.dump(scaler, f, protocol=pickle.HIGHEST_PROTOCOL)
+            np.savez(os.path.join(tmp, "weights.npz"), *weights)
+            with open(os.path.join(tmp, "metrics.json"), "w") as f:
+                json.dump(metrics, f, indent=2, default=_to_json)
+            if before_publish is not None:
+                before_publish(tmp)
+            return self._publish(family_dir, tmp, meta)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+    def _publish(self, family_dir, tmp, meta):
+        """
+        Claim the next free version by renaming `tmp` onto it. Published versions
+        are never empty, so the rename fails if a concurrent writer got there first
+        and we retry with the following number.
+        """
+        while True:
+            versions = self._versions(family_dir)
+            version = int(versions[-1][1:]) + 1 if versions else 1
+            meta["version"] = version
+            with open(os.path.join(tmp, "meta.json"), "w") as f:
+                json.dump(meta, f, indent=2, default=str)
+            path = os.path.join(family_dir, f"v{version:04d}")
+            try:
+                # Rename last so a half-written version is never picked up
+                os.rename(tmp, path)
+                return path
+            except OSError as e:
+                if e.errno not in (errno.EEXIST, errno.ENOTEMPTY) and not os.path.exists(path):
+                    raise
+
+    def load(self, path):
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        with open(os.path.join(path, "scaler.pkl"), "rb") as f:
+            scaler = pickle.load(f)
+        with np.load(os.path.join(path, "weights.npz")) as npz:
+            weights = [npz[f"arr_{i}"] for i in range(len(npz.files))]
+        with open(os.path.join(path, "metrics.json")) as f:
+            metrics = json.load(f)
+        return {"path": path, "meta": meta, "scaler": scaler, "weights": weights, "metrics": metrics}
+
+    def find(self, name, dataset_hash, architecture, params=None):
+        """
+        Path of the newest version for this dataset + architecture, or None.
+        When `params` is given only versions trained with the same hyperparameters match.
+        """
+        family_dir = self._family_dir(name, dataset_hash, architecture)
+        wanted = spec_hash(params) if params is not None else None
+        for version in reversed(self._versions(family_dir)):
+            path = os.path.join(family_dir, version)
+            if wanted is None:
+                return path
+            try:
+                with open(os.path.join(path, "meta.json")) as f:
+                    if json.load(f).get("params_hash") == wanted:
+                        return path
+            except (OSError, ValueError):
+                continue
+        return None
+
+
+def _to_json(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
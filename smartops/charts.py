@@ -0,0 +1,85 @@
+import io
+import json
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from smartops.utils import lazy_import, MATPLOTLIB_AVAILABLE
+
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
+
+NATIVE = "⚡ Native"
+MATPLOTLIB = "🖼️ Matplotlib"
+# Matplotlib is offered only when matplotlib and seaborn are installed
+CHART_RENDERERS = [NATIVE, MATPLOTLIB] if MATPLOTLIB_AVAILABLE else [NATIVE]
+
+
+def chart_renderer_picker(key):
+    return st.radio("Chart renderer", CHART_RENDERERS, horizontal=True, key=key,
+                    help="Native charts skip matplotlib entirely; matplotlib charts are rendered once and cached as PNG.")
+
+
+# ================== DATA ==================
+def count_table(dataset, by, hue):
+    """Rows of `by`, columns of `hue`, cell = number of rows (one vectorized groupby)."""
+    return dataset.groupby([by, hue], observed=True).size().unstack(hue, fill_value=0)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def grouped_counts(dataset_hash, _dataset, by, hue):
+    """`count_table` computed once per dataset hash; `_dataset` itself is not hashed."""
+    return count_table(_dataset, by, hue)
+
+
+# ================== PNG RENDERING ==================
+def _png(fig):
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", bbox_inches="tight", dpi=100)
+    plt.close(fig)
+    return buf.getvalue()
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def bar_png(dataset_hash, spec, _counts):
+    """Grouped bar chart as PNG bytes, cached on dataset hash + chart spec (a JSON string)."""
+    opts = json.loads(spec)
+    fig, ax = plt.subplots()
+    _counts.plot.bar(ax=ax, rot=0)
+    ax.set_title(opts["title"])
+    ax.set_xlabel(opts["by"]); ax.set_ylabel("count")
+    ax.legend(title=opts["hue"])
+    return _png(fig)
+
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def heatmap_png(cells, title):
+    fig, ax = plt.subplots()
+    sns.heatmap(np.asarray(cells), annot=True, fmt='d', cmap='Blues', ax=ax)
+    ax.set_xlabel('Predicted'); ax.set_ylabel('Actual')
+    ax.set_title(title)
+    return _png(fig)
+
+
+# ================== PAGE HELPERS ==================
+def show_count_chart(dataset_hash, dataset, by, hue, title, renderer=NATIVE):
+    counts = grouped_counts(dataset_hash, dataset, by, hue)
+    if renderer == NATIVE:
+        st.markdown(f"**{title}**")
+        native = counts.copy()
+        native.index = native.index.astype(str)
+        native.columns = [f"{hue}={c}" for c in native.columns]
+        st.bar_chart(native)
+    else:
+        spec = json.dumps({"by": by, "hue": hue, "title": title}, sort_keys=True)
+        st.image(bar_png(dataset_hash, spec, counts))
+
+
+def show_confusion_matrix(cm, renderer=NATIVE, title='Confusion Matrix'):
+    cells = tuple(tuple(int(v) for v in row) for row in np.asarray(cm))
+    if renderer == NATIVE:
+        st.markdown(f"**{title}**")
+        labels = range(len(cells))
+        st.table(pd.DataFrame(cells, index=[f"Actual {i}" for i in labels], columns=[f"Predicted {i}" for i in labels]))
+    else:
+        st.image(heatmap_png(cells, title))
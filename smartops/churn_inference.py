@@ -0,0 +1,117 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Pure-numpy forward pass for the churn network: no TensorFlow import anywhere in this module.
+INFERENCE_FILE = "inference.npz"
+BLOCK_ROWS = 262_144
+TOLERANCE = 1e-4
+
+_ACTIVATIONS = {
+    "relu": lambda z: np.maximum(z, 0, out=z),
+    "sigmoid": lambda z: np.reciprocal(1 + np.exp(-z, out=z), out=z),
+    "linear": lambda z: z,
+}
+
+
+class ChurnNumpyModel:
+    """
+    Dense network + standard scaling stored as plain float32 arrays.
+    Inputs are raw customer rows (a DataFrame with the churn columns); one-hot
+    columns are rebuilt from the stored column names so single rows and
+    batches encode identically.
+    """
+
+    def __init__(self, weights, biases, activations, mean, scale, columns):
+        self.weights = [np.ascontiguousarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in biases]
+        self.activations = list(activations)
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.scale = np.asarray(scale, dtype=np.float32)
+        self.columns = list(columns)
+
+    @classmethod
+    def from_training(cls, weights, architecture, scaler):
+        """Build from Keras `get_weights()` output ([W0, b0, W1, b1, ...]) and a fitted StandardScaler."""
+        return cls(weights[0::2], weights[1::2], [layer["activation"] for layer in architecture],
+                   scaler.mean_, scaler.scale_, scaler.feature_names_in_)
+
+    def save(self, path):
+        arrays = {"activations": np.array(self.activations), "columns": np.array(self.columns),
+                  "mean": self.mean, "scale": self.scale}
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            arrays[f"W{i}"], arrays[f"b{i}"] = w, b
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as npz:
+            layers = len([k for k in npz.files if k.startswith("W")])
+            return cls([npz[f"W{i}"] for i in range(layers)], [npz[f"b{i}"] for i in range(layers)],
+                       npz["activations"].tolist(), npz["mean"], npz["scale"], npz["columns"].tolist())
+
+    def encode(self, df):
+        """Raw churn rows -> float32 feature matrix in training column order."""
+        X = np.empty((len(df), len(self.columns)), dtype=np.float32)
+        for j, col in enumerate(self.columns):
+            if col in df.columns:
+                X[:, j] = df[col].to_numpy(dtype=np.float32)
+            else:
+                # One-hot column such as Geo_Germany / Gender_Male
+                source, _, level = col.partition("_")
+                source = {"Geo": "Geography"}.get(source, source)
+                X[:, j] = (df[source].astype(str).to_numpy() == level)
+        return X
+
+    def forward(self, X):
+        """Scaled feature matrix in, probabilities out."""
+        z = X
+        for w, b, act in zip(self.weights, self.biases, self.activations):
+            z = z @ w
+            z += b
+            z = _ACTIVATIONS[act](z)
+        return z[:, 0]
+
+    def predict_proba(self, df, block_rows=BLOCK_ROWS):
+        """Churn probability per row, computed in vectorized blocks to bound memory."""
+        out = np.empty(len(df), dtype=np.float32)
+        for start in range(0, len(df), block_rows):
+            block = df.iloc[start:start + block_rows]
+            X = self.encode(block)
+            X -= self.mean
+            X /= self.scale
+            out[start:start + len(block)] = self.forward(X)
+        return out
+
+
+def export_churn_inference(artifact_path, weights, architecture, scaler, keras_model=None, X_check=None):
+    """
+    Write inference.npz into an artifact directory. When a Keras model and
+    scaled sample are given, the numpy outputs are checked against Keras and
+    the max absolute difference is returned.
+    """
+    model = ChurnNumpyModel.from_training(weights, architecture, scaler)
+    diff = None
+    if keras_model is not None and X_check is not None:
+        expected = keras_model.predict(X_check, verbose=0)[:, 0]
+        diff = float(np.max(np.abs(model.forward(np.asarray(X_check, dtype=np.float32)) - expected)))
+        if diff > TOLERANCE:
+            raise ValueError(f"numpy churn model differs from Keras by {diff:.2e} (tolerance {TOLERANCE:.0e})")
+    model.save(os.path.join(artifact_path, INFERENCE_FILE))
+    return diff
+
+
+def load_churn_inference(artifact):
+    """Numpy model for a loaded artifact; older artifacts without inference.npz are converted on the fly."""
+    path = os.path.join(artifact["path"], INFERENCE_FILE)
+    if os.path.exists(path):
+        return ChurnNumpyModel.load(path)
+    return ChurnNumpyModel.from_training(artifact["weights"], artifact["meta"]["architecture"], artifact["scaler"])
+
+
+def score_customers(model, df):
+    out = df.copy()
+    out["Churn_Probability"] = model.predict_proba(df)
+    out["Predicted_Exited"] = (out["Churn_Probability"] >= 0.5).astype(np.uint8)
+    return out
@@ -1,17 +1,13 @@
 import time, threading, subprocess, platform
 import streamlit as st
 from streamlit_webrtc import VideoTransformerBase
-from smartops.utils import show_page_header, CV2_AVAILABLE, MEDIAPIPE_AVAILABLE, WEBRTC_AVAILABLE
-if CV2_AVAILABLE:
-    import cv2
-if MEDIAPIPE_AVAILABLE:
-    import mediapipe as mp
-    mp_hands = mp.solutions.hands
-    mp_drawing = mp.solutions.drawing_utils
-    mp_drawing_styles = mp.solutions.drawing_styles
+from smartops.utils import show_page_header, lazy_import, CV2_AVAILABLE, MEDIAPIPE_AVAILABLE, WEBRTC_AVAILABLE
+# cv2 / mediapipe / av load on first use (first video frame), not at page import
+cv2 = lazy_import("cv2")
+mp = lazy_import("mediapipe")
+av = lazy_import("av")
 if WEBRTC_AVAILABLE:
     from streamlit_webrtc import webrtc_streamer, VideoTransformerBase, RTCConfiguration
-    import av
 
 class HandGestureTransformer(VideoTransformerBase):
     def __init__(self):
@@ -20,7 +16,7 @@ class HandGestureTransformer(VideoTransformerBase):
         self.hands = None
         if MEDIAPIPE_AVAILABLE:
             try:
-                self.hands = mp_hands.Hands(static_image_mode=False, max_num_hands=1,
+                self.hands = mp.solutions.hands.Hands(static_image_mode=False, max_num_hands=1,
                                             min_detection_confidence=0.7, min_tracking_confidence=0.5)
             except Exception as e:
                 print(f"Error initializing MediaPipe Hands: {str(e)}")
@@ -65,9 +61,9 @@ class HandGestureTransformer(VideoTransformerBase):
             results = self.hands.process(rgb)
             if results.multi_hand_landmarks and results.multi_handedness:
                 for hl, handed in zip(results.multi_hand_landmarks, results.multi_handedness):
-                    mp_drawing.draw_landmarks(img, hl, mp_hands.HAND_CONNECTIONS,
-                                              mp_drawing_styles.get_default_hand_landmarks_style(),
-                                              mp_drawing_styles.get_default_hand_connections_style())
+                    mp.solutions.drawing_utils.draw_landmarks(img, hl, mp.solutions.hands.HAND_CONNECTIONS,
+                                              mp.solutions.drawing_styles.get_default_hand_landmarks_style(),
+                                              mp.solutions.drawing_styles.get_default_hand_connections_style())
                     label = handed.classification[0].label
                     count = self.detect_fingers(hl, label)
                     cv2.putText(img, f"Fingers: {count}", (10,50), cv2.FONT_HERSHEY_SIMPLEX, 1, (0,255,0), 2)
@@ -1,51 +1,68 @@
 import time
-import paramiko
 import pandas as pd
 import streamlit as st
 from smartops.utils import show_page_header, DOCKER_AVAILABLE
+from smartops.ssh_stream import RemoteCommand, run_command, STDOUT
+from smartops.docker_backend import get_docker_backend
+from smartops.docker_state import get_container_cache
+from smartops.docker_logs import show_log_viewer
+from smartops.docker_batch import ACTIONS, DEFAULT_PARALLEL, run_batch
+from smartops.history import record_run, show_history_browser
+from smartops.ssh_pool import get_ssh_pool, session_ssh_client, session_host_label, show_pool_stats
+from smartops.metrics import watch_session_host
 
 # -----------------------------
 # SSH Command Execution
 # -----------------------------
 def execute_ssh_command_with_stream(client, command):
-    transport = client.get_transport()
-    channel = transport.open_session()
-    channel.get_pty()
-    channel.exec_command(command)
-    output = []
-    while True:
-        if channel.exit_status_ready():
-            break
-        if channel.recv_ready():
-            data = channel.recv(1024).decode('utf-8')
-            output.append(data); yield data
-        if channel.recv_stderr_ready():
-            error = channel.recv_stderr(1024).decode('utf-8')
-            output.append(f"[ERROR] {error}"); yield f"[ERROR] {error}"
-    while channel.recv_ready():
-        data = channel.recv(1024).decode('utf-8')
-        output.append(data); yield data
-    while channel.recv_stderr_ready():
-        error = channel.recv_stderr(1024).decode('utf-8')
-        output.append(f"[ERROR] {error}"); yield f"[ERROR] {error}"
-    channel.close()
+    for stream, text in RemoteCommand(client, command, get_pty=True):
+        yield text if stream == STDOUT else f"[ERROR] {text}"
 
 def execute_docker_command(ssh_client, command):
     try:
-        stdin, stdout, stderr = ssh_client.exec_command(f"docker {command}", get_pty=True)
-        output = []
-        while True:
-            if stdout.channel.recv_ready():
-                chunk = stdout.channel.recv(1024).decode('utf-8'); output.append(chunk)
-            if stdout.channel.recv_stderr_ready():
-                error = stdout.channel.recv_stderr(1024).decode('utf-8'); output.append(f"[ERROR] {error}")
-            if stdout.channel.exit_status_ready():
-                break
-        exit_status = stdout.channel.recv_exit_status()
-        return exit_status, "".join(output)
+        return run_command(ssh_client, f"docker {command}", get_pty=True)
     except Exception as e:
         return 1, f"[ERROR] Failed to execute Docker command: {str(e)}"
 
+# -----------------------------
+# Batched Container Actions
+# -----------------------------
+def batch_action_ui(ssh_client, cache, containers):
+    by_name = {c["name"]: c for c in containers}
+    states = sorted({c["state"] for c in containers})
+    c1, c2 = st.columns([1, 3])
+    with c1:
+        state = st.selectbox("Filter by state", ["all"] + states, key="batch_state")
+    names = [c["name"] for c in containers if state == "all" or c["state"] == state]
+    with c2:
+        chosen = st.multiselect("Containers", names, key="batch_containers")
+    if st.checkbox(f"Select all {len(names)} shown", key="batch_all"):
+        chosen = names
+
+    c1, c2 = st.columns(2)
+    with c1:
+        action = st.selectbox("Action", list(ACTIONS), key="batch_action",
+                              help="'pull' pulls the images of the selected containers")
+    with c2:
+        parallel = st.slider("Parallel on host", 1, 32, DEFAULT_PARALLEL, key="batch_parallel")
+    confirmed = action != "remove" or st.checkbox("I understand remove is permanent", key="batch_confirm")
+
+    if st.button(f"🚀 {action.title()} {len(chosen)} container(s)", disabled=not chosen or not confirmed):
+        targets = sorted({by_name[n]["image"] for n in chosen}) if action == "pull" else chosen
+        with st.spinner(f"Running {action} on {len(targets)} target(s)..."):
+            try:
+                rows, wall = run_batch(ssh_client, action, targets, parallel=parallel)
+            except Exception as e:
+                st.error(f"❌ Batch {action} failed: {e}")
+                return
+        cache.invalidate([by_name[n]["id"] for n in chosen])
+        failed = [r for r in rows if not r["ok"]]
+        summary = f"{len(rows) - len(failed)}/{len(rows)} succeeded in {wall:.2f}s (one remote call)"
+        (st.warning if failed else st.success)(f"{'⚠️' if failed else '✅'} {summary}")
+        st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+        record_run(session_host_label(), "docker", f"docker batch {action} {' '.join(targets)}",
+                   1 if failed else 0, wall, "\n".join(f"{r['target']}\t{r['exit_code']}\t{r['message']}" for r in rows))
+
 # -----------------------------
 # Docker Manager UI
 # -----------------------------
@@ -66,49 +83,65 @@ def docker_manager_ui(ssh_client):
     command_type = st.radio("Select command type:", ["Container Management","Image Management","System Info","Custom Command"], horizontal=True)
 
     if command_type == "Container Management":
-        _, out = execute_docker_command(ssh_client, "ps -a --format '{{.Names}}|{{.Image}}|{{.Status}}|{{.Ports}}'")
-        containers = []
-        for line in out.strip().splitlines():
-            if not line.strip(): continue
-            parts = line.split('|')
-            if len(parts) < 4: continue
-            name, image, status, ports = parts
-            containers.append({"name":name,"image":image,"status":status,"ports":ports})
+        try:
+            cache = get_container_cache(ssh_client)
+        except Exception as e:
+            st.error(f"❌ Could not list containers: {e}")
+            return
+        if st.button("🔄 Refresh"):
+            cache.seed()
+        containers = cache.snapshot()
 
         if containers:
             st.subheader("📦 Containers")
-            st.dataframe(pd.DataFrame(containers), use_container_width=True)
+            st.dataframe(pd.DataFrame(containers)[["name","image","state","status","ports"]], use_container_width=True)
+            st.caption(f"Live via docker events · {cache.events_seen} events · last update {time.time() - cache.updated_at:.0f}s ago"
+                       f" · backend: {cache.backend.name}")
+            if cache.error:
+                st.caption(f"⚠️ Event stream: {cache.error}")
             selected = st.selectbox("Select a container:", [c["name"] for c in containers])
-            c1,c2,c3,c4 = st.columns(4)
-            if c1.button("▶️ Start"): st.code(execute_docker_command(ssh_client, f"start {selected}")[1])
-            if c2.button("⏹️ Stop"): st.code(execute_docker_command(ssh_client, f"stop {selected}")[1])
-            if c3.button("📜 Logs"):
-                _, logs = execute_docker_command(ssh_client, f"logs {selected}")
-                st.code(logs, language="bash")
-            if c4.button("🗑️ Remove"): st.code(execute_docker_command(ssh_client, f"rm -f {selected}")[1])
+            c1,c2,c3,c4,c5 = st.columns(5)
+            if c1.button("▶️ Start"): st.code(cache.backend.action("start", selected)[1])
+            if c2.button("⏹️ Stop"): st.code(cache.backend.action("stop", selected)[1])
+            if c3.button("📜 Logs"): st.session_state.docker_logs_for = selected
+            if c4.button("🔍 Inspect"): st.json(cache.backend.inspect(selected), expanded=False)
+            if c5.button("🗑️ Remove"): st.code(cache.backend.action("remove", selected)[1])
+            if st.session_state.get("docker_logs_for") == selected:
+                show_log_viewer(ssh_client, selected)
+
+            st.subheader("🧺 Batch Actions")
+            batch_action_ui(ssh_client, cache, containers)
 
         else:
             st.info("No containers found.")
 
     elif command_type == "Image Management":
         st.subheader("🖼️ Docker Images")
-        _, out = execute_docker_command(ssh_client, "images --format '{{.Repository}}:{{.Tag}}|{{.Size}}'")
-        images = []
-        for line in out.strip().splitlines():
-            if line.strip() and "<none>" not in line:
-                name, size = line.split('|',1); images.append({"name":name,"size":size})
+        try:
+            images = get_docker_backend(ssh_client).images()
+        except Exception as e:
+            st.error(f"❌ Could not list images: {e}")
+            images = []
         if images: st.dataframe(pd.DataFrame(images), use_container_width=True)
         else: st.info("No Docker images found.")
 
     elif command_type == "System Info":
-        st.subheader("Version"); _, v = execute_docker_command(ssh_client, "--version"); st.code(v, language="bash")
-        st.subheader("System Info"); _, inf = execute_docker_command(ssh_client, "info"); st.code(inf, language="bash")
+        backend = get_docker_backend(ssh_client)
+        try:
+            st.subheader("Version"); st.code(backend.version(), language="bash")
+            st.subheader("System Info"); st.code(backend.info(), language="json" if backend.name != "cli" else "bash")
+        except Exception as e:
+            st.error(f"❌ Docker query failed: {e}")
 
     else:
         custom_cmd = st.text_area("Enter Docker command (without 'docker'):", "ps -a")
         if st.button("🚀 Execute"):
-            _, out = execute_docker_command(ssh_client, custom_cmd)
+            start = time.perf_counter()
+            status, out = execute_docker_command(ssh_client, custom_cmd)
+            record_run(session_host_label(), "docker", f"docker {custom_cmd}", status, time.perf_counter() - start, out)
             st.subheader("Command Output"); st.code(out, language="bash")
+        with st.expander("🗄️ Command History"):
+            show_history_browser("docker_history")
 
 # -----------------------------
 # Main DevOps Tools
@@ -117,9 +150,10 @@ def show_devops_tools():
     show_page_header("🛠️ DevOps Tools")
 
     if not DOCKER_AVAILABLE:
-        st.warning("⚠️ Python docker package not installed (only needed if using Docker SDK locally).")
+        st.warning("⚠️ Python docker package not installed; Docker is managed through the CLI over SSH.")
 
-    if 'ssh_client' not in st.session_state: st.session_state.ssh_client = None
+    if 'ssh_key' not in st.session_state: st.session_state.ssh_key = None
+    session_ssh_client()
 
     st.header("💻 SSH Client (Localhost/Linux IP)")
     with st.form("ssh_connection"):
@@ -129,24 +163,19 @@ def show_devops_tools():
         connect_btn = st.form_submit_button("🔗 Connect")
         if connect_btn:
             try:
-                if st.session_state.ssh_client: st.session_state.ssh_client.close()
-                client = paramiko.SSHClient()
-                client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                client.connect(
-                    hostname=ssh_host,
-                    username=ssh_username,
-                    password=ssh_password,
-                    timeout=10,
-                    look_for_keys=False,
-                    allow_agent=False
+                st.session_state.ssh_key, st.session_state.ssh_client = get_ssh_pool().connect(
+                    ssh_host, ssh_username, ssh_password
                 )
-                st.session_state.ssh_client = client
+                st.session_state.pop("docker_available", None)
                 st.success(f"✅ Connected to {ssh_host}")
                 st.rerun()
             except Exception as e:
                 st.error(f"❌ Connection failed: {e}")
+                st.session_state.ssh_key = None
                 st.session_state.ssh_client = None
 
     if st.session_state.ssh_client:
-        st.success("🔗 SSH Connected")
+        st.success(f"🔗 SSH Connected ({st.session_state.ssh_key[2]}@{st.session_state.ssh_key[0]})")
+        show_pool_stats()
+        watch_session_host()
         docker_manager_ui(st.session_state.ssh_client)
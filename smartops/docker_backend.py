@@ -0,0 +1,288 @@
+import getpass
+import json
+import os
+import threading
+
+import streamlit as st
+from smartops.utils import DOCKER_AVAILABLE
+from smartops.ssh_pool import get_ssh_pool
+from smartops.ssh_stream import run_command
+
+LOCAL_SOCKET = "unix://var/run/docker.sock"
+LOCAL_PEERS = {"127.0.0.1", "::1"}
+API_TIMEOUT = 30
+# dial-stdio channels count against the host's MaxSessions like any other channel;
+# at most SSH_API_IDLE of them stay open between requests, the rest are closed on return
+SSH_API_POOL = 2
+SSH_API_IDLE = 1
+PS_FORMAT = "docker ps -a --no-trunc --format '{{json .}}'"
+
+
+def _size(n):
+    for unit in ("B", "kB", "MB", "GB"):
+        if n < 1000:
+            return f"{n:.1f}{unit}" if unit != "B" else f"{n}B"
+        n /= 1000
+    return f"{n:.1f}TB"
+
+
+def _ports(ports):
+    out = []
+    for p in sorted(ports or [], key=lambda p: (p.get("PrivatePort", 0), p.get("IP", ""))):
+        private = f"{p.get('PrivatePort')}/{p.get('Type', 'tcp')}"
+        out.append(f"{p['IP']}:{p['PublicPort']}->{private}" if p.get("PublicPort") else private)
+    return ", ".join(out)
+
+
+def parse_ps(output):
+    """`docker ps --format '{{json .}}'` lines -> {id: container}."""
+    containers = {}
+    for line in output.splitlines():
+        line = line.strip()
+        if not line.startswith("{"):
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            continue
+        containers[row["ID"]] = {
+            "id": row["ID"],
+            "name": row.get("Names", ""),
+            "image": row.get("Image", ""),
+            "state": row.get("State", ""),
+            "status": row.get("Status", ""),
+            "ports": row.get("Ports", ""),
+        }
+    return containers
+
+
+class CliBackend:
+    """Docker CLI run through `run(command) -> (status, output)`, e.g. over an SSH channel."""
+
+    name = "cli"
+
+    def __init__(self, run):
+        self.run = run
+
+    def _ok(self, command):
+        status, out = self.run(command)
+        if status != 0:
+            raise RuntimeError(out.strip() or f"'{command}' exited with {status}")
+        return out
+
+    def list_containers(self, ids=None):
+        filters = " ".join(f"--filter id={cid}" for cid in sorted(ids or []))
+        return parse_ps(self._ok(f"{PS_FORMAT} {filters}".strip()))
+
+    def inspect(self, container):
+        return json.loads(self._ok(f"docker inspect --type container {container}"))[0]
+
+    def images(self):
+        out = self._ok("docker images --format '{{.Repository}}:{{.Tag}}|{{.Size}}'")
+        images = []
+        for line in out.strip().splitlines():
+            if line.strip() and "<none>" not in line:
+                name, size = line.split("|", 1)
+                images.append({"name": name, "size": size})
+        return images
+
+    def version(self):
+        return self._ok("docker --version").strip()
+
+    def info(self):
+        return self._ok("docker info")
+
+    def action(self, action, target):
+        command = {"start": "start", "stop": "stop", "restart": "restart", "remove": "rm -f", "pull": "pull"}[action]
+        status, out = self.run(f"docker {command} {target}")
+        return status == 0, out.strip()
+
+
+class ApiBackend:
+    """
+    Docker Engine API through the low-level `docker.APIClient`: structured
+    responses straight from the daemon, with no process per call and no
+    `--format` text to parse.
+    """
+
+    def __init__(self, api, name):
+        self.api = api
+        self.name = name
+
+    def list_containers(self, ids=None):
+        filters = {"id": sorted(ids)} if ids else None
+        containers = {}
+        for c in self.api.containers(all=True, filters=filters):
+            containers[c["Id"]] = {
+                "id": c["Id"],
+                "name": ",".join(n.lstrip("/") for n in c.get("Names") or []),
+                "image": c.get("Image", ""),
+                "state": c.get("State", ""),
+                "status": c.get("Status", ""),
+                "ports": _ports(c.get("Ports")),
+            }
+        return containers
+
+    def inspect(self, container):
+        return self.api.inspect_container(container)
+
+    def images(self):
+        return [{"name": tag, "size": _size(img.get("Size", 0))}
+                for img in self.api.images() for tag in img.get("RepoTags") or [] if "<none>" not in tag]
+
+    def version(self):
+        v = self.api.version()
+        return f"Docker version {v.get('Version')} (API {v.get('ApiVersion')}, via {self.name})"
+
+    def info(self):
+        return json.dumps(self.api.info(), indent=2)
+
+    def action(self, action, target):
+        try:
+            if action == "start":
+                self.api.start(target)
+            elif action == "stop":
+                self.api.stop(target)
+            elif action == "restart":
+                self.api.restart(target)
+            elif action == "remove":
+                self.api.remove_container(target, force=True)
+            elif action == "pull":
+                from docker.utils import parse_repository_tag
+                repo, tag = parse_repository_tag(target)
+                self.api.pull(repo, tag=tag or "latest")
+            return True, f"{target}: {action} ok"
+        except Exception as e:
+            return False, str(e)
+
+
+def _local_api():
+    import docker
+    api = docker.APIClient(base_url=os.getenv("DOCKER_HOST", LOCAL_SOCKET), version="auto", timeout=API_TIMEOUT)
+    api.ping()
+    return ApiBackend(api, "api-local")
+
+
+def _ssh_api(client):
+    """Engine API tunnelled through `docker system dial-stdio` channels on an existing paramiko client."""
+    import contextlib
+    import docker
+    from docker.transport import SSHHTTPAdapter
+    from docker.transport.basehttpadapter import BaseHTTPAdapter
+    from docker.transport.sshconn import SSHConnection, SSHConnectionPool
+    from docker.utils import version_lt
+
+    class PooledSSHConnection(SSHConnection):
+        """One dial-stdio channel; it holds a pool channel slot from connect until close."""
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._slot = contextlib.ExitStack()
+
+        def connect(self):
+            self._slot.close()
+            self._slot.enter_context(get_ssh_pool().channel_slot(client))
+            try:
+                super().connect()
+            except BaseException:
+                self._slot.close()
+                raise
+
+        def close(self):
+            try:
+                super().close()
+            finally:
+                self._slot.close()
+
+    class PooledSSHConnectionPool(SSHConnectionPool):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            # Wait for a free channel instead of opening extras beyond maxsize
+            self.block = True
+
+        def _new_conn(self):
+            return PooledSSHConnection(self.ssh_transport, self.timeout, self.ssh_host)
+
+        def _put_conn(self, conn):
+            # An idle channel still holds an SSH pool slot; keep only SSH_API_IDLE of them warm
+            idle = sum(c is not None for c in list(self.pool.queue)) if self.pool is not None else 0
+            if conn is not None and idle >= SSH_API_IDLE:
+                conn.close()
+                conn = None
+            super()._put_conn(conn)
+
+    class PooledSSHAdapter(SSHHTTPAdapter):
+        def __init__(self):
+            # shell_out=True skips the adapter's own paramiko dial; channels come from our transport instead
+            super().__init__("ssh://pooled", timeout=API_TIMEOUT, max_pool_size=SSH_API_POOL, shell_out=True)
+
+        def get_connection(self, url, proxies=None):
+            # Every request goes to the same daemon; one pool (not one per URL) caps the channels held
+            with self.pools.lock:
+                pool = self.pools.get("dial-stdio")
+                if pool is None:
+                    pool = self.pools["dial-stdio"] = PooledSSHConnectionPool(
+                        ssh_client=client, timeout=self.timeout, maxsize=self.max_pool_size)
+            return pool
+
+        def close(self):
+            # The transport belongs to the SSH pool; only our channels are closed here
+            BaseHTTPAdapter.close(self)
+
+    adapter = PooledSSHAdapter()
+
+    def api_client(version):
+        api = docker.APIClient(base_url="ssh://pooled", version=version, timeout=API_TIMEOUT, use_ssh_client=True)
+        # Replaces the constructor's shell-out adapter before it is ever used
+        api.mount("http+docker://ssh", adapter)
+        return api
+
+    default = docker.constants.DEFAULT_DOCKER_API_VERSION
+    api = api_client(default)
+    server = api.version(api_version=False)["ApiVersion"]
+    if version_lt(server, default):
+        # Older daemons reject newer API paths; pin the client to what the server speaks
+        api = api_client(server)
+    return ApiBackend(api, "api-ssh")
+
+
+def _same_local_user(transport):
+    """
+    True when the SSH login is this machine as the user the app runs as, so the
+    local socket grants nothing the SSH user could not already do.
+    """
+    if transport is None or transport.getpeername()[0] not in LOCAL_PEERS:
+        return False
+    try:
+        return transport.get_username() == getpass.getuser()
+    except (KeyError, OSError):
+        return False
+
+
+def connect_backend(client):
+    """Best backend for a pooled SSH client: local socket, API over SSH, then the CLI."""
+    if DOCKER_AVAILABLE:
+        transport = client.get_transport()
+        attempts = ([_local_api] if _same_local_user(transport) else []) + [lambda: _ssh_api(client)]
+        for attempt in attempts:
+            try:
+                return attempt()
+            except Exception:
+                continue
+    return CliBackend(lambda command: run_command(client, command, timeout=60))
+
+
+@st.cache_resource
+def _backends():
+    return {}, threading.Lock()
+
+
+def get_docker_backend(client):
+    """Shared backend per pooled SSH client; chosen once, on first use."""
+    backends, lock = _backends()
+    with lock:
+        for dead in [c for c in backends if c.get_transport() is None or not c.get_transport().is_active()]:
+            backends.pop(dead)
+        if client not in backends:
+            backends[client] = connect_backend(client)
+        return backends[client]
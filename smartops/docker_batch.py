@@ -0,0 +1,56 @@
+import shlex
+import time
+
+from smartops.ssh_stream import run_command
+
+ACTIONS = {
+    "start": "docker start",
+    "stop": "docker stop",
+    "restart": "docker restart",
+    "remove": "docker rm -f",
+    "pull": "docker pull",  # targets are images
+}
+DEFAULT_PARALLEL = 8
+MAX_MESSAGE_CHARS = 300
+
+# Runs once per target on the remote host: prints "target<TAB>exit<TAB>start ns<TAB>end ns<TAB>one-line output"
+_PER_TARGET = (
+    's=$(date +%s%N); out=$({cmd} "$1" 2>&1); rc=$?; e=$(date +%s%N); '
+    'printf "%s\\t%s\\t%s\\t%s\\t%s\\n" "$1" "$rc" "$s" "$e" "$(printf "%s" "$out" | tr "\\n\\t" "  " | cut -c1-{limit})"'
+)
+
+
+def batch_command(action, targets, parallel=DEFAULT_PARALLEL):
+    """Single shell invocation that applies `action` to every target, `parallel` at a time."""
+    script = _PER_TARGET.format(cmd=ACTIONS[action], limit=MAX_MESSAGE_CHARS)
+    names = " ".join(shlex.quote(t) for t in targets)
+    return f"printf '%s\\000' {names} | xargs -0 -r -P {int(parallel)} -I{{}} sh -c {shlex.quote(script)} _ {{}}"
+
+
+def _parse(output, targets):
+    wanted, rows = set(targets), {}
+    for line in output.splitlines():
+        parts = line.rstrip("\r").split("\t", 4)
+        if len(parts) < 4 or parts[0] not in wanted:
+            continue
+        target, rc, began, ended = parts[:4]
+        try:
+            seconds = (int(ended) - int(began)) / 1e9
+        except ValueError:
+            # date without %N support (e.g. busybox)
+            seconds = None
+        rows[target] = {"target": target, "ok": rc == "0", "exit_code": int(rc) if rc.lstrip("-").isdigit() else None,
+                        "seconds": round(seconds, 3) if seconds is not None else None,
+                        "message": parts[4] if len(parts) > 4 else ""}
+    return [rows.get(t, {"target": t, "ok": False, "exit_code": None, "seconds": None, "message": "no result"})
+            for t in targets]
+
+
+def run_batch(client, action, targets, parallel=DEFAULT_PARALLEL, timeout=None):
+    """Apply an action to many containers (or images) in one remote call; returns (rows, wall seconds)."""
+    targets = list(dict.fromkeys(targets))
+    if not targets:
+        return [], 0.0
+    start = time.perf_counter()
+    _, out = run_command(client, batch_command(action, targets, parallel), timeout=timeout)
+    return _parse(out, targets), time.perf_counter() - start
@@ -0,0 +1,128 @@
+import re
+import shlex
+
+import streamlit as st
+from smartops.ssh_stream import RemoteCommand, STDOUT, STDERR
+from smartops.stream_render import StreamRenderer, discard
+
+LEVELS = ["ALL", "DEBUG", "INFO", "WARN", "ERROR"]
+_LEVEL_PATTERNS = {
+    "DEBUG": r"DEBUG|INFO|WARN|WARNING|ERROR|CRITICAL|FATAL",
+    "INFO": r"INFO|WARN|WARNING|ERROR|CRITICAL|FATAL",
+    "WARN": r"WARN|WARNING|ERROR|CRITICAL|FATAL",
+    "ERROR": r"ERROR|CRITICAL|FATAL",
+}
+# Hard caps: visible tail lines and characters kept per line
+MAX_VISIBLE_LINES = 1000
+MAX_LINE_CHARS = 4096
+
+
+def logs_command(container, tail=None, since=None, follow=False, timestamps=False):
+    parts = ["docker", "logs"]
+    if tail:
+        parts += ["--tail", str(int(tail))]
+    if since:
+        parts += ["--since", since]
+    if follow:
+        parts.append("--follow")
+    if timestamps:
+        parts.append("--timestamps")
+    parts.append(container)
+    return " ".join(shlex.quote(p) for p in parts)
+
+
+class LogFilter:
+    """Line filter applied on the server before anything reaches the browser."""
+
+    def __init__(self, pattern="", level="ALL"):
+        self.pattern = re.compile(pattern) if pattern else None
+        self.level = re.compile(rf"\b({_LEVEL_PATTERNS[level]})\b", re.IGNORECASE) if level in _LEVEL_PATTERNS else None
+        self.matched = 0
+        self.dropped = 0
+
+    def __call__(self, line):
+        if (self.pattern and not self.pattern.search(line)) or (self.level and not self.level.search(line)):
+            self.dropped += 1
+            return False
+        self.matched += 1
+        return True
+
+
+def stream_logs(client, container, renderer, log_filter, tail=None, since=None, follow=False,
+                timestamps=False, follow_seconds=None):
+    """Feed filtered log lines into `renderer`; follow mode stops after `follow_seconds`."""
+    command = RemoteCommand(client, logs_command(container, tail, since, follow, timestamps),
+                            timeout=follow_seconds if follow else None)
+    # Each stream keeps its own unfinished line so stdout and stderr text never join
+    partial = {STDOUT: "", STDERR: ""}
+    # Streams whose current line was already emitted clipped; the rest of that line is dropped
+    clipped = set()
+    try:
+        # Containers write to both stdout and stderr; show them interleaved as docker does
+        for stream, text in command:
+            if stream in clipped:
+                end = text.find("\n")
+                if end < 0:
+                    continue
+                clipped.discard(stream)
+                text = text[end + 1:]
+            lines = (partial[stream] + text).split("\n")
+            partial[stream] = lines.pop()
+            if len(partial[stream]) > MAX_LINE_CHARS:
+                # No newline in sight: emit the line clipped now instead of buffering it until one arrives
+                lines.append(partial[stream])
+                partial[stream] = ""
+                clipped.add(stream)
+            batch = [line[:MAX_LINE_CHARS] for line in lines if log_filter(line)]
+            if batch:
+                renderer.feed("\n".join(batch) + "\n", command.bytes_received)
+    except TimeoutError:
+        if not follow:
+            raise
+    tail_lines = [line[:MAX_LINE_CHARS] for line in partial.values() if line and log_filter(line)]
+    if tail_lines:
+        renderer.feed("\n".join(tail_lines) + "\n", command.bytes_received)
+    return command
+
+
+def show_log_viewer(client, container):
+    st.subheader(f"📜 Logs: {container}")
+    with st.form(f"logs_form_{container}"):
+        c1, c2, c3 = st.columns(3)
+        with c1:
+            tail = st.number_input("Last N lines (0 = all)", 0, 1_000_000, 500, step=100)
+            since = st.text_input("Since (e.g. 10m, 2h, 2024-01-01T00:00:00)", "")
+        with c2:
+            pattern = st.text_input("Regex filter", "")
+            level = st.selectbox("Minimum level", LEVELS)
+        with c3:
+            follow = st.checkbox("Follow (live)")
+            follow_seconds = st.number_input("Follow for (s)", 5, 3600, 60)
+            timestamps = st.checkbox("Timestamps")
+        fetch = st.form_submit_button("📥 Fetch logs")
+
+    if fetch:
+        try:
+            log_filter = LogFilter(pattern, level)
+        except re.error as e:
+            st.error(f"❌ Invalid regex: {e}")
+            return
+        discard(st.session_state.pop("docker_logs_spool", None))
+        stats = st.empty()
+        renderer = StreamRenderer(st.empty(), stats, tail_lines=MAX_VISIBLE_LINES, flush_seconds=0.25, compress=True)
+        try:
+            stream_logs(client, container, renderer, log_filter, tail or None, since or None,
+                        follow, timestamps, follow_seconds)
+        except Exception as e:
+            st.error(f"❌ Failed to read logs: {e}")
+        finally:
+            st.session_state.docker_logs_spool = renderer.close()
+        st.caption(f"{log_filter.matched:,} lines matched · {log_filter.dropped:,} filtered out")
+
+    spool = st.session_state.get("docker_logs_spool")
+    if spool:
+        try:
+            with open(spool, "rb") as f:
+                st.download_button("⬇️ Download logs (.gz)", f, file_name=f"{container}.log.gz", mime="application/gzip")
+        except OSError:
+            pass
@@ -0,0 +1,190 @@
+import json
+import threading
+import time
+
+import streamlit as st
+from smartops.ssh_stream import RemoteCommand, STDOUT
+from smartops.docker_backend import get_docker_backend
+
+EVENTS_COMMAND = "docker events --filter type=container --format '{{json .}}'"
+# Events arriving within this window are folded into one listing refresh
+BATCH_SECONDS = 0.5
+RETRY_SECONDS = 5
+# The events stream is reopened this often, and the cache shuts down once nobody has viewed it for IDLE_SECONDS
+EVENTS_WINDOW = 300
+IDLE_SECONDS = 15 * 60
+
+
+class ContainerCache:
+    """
+    Container table for one SSH host, seeded with a single container listing and
+    then kept current by a background `docker events` stream. Events only mark
+    containers dirty; dirty ids are refreshed together with one filtered
+    listing, and destroyed containers are dropped without a round-trip.
+    Listings go through the host's Docker backend (Engine API or CLI).
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.backend = get_docker_backend(client)
+        self.containers = {}
+        self.seeded_at = None
+        self.updated_at = None
+        self.events_seen = 0
+        self.refreshes = 0
+        self.error = None
+        self.last_viewed = time.time()
+        self._lock = threading.Lock()
+        self._dirty = set()
+        self._resync = False
+        self._dirty_event = threading.Event()
+        self._stop = threading.Event()
+        self.seed()
+        threading.Thread(target=self._events_loop, daemon=True, name="docker-events").start()
+        threading.Thread(target=self._refresh_loop, daemon=True, name="docker-refresh").start()
+
+    def seed(self):
+        """Replace the table with one full, unfiltered listing."""
+        containers = self.backend.list_containers()
+        with self._lock:
+            self.containers = containers
+            self.seeded_at = self.updated_at = time.time()
+
+    def snapshot(self):
+        self.last_viewed = time.time()
+        with self._lock:
+            return sorted(self.containers.values(), key=lambda c: c["name"])
+
+    def invalidate(self, ids=None):
+        """
+        Mark containers for refresh. Without `ids` the next refresh is a full
+        listing (seed), so containers created while nobody was watching appear too.
+        """
+        with self._lock:
+            if ids is None:
+                self._resync = True
+            else:
+                self._dirty.update(ids)
+        self._dirty_event.set()
+
+    def stop(self):
+        self._stop.set()
+        self._dirty_event.set()
+
+    @property
+    def alive(self):
+        transport = self.client.get_transport()
+        return (not self._stop.is_set() and transport is not None and transport.is_active()
+                and time.time() - self.last_viewed < IDLE_SECONDS)
+
+    def _events_loop(self):
+        while self.alive:
+            partial = ""
+            try:
+                for stream, text in RemoteCommand(self.client, EVENTS_COMMAND, timeout=EVENTS_WINDOW):
+                    if self._stop.is_set():
+                        return
+                    if stream != STDOUT:
+                        continue
+                    lines = (partial + text).split("\n")
+                    partial = lines.pop()
+                    for line in lines:
+                        self._handle_event(line)
+                self.error = "docker events stream ended"
+            except TimeoutError:
+                # Planned reopen so an unviewed cache releases its channel; resync what may have been missed
+                self.invalidate()
+                continue
+            except Exception as e:
+                self.error = str(e)
+            # Events may have been missed while the stream was down: resync everything
+            time.sleep(RETRY_SECONDS)
+            self.invalidate()
+
+    def _handle_event(self, line):
+        try:
+            event = json.loads(line)
+        except ValueError:
+            return
+        cid = event.get("id") or event.get("Actor", {}).get("ID")
+        action = event.get("Action") or event.get("status") or ""
+        if not cid:
+            return
+        self.events_seen += 1
+        if action == "destroy":
+            with self._lock:
+                self.containers.pop(cid, None)
+                self.updated_at = time.time()
+            return
+        with self._lock:
+            self._dirty.add(cid)
+        self._dirty_event.set()
+
+    def _refresh_loop(self):
+        while self.alive:
+            if not self._dirty_event.wait(timeout=30):
+                continue
+            if self._stop.is_set():
+                return
+            time.sleep(BATCH_SECONDS)
+            self._dirty_event.clear()
+            with self._lock:
+                dirty, self._dirty = self._dirty, set()
+                resync, self._resync = self._resync, False
+            if not dirty and not resync:
+                continue
+            try:
+                if resync:
+                    # A full listing covers the dirty ids as well
+                    self.seed()
+                else:
+                    fresh = self.backend.list_containers(dirty)
+                    with self._lock:
+                        for cid in dirty:
+                            if cid in fresh:
+                                self.containers[cid] = fresh[cid]
+                            else:
+                                self.containers.pop(cid, None)
+                        self.updated_at = time.time()
+                with self._lock:
+                    self.refreshes += 1
+            except Exception as e:
+                self.error = str(e)
+                with self._lock:
+                    self._dirty |= dirty
+                    self._resync = self._resync or resync
+                time.sleep(RETRY_SECONDS)
+                self._dirty_event.set()
+
+
+class _CacheRegistry:
+    def __init__(self):
+        self._caches = {}
+        self._lock = threading.Lock()
+
+    def for_client(self, client):
+        with self._lock:
+            for dead in [c for c, cache in self._caches.items() if not cache.alive]:
+                self._caches.pop(dead).stop()
+            cache = self._caches.get(client)
+        if cache is not None:
+            return cache
+        # Seeding lists containers over SSH; build outside the lock so a slow host blocks only its own sessions
+        cache = ContainerCache(client)
+        with self._lock:
+            existing = self._caches.get(client)
+            if existing is not None and existing.alive:
+                cache.stop()
+                return existing
+            self._caches[client] = cache
+            return cache
+
+
+@st.cache_resource
+def _registry():
+    return _CacheRegistry()
+
+
+def get_container_cache(client):
+    """Shared ContainerCache for a pooled SSH client (one per host connection)."""
+    return _registry().for_client(client)
@@ -0,0 +1,113 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from smartops.ssh_pool import get_ssh_pool
+from smartops.ssh_stream import CommandCancelled, RemoteCommand, STDERR
+
+DATA_FILE = "host_groups.json"
+# Only the tail of each host's output is kept for its pane
+MAX_PANE_CHARS = 64 * 1024
+
+
+def load_host_groups():
+    if os.path.exists(DATA_FILE):
+        with open(DATA_FILE, "r") as f:
+            return json.load(f)
+    return {}
+
+
+def save_host_groups(groups):
+    with open(DATA_FILE, "w") as f:
+        json.dump(groups, f, indent=2)
+
+
+def parse_host(entry, default_user):
+    """'host', 'user@host' or 'user@host:port' -> (host, port, user)."""
+    user, _, hostport = entry.strip().rpartition("@")
+    host, _, port = hostport.partition(":")
+    return host, int(port or 22), user or default_user
+
+
+class HostResult:
+    def __init__(self, entry):
+        self.entry = entry
+        self.status = "queued"
+        self.exit_status = None
+        self.started = None
+        self.duration = None
+        self.bytes = 0
+        self.output = ""
+        self.error = None
+        self.version = 0
+
+    def append(self, text):
+        self.output = (self.output + text)[-MAX_PANE_CHARS:]
+        self.version += 1
+
+    def row(self):
+        return {"host": self.entry, "status": self.status, "exit_code": self.exit_status,
+                "duration_s": round(self.duration, 2) if self.duration is not None else None,
+                "bytes": self.bytes, "error": self.error or ""}
+
+
+class FanOutRun:
+    """
+    One command run on many hosts at once. A thread pool of `concurrency`
+    workers dials (or reuses) pooled connections and streams each host's output
+    into its HostResult; the page polls `results` to render panes.
+    """
+
+    def __init__(self, entries, command, username, password, concurrency=20, timeout=60):
+        self.command = command
+        self.results = {e: HostResult(e) for e in entries}
+        self.started = time.time()
+        self._username = username
+        self._password = password
+        self._timeout = timeout
+        self._cancel = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="fanout")
+        self._futures = [self._executor.submit(self._run_host, r) for r in self.results.values()]
+        self._executor.shutdown(wait=False)
+
+    def _run_host(self, result):
+        if self._cancel.is_set():
+            result.status = "cancelled"
+            return
+        host, port, user = parse_host(result.entry, self._username)
+        result.status = "running"
+        result.started = time.perf_counter()
+        try:
+            _, client = get_ssh_pool().connect(host, user, self._password, port=port, timeout=min(10, self._timeout))
+            # The command checks the cancel event between reads, so a silent host stops too
+            cmd = RemoteCommand(client, self.command, timeout=self._timeout, cancel=self._cancel)
+            for stream, text in cmd:
+                result.append(f"[ERROR] {text}" if stream == STDERR else text)
+                result.bytes = cmd.bytes_received
+            result.exit_status = cmd.exit_status
+            result.status = "ok" if cmd.exit_status == 0 else "failed"
+        except CommandCancelled:
+            result.status = "cancelled"
+        except TimeoutError:
+            result.status, result.error = "timeout", f"no exit after {self._timeout}s"
+        except Exception as e:
+            result.status, result.error = "error", str(e)
+        finally:
+            result.duration = time.perf_counter() - result.started
+
+    def done(self):
+        return all(f.done() for f in self._futures)
+
+    def cancel(self):
+        self._cancel.set()
+
+    def counts(self):
+        counts = {}
+        for r in self.results.values():
+            counts[r.status] = counts.get(r.status, 0) + 1
+        return counts
+
+    def summary_rows(self):
+        return [r.row() for r in self.results.values()]
@@ -0,0 +1,210 @@
+import contextlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+import streamlit as st
+
+HISTORY_DB = os.getenv("SMARTOPS_HISTORY_DB", os.path.join("data", ".cache", "history.sqlite3"))
+MAX_DB_BYTES = int(os.getenv("SMARTOPS_HISTORY_MAX_BYTES", str(256 * 1024 * 1024)))
+COMPRESS_OVER = 4 * 1024
+# Stored output is capped (head + tail); the full-text index sees at most INDEX_CHARS of it
+MAX_OUTPUT_CHARS = 8 * 1024 * 1024
+INDEX_CHARS = 128 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    host TEXT NOT NULL,
+    source TEXT NOT NULL,
+    command TEXT NOT NULL,
+    exit_code INTEGER,
+    duration REAL,
+    output_chars INTEGER NOT NULL,
+    stored_bytes INTEGER NOT NULL,
+    compressed INTEGER NOT NULL,
+    output BLOB
+);
+CREATE INDEX IF NOT EXISTS runs_ts ON runs(ts);
+CREATE INDEX IF NOT EXISTS runs_host_ts ON runs(host, ts);
+"""
+FTS_SCHEMA = "CREATE VIRTUAL TABLE IF NOT EXISTS runs_fts USING fts5(host, command, output, content='')"
+
+
+def _head_tail(text, limit):
+    if len(text) <= limit:
+        return text
+    half = limit // 2
+    return f"{text[:half]}\n... [{len(text) - limit:,} chars omitted] ...\n{text[-half:]}"
+
+
+class CommandHistory:
+    """
+    SQLite archive of executed commands. Output is zlib-compressed above 4 KB
+    and indexed in a contentless FTS5 table, so the index holds only tokens.
+    The oldest runs are deleted once stored output passes `max_bytes`.
+    """
+
+    def __init__(self, path=HISTORY_DB, max_bytes=MAX_DB_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+            try:
+                db.execute(FTS_SCHEMA)
+                self.fts = True
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5: fall back to LIKE on host/command
+                self.fts = False
+
+    @contextlib.contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def record(self, host, source, command, exit_code, duration, output):
+        output = _head_tail(output or "", MAX_OUTPUT_CHARS)
+        raw = output.encode("utf-8")
+        compressed = len(raw) > COMPRESS_OVER
+        blob = zlib.compress(raw, 6) if compressed else raw
+        with self._lock, self._connect() as db:
+            cur = db.execute(
+                "INSERT INTO runs (ts, host, source, command, exit_code, duration, output_chars, stored_bytes, compressed, output)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (time.time(), host, source, command, exit_code, duration, len(output), len(blob), int(compressed), blob),
+            )
+            if self.fts:
+                db.execute("INSERT INTO runs_fts (rowid, host, command, output) VALUES (?, ?, ?, ?)",
+                           (cur.lastrowid, host, command, _head_tail(output, INDEX_CHARS)))
+            self._enforce_retention(db)
+            return cur.lastrowid
+
+    def _enforce_retention(self, db):
+        total = db.execute("SELECT COALESCE(SUM(stored_bytes), 0) FROM runs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        doomed, freed = [], 0
+        for row in db.execute("SELECT id, host, command, stored_bytes, compressed, output FROM runs ORDER BY id"):
+            doomed.append(row)
+            freed += row[3]
+            if freed >= excess:
+                break
+        for run_id, host, command, _, compressed, blob in doomed:
+            if self.fts:
+                # Contentless FTS rows are removed by replaying the indexed values
+                text = _head_tail(_decode(blob, compressed), INDEX_CHARS)
+                db.execute("INSERT INTO runs_fts (runs_fts, rowid, host, command, output) VALUES ('delete', ?, ?, ?, ?)",
+                           (run_id, host, command, text))
+            db.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+
+    def search(self, query="", host=None, since=None, limit=100):
+        """Newest matching runs; `query` uses FTS5 syntax (e.g. OOM, "out of memory", kernel AND panic)."""
+        where, params = [], []
+        if host:
+            where.append("r.host = ?"); params.append(host)
+        if since:
+            where.append("r.ts >= ?"); params.append(since)
+        columns = "r.id, r.ts, r.host, r.source, r.command, r.exit_code, r.duration, r.output_chars"
+        if query and self.fts:
+            sql = (f"SELECT {columns} FROM runs_fts f JOIN runs r ON r.id = f.rowid "
+                   f"WHERE runs_fts MATCH ? {''.join(' AND ' + w for w in where)} ORDER BY r.ts DESC LIMIT ?")
+            params = [query] + params
+        else:
+            if query:
+                where.append("(r.command LIKE ? OR r.host LIKE ?)"); params += [f"%{query}%"] * 2
+            sql = (f"SELECT {columns} FROM runs r {'WHERE ' + ' AND '.join(where) if where else ''} "
+                   f"ORDER BY r.ts DESC LIMIT ?")
+        with self._connect() as db:
+            rows = db.execute(sql, params + [limit]).fetchall()
+        keys = ["id", "ts", "host", "source", "command", "exit_code", "duration", "output_chars"]
+        return [dict(zip(keys, row)) for row in rows]
+
+    def output(self, run_id):
+        with self._connect() as db:
+            row = db.execute("SELECT compressed, output FROM runs WHERE id = ?", (run_id,)).fetchone()
+        return _decode(row[1], row[0]) if row else None
+
+    def hosts(self):
+        with self._connect() as db:
+            return [r[0] for r in db.execute("SELECT DISTINCT host FROM runs ORDER BY host")]
+
+    def stats(self):
+        with self._connect() as db:
+            count, stored, chars = db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(stored_bytes), 0), COALESCE(SUM(output_chars), 0) FROM runs").fetchone()
+        return {"runs": count, "stored_bytes": stored, "output_chars": chars}
+
+
+def _decode(blob, compressed):
+    if blob is None:
+        return ""
+    data = zlib.decompress(blob) if compressed else blob
+    return data.decode("utf-8", errors="replace")
+
+
+@st.cache_resource
+def get_command_history():
+    return CommandHistory()
+
+
+def read_output_file(path, limit=MAX_OUTPUT_CHARS):
+    """Head and tail of a spooled output file without reading the middle of huge files."""
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        if size <= limit:
+            return f.read().decode("utf-8", errors="replace")
+        head = f.read(limit // 2).decode("utf-8", errors="replace")
+        f.seek(size - limit // 2)
+        tail = f.read().decode("utf-8", errors="replace")
+    return f"{head}\n... [{size - limit:,} bytes omitted] ...\n{tail}"
+
+
+def record_run(host, source, command, exit_code, duration, output):
+    """Best-effort: archiving failures never break the page that ran the command."""
+    try:
+        get_command_history().record(host, source, command, exit_code, duration, output)
+    except Exception:
+        pass
+
+
+def show_history_browser(key="history"):
+    history = get_command_history()
+    s = history.stats()
+    st.caption(f"{s['runs']:,} runs archived · {s['stored_bytes'] / 1024 ** 2:.1f} MB stored")
+    c1, c2, c3 = st.columns([3, 2, 1])
+    with c1:
+        query = st.text_input("Search output and commands", placeholder='e.g. OOM or "disk full"', key=f"{key}_query")
+    with c2:
+        host = st.selectbox("Host", ["All hosts"] + history.hosts(), key=f"{key}_host")
+    with c3:
+        days = st.number_input("Last N days", 0, 3650, 7, key=f"{key}_days", help="0 = all time")
+
+    start = time.perf_counter()
+    try:
+        runs = history.search(query.strip(), None if host == "All hosts" else host,
+                              time.time() - days * 86400 if days else None)
+    except sqlite3.OperationalError as e:
+        st.error(f"❌ Invalid search: {e}")
+        return
+    st.caption(f"{len(runs)} result(s) in {(time.perf_counter() - start) * 1000:.1f} ms")
+    if not runs:
+        return
+
+    table = [{**r, "ts": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(r["ts"])),
+              "duration": round(r["duration"] or 0, 2)} for r in runs]
+    st.dataframe(table, use_container_width=True, hide_index=True)
+    chosen = st.selectbox("Show output of run", [r["id"] for r in runs], key=f"{key}_run",
+                          format_func=lambda i: next(f"#{r['id']} {r['host']}: {r['command'][:60]}" for r in runs if r["id"] == i))
+    st.code(_head_tail(history.output(chosen) or "", 200_000), language="bash")
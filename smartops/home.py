@@ -1,5 +1,63 @@
+import time
+import pandas as pd
 import streamlit as st
 from smartops.utils import show_page_header
+from smartops.metrics import get_metrics_collector, watch_session_host, LOCAL
+
+HOST_METRICS = [
+    ("cpu_pct", "CPU", "%"),
+    ("mem_pct", "Memory", "%"),
+    ("disk_pct", "Disk /", "%"),
+    ("load1", "Load (1m)", ""),
+]
+WINDOWS = {"raw": "Last hour", "1m": "Last 24 h", "15m": "Last 7 days"}
+
+def show_system_status():
+    """Sparklines from the background metrics collector; rendering never issues a remote call."""
+    collector = get_metrics_collector()
+    watch_session_host()
+    hosts = collector.hosts()
+    if not hosts:
+        st.info("⏳ Collecting the first samples...")
+        return
+
+    col_host, col_window = st.columns([1, 2])
+    with col_host:
+        host = st.selectbox("Host", hosts, format_func=lambda h: "This server" if h == LOCAL else h)
+    with col_window:
+        tier = st.radio("Window", list(WINDOWS), format_func=WINDOWS.get, horizontal=True)
+
+    for col, (metric, label, unit) in zip(st.columns(len(HOST_METRICS)), HOST_METRICS):
+        series = collector.get(host, metric)
+        with col:
+            if series is None or series.last() is None:
+                st.metric(label, "–")
+                continue
+            st.metric(label, f"{series.last():.1f}{unit}")
+            points = series.points(tier)
+            if len(points) > 1:
+                df = pd.DataFrame(points, columns=["time", label])
+                df["time"] = pd.to_datetime(df["time"], unit="s")
+                st.line_chart(df.set_index("time"), height=120)
+
+    containers = collector.containers(host)
+    if containers:
+        rows = []
+        for name in containers:
+            cpu = collector.get(host, f"container:{name}:cpu_pct")
+            mem = collector.get(host, f"container:{name}:mem_pct")
+            rows.append({"container": name, "cpu_%": cpu.last() if cpu else None, "mem_%": mem.last() if mem else None})
+        st.markdown("#### 🐳 Containers")
+        st.dataframe(rows, use_container_width=True, hide_index=True)
+
+    age = time.time() - collector.last_sample.get(host, time.time())
+    st.caption(f"Sampled every {collector.interval}s · last sample {age:.0f}s ago")
+
+    with st.expander("📋 Recent Activity"):
+        if not collector.activity:
+            st.markdown("- 🔵 Sampling this server")
+        for ts, message in list(collector.activity)[:20]:
+            st.markdown(f"- {time.strftime('%H:%M:%S', time.localtime(ts))} {message}")
 
 def show_home():
     """Display the home page with an overview of the application."""
@@ -51,18 +109,7 @@ def show_home():
     """)
 
     st.markdown("## 📊 System Status")
-    status_col1, status_col2, status_col3 = st.columns(3)
-    with status_col1: st.metric("AI Services", "🟢 Online")
-    with status_col2: st.metric("Automation Tools", "🟢 Online")
-    with status_col3: st.metric("System Resources", "⚡ Optimal")
-
-    with st.expander("📋 Recent Activity"):
-        st.markdown("""
-        - 🔵 Connected to AI services
-        - 🔄 Updated automation scripts
-        - 📊 Generated system report
-        - 🔒 Security check completed
-        """)
+    show_system_status()
 
     st.markdown("---")
     st.markdown("""
@@ -0,0 +1,218 @@
+import hashlib
+import os
+import threading
+import time
+import tracemalloc
+
+import pandas as pd
+from pandas.api.types import union_categoricals, is_integer_dtype, is_float_dtype, is_object_dtype, is_string_dtype
+from smartops.utils import PYARROW_AVAILABLE
+
+CACHE_DIR = os.getenv("SMARTOPS_CACHE_DIR", os.path.join("data", ".cache"))
+CHUNK_ROWS = 250_000
+SAMPLE_ROWS = 20_000
+# Text columns with fewer distinct values than this share of the sample become categoricals
+CATEGORY_RATIO = 0.5
+# Columnar cache files beyond this total are evicted least-recently-used first
+MAX_CACHE_BYTES = int(os.getenv("SMARTOPS_CACHE_MAX_BYTES", str(1024 ** 3)))
+
+_trace_lock = threading.Lock()
+_trace_users = 0
+
+
+class LoadStats:
+    def __init__(self, rows, columns, seconds, peak_bytes, source, chunks=0):
+        self.rows = rows
+        self.columns = columns
+        self.seconds = seconds
+        self.peak_bytes = peak_bytes
+        self.source = source
+        self.chunks = chunks
+
+    def summary(self):
+        origin = "columnar cache" if self.source == "cache" else f"CSV in {self.chunks} chunk(s)"
+        # tracemalloc does not see Arrow's allocator, so cache reads report no peak rather than a wrong one
+        memory = ("memory not traced" if self.peak_bytes is None
+                  else f"peak ≈ {self.peak_bytes / 1024 ** 2:.1f} MB (approx.)")
+        return f"Loaded {self.rows:,} rows × {self.columns} cols from {origin} in {self.seconds:.2f}s · {memory}"
+
+
+def _rewind(source):
+    if hasattr(source, "seek"):
+        source.seek(0)
+
+
+def sample_schema(source, sample_rows=SAMPLE_ROWS):
+    """Guess column kinds ("int", "float", "category", "string") from the first `sample_rows` rows."""
+    sample = pd.read_csv(source, nrows=sample_rows)
+    _rewind(source)
+    kinds = {}
+    for col in sample.columns:
+        s = sample[col]
+        if is_integer_dtype(s):
+            kinds[col] = "int"
+        elif is_float_dtype(s):
+            kinds[col] = "float"
+        # pandas 3 reads text as the `str` dtype, older versions as object
+        elif (is_string_dtype(s) or is_object_dtype(s)) and s.nunique(dropna=True) <= max(1, len(s) * CATEGORY_RATIO):
+            kinds[col] = "category"
+        else:
+            kinds[col] = "string"
+    return kinds
+
+
+def _downcast(chunk, kinds, downcast_floats):
+    for col in chunk.columns:
+        kind = kinds.get(col)
+        s = chunk[col]
+        if kind == "category" and not isinstance(s.dtype, pd.CategoricalDtype):
+            chunk[col] = s.astype("category")
+        elif is_integer_dtype(s):
+            chunk[col] = pd.to_numeric(s, downcast="integer")
+        elif downcast_floats and is_float_dtype(s):
+            chunk[col] = pd.to_numeric(s, downcast="float")
+    return chunk
+
+
+def read_csv_chunked(source, schema=None, usecols=None, chunksize=CHUNK_ROWS, downcast_floats=False):
+    """
+    Read a CSV in `chunksize` row blocks, downcasting each block before the next is parsed.
+    `schema` maps column -> dtype (explicit) or kind; without it the kinds are sampled.
+    Integer columns are downcast per chunk and concat widens them again only where needed.
+    """
+    kinds = schema or sample_schema(source)
+    # Sampled text columns stay text in every chunk, even where a later chunk looks numeric
+    dtype = {c: str if k == "string" else k for c, k in kinds.items()
+             if k not in ("int", "float") and (usecols is None or c in usecols)}
+    chunks = [
+        _downcast(chunk, kinds, downcast_floats)
+        for chunk in pd.read_csv(source, usecols=usecols, dtype=dtype or None, chunksize=chunksize)
+    ]
+    if not chunks:
+        return pd.DataFrame(columns=usecols or list(kinds)), 0
+
+    # Each chunk has its own category levels; align them so concat keeps the categorical dtype
+    for col in chunks[0].columns:
+        if isinstance(chunks[0][col].dtype, pd.CategoricalDtype) and len(chunks) > 1:
+            levels = union_categoricals([c[col] for c in chunks]).categories
+            for c in chunks:
+                c[col] = c[col].cat.set_categories(levels)
+    return _unify_mixed(pd.concat(chunks, ignore_index=True)), len(chunks)
+
+
+def _unify_mixed(df):
+    """A column numeric in early chunks and text in later ones concatenates to mixed Python types; make it text."""
+    for col in df.columns:
+        s = df[col]
+        if is_object_dtype(s) and pd.api.types.infer_dtype(s, skipna=True).startswith("mixed"):
+            df[col] = s.where(s.isna(), s.astype(str))
+    return df
+
+
+def file_cache_key(path):
+    st_ = os.stat(path)
+    return f"{os.path.splitext(os.path.basename(path))[0]}-{st_.st_size}-{st_.st_mtime_ns}"
+
+
+def _cache_path(cache_key, usecols=None):
+    # A load limited to `usecols` caches only those columns, under its own file
+    if usecols is not None:
+        cache_key = f"{cache_key}-{hashlib.sha256(repr(sorted(usecols)).encode()).hexdigest()[:8]}"
+    return os.path.join(CACHE_DIR, f"{cache_key}.feather")
+
+
+def _read_cache(path, usecols):
+    import pyarrow.feather as feather
+    # Memory-mapping reads only the requested columns from disk; to_pandas() still copies them into pandas
+    df = feather.read_table(path, columns=usecols, memory_map=True).to_pandas()
+    os.utime(path)  # mark as recently used for eviction
+    return df
+
+
+def _write_cache(df, path):
+    """Write the cache file; returns False (a plain cache miss next time) if it cannot be written."""
+    import pyarrow as pa
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        df.to_feather(tmp, compression="uncompressed")
+        os.replace(tmp, path)
+    except (OSError, ValueError, TypeError, pa.ArrowException):
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return False
+    _evict_cache(keep=path)
+    return True
+
+
+def _evict_cache(keep=None, max_bytes=MAX_CACHE_BYTES):
+    files = []
+    for name in os.listdir(CACHE_DIR):
+        if name.endswith(".feather"):
+            full = os.path.join(CACHE_DIR, name)
+            try:
+                st_ = os.stat(full)
+            except OSError:
+                continue
+            files.append((st_.st_mtime, st_.st_size, full))
+    total = sum(size for _, size, _ in files)
+    for _, size, full in sorted(files):
+        if total <= max_bytes:
+            break
+        if full == keep:
+            continue
+        try:
+            os.remove(full)
+            total -= size
+        except OSError:
+            pass
+
+
+def _start_trace():
+    global _trace_users
+    with _trace_lock:
+        if _trace_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _trace_users += 1
+        tracemalloc.reset_peak()
+
+
+def _stop_trace():
+    global _trace_users
+    with _trace_lock:
+        _, peak = tracemalloc.get_traced_memory()
+        _trace_users -= 1
+        if _trace_users == 0:
+            tracemalloc.stop()
+    return peak
+
+
+def load_csv(source, cache_key=None, usecols=None, schema=None, chunksize=CHUNK_ROWS):
+    """
+    Load a CSV (path or file-like) through the columnar cache.
+    On a cache miss only `usecols` are parsed, in chunks, and written to
+    <CACHE_DIR>/<cache_key>[-<columns hash>].feather; later loads read that
+    Arrow file back into pandas. Returns (DataFrame, LoadStats). Peak memory
+    is measured with tracemalloc on CSV parses only and is approximate
+    (Python allocations; overlapping loads share the tracer).
+    """
+    start = time.perf_counter()
+    _start_trace()
+    try:
+        path = _cache_path(cache_key, usecols) if cache_key and PYARROW_AVAILABLE else None
+        chunks = 0
+        if path and os.path.exists(path):
+            df, origin = _read_cache(path, usecols), "cache"
+        else:
+            df, chunks = read_csv_chunked(source, schema=schema, usecols=usecols, chunksize=chunksize)
+            origin = "csv"
+            if usecols is not None:
+                # read_csv keeps file order; callers get the order they asked for, as from the cache
+                df = df[list(usecols)]
+            if path:
+                _write_cache(df, path)
+    finally:
+        peak = _stop_trace()
+    stats = LoadStats(len(df), df.shape[1], time.perf_counter() - start, None if origin == "cache" else peak,
+                      origin, chunks)
+    return df, stats
@@ -0,0 +1,119 @@
+import multiprocessing as mp
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+import streamlit as st
+
+MAX_TRAINING_JOBS = int(os.getenv("SMARTOPS_MAX_TRAINING_JOBS", "2"))
+WORKER_NICENESS = int(os.getenv("SMARTOPS_WORKER_NICENESS", "10"))
+# Finished jobs (and their shared progress dicts) are forgotten after this long
+JOB_RETENTION_SECONDS = 24 * 3600
+
+
+def _init_worker(niceness):
+    # Training runs below the Streamlit server's priority so page reruns stay responsive
+    try:
+        os.nice(niceness)
+    except (AttributeError, OSError):
+        pass
+
+
+class Job:
+    def __init__(self, job_id, kind, description, future, progress, cancel_event):
+        self.id = job_id
+        self.kind = kind
+        self.description = description
+        self.future = future
+        self.progress = progress
+        self.cancel_event = cancel_event
+        self.submitted = time.time()
+
+    @property
+    def status(self):
+        if self.future.cancelled():
+            return "cancelled"
+        if self.future.done():
+            if self.future.exception() is not None:
+                return "failed"
+            result = self.future.result() or {}
+            return "cancelled" if result.get("cancelled") else "done"
+        if self.cancel_event.is_set():
+            return "cancelling"
+        return self.progress.get("status", "queued")
+
+    def snapshot(self):
+        """Plain-dict copy of the job's progress, safe to render."""
+        try:
+            progress = dict(self.progress)
+        except Exception:
+            progress = {}
+        return {"id": self.id, "kind": self.kind, "description": self.description,
+                "status": self.status, "submitted": self.submitted, **progress}
+
+
+class JobRunner:
+    """
+    Local job queue backed by a process pool.
+    At most `max_workers` jobs run at once; the rest wait in the pool's queue.
+    Workers report progress through a shared dict and watch a cancel event.
+    """
+
+    def __init__(self, max_workers=MAX_TRAINING_JOBS):
+        ctx = mp.get_context("spawn")
+        self.max_workers = max_workers
+        self._manager = ctx.Manager()
+        self._pool = ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=ctx,
+            initializer=_init_worker, initargs=(WORKER_NICENESS,),
+        )
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind, description, fn, *args, **kwargs):
+        """Queue `fn(*args, progress=..., cancel_event=..., **kwargs)`; returns the job id."""
+        self.prune()
+        job_id = uuid.uuid4().hex[:8]
+        progress = self._manager.dict({"status": "queued"})
+        cancel_event = self._manager.Event()
+        future = self._pool.submit(fn, *args, progress=progress, cancel_event=cancel_event, **kwargs)
+        with self._lock:
+            self._jobs[job_id] = Job(job_id, kind, description, future, progress, cancel_event)
+        return job_id
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is None:
+            return False
+        # Jobs still waiting in the queue are dropped; running ones stop at the next epoch
+        if not job.future.cancel():
+            job.cancel_event.set()
+        return True
+
+    def jobs(self, kind=None):
+        # Pages poll through here, so old finished jobs are dropped even when nothing new is submitted
+        self.prune()
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [j for j in jobs if kind is None or j.kind == kind]
+
+    def active_count(self):
+        return sum(1 for j in self.jobs() if j.status in ("queued", "running", "cancelling"))
+
+    def prune(self, max_age=JOB_RETENTION_SECONDS):
+        cutoff = time.time() - max_age
+        with self._lock:
+            for job_id in [k for k, j in self._jobs.items() if j.future.done() and j.submitted < cutoff]:
+                del self._jobs[job_id]
+
+
+@st.cache_resource
+def get_job_runner():
+    """One runner per server process, shared by all sessions."""
+    return JobRunner()
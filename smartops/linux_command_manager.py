@@ -1,12 +1,24 @@
 import streamlit as st
-from smartops.utils import show_page_header
-import time, paramiko
+from smartops.utils import show_page_header, fragment
+import json
+import os
+import threading
+import time
+import uuid
+from smartops.ssh_stream import RemoteCommand, STDERR
+from smartops.fanout import FanOutRun, load_host_groups, save_host_groups, parse_host
+from smartops.sftp_transfer import Transfer, start_transfers, UPLOAD, DOWNLOAD, DEFAULT_STREAMS, MAX_STREAMS
+from smartops.stream_render import StreamRenderer, discard, prune_dir
+from smartops.history import record_run, read_output_file, show_history_browser
+from smartops.ssh_pool import get_ssh_pool, session_ssh_client, session_host_label, show_pool_stats
+from smartops.metrics import watch_session_host
 
 def show_linux_command_manager():
     show_page_header("🐧 Linux Command Manager")
 
     # Session state
-    if 'ssh_client' not in st.session_state: st.session_state.ssh_client = None
+    if 'ssh_key' not in st.session_state: st.session_state.ssh_key = None
+    session_ssh_client()
     if 'ssh_output' not in st.session_state: st.session_state.ssh_output = ""
     if 'command_running' not in st.session_state: st.session_state.command_running = False
 
@@ -23,44 +35,315 @@ def show_linux_command_manager():
                     st.warning("⚠️ Please fill in all SSH details.")
                 else:
                     try:
-                        if st.session_state.ssh_client: st.session_state.ssh_client.close()
-                        client = paramiko.SSHClient()
-                        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                        client.connect(
-                            hostname=ssh_host,
-                            username=ssh_username,
-                            password=ssh_password,
-                            timeout=10,
-                            look_for_keys=False,
-                            allow_agent=False
+                        st.session_state.ssh_key, st.session_state.ssh_client = get_ssh_pool().connect(
+                            ssh_host, ssh_username, ssh_password
                         )
-                        st.session_state.ssh_client = client
+                        st.session_state.pop("docker_available", None)
                         st.session_state.ssh_output = ""
                         st.success(f"✅ Connected to {ssh_host} as {ssh_username}")
                         st.rerun()
                     except Exception as e:
                         st.error(f"❌ SSH connection failed: {str(e)}")
+                        st.session_state.ssh_key = None
                         st.session_state.ssh_client = None
 
     # Linux Command Execution
     if st.session_state.ssh_client:
         st.success("🔗 Connected")
+        show_pool_stats()
+        watch_session_host()
         with st.form("ssh_cmd_linux"):
             cmd = st.text_area("Enter Linux command to execute", "uname -a")
             run = st.form_submit_button("🚀 Execute")
-            if run and cmd:
-                holder = st.empty()
-                full = []
-                try:
-                    stdin, stdout, stderr = st.session_state.ssh_client.exec_command(cmd)
-                    for line in iter(stdout.readline, ""):
-                        full.append(line)
-                        holder.code(''.join(full), language="bash")
-                        time.sleep(0.05)
-                    err = stderr.read().decode()
-                    if err:
-                        st.error(f"❌ Error: {err}")
-                except Exception as e:
-                    st.error(f"❌ Command execution failed: {e}")
+        if run and cmd:
+            discard(st.session_state.pop("ssh_output_spool", None))
+            stats = st.empty()
+            renderer = StreamRenderer(st.empty(), stats)
+            err_holder = st.empty()
+            # stderr streams live into its own bounded view, created on the first stderr chunk
+            err_renderer = None
+            failure = ""
+            command = RemoteCommand(st.session_state.ssh_client, cmd)
+            try:
+                for stream, text in command:
+                    if stream == STDERR:
+                        if err_renderer is None:
+                            err_renderer = StreamRenderer(err_holder, tail_lines=ERR_TAIL_LINES, language="text")
+                        err_renderer.feed(text)
+                        continue
+                    renderer.feed(text, command.bytes_received)
+            except Exception as e:
+                failure = f"[ERROR] {e}"
+                st.error(f"❌ Command execution failed: {e}")
+            finally:
+                spool = st.session_state.ssh_output_spool = renderer.close()
+                errors = ""
+                if err_renderer is not None:
+                    err_spool = err_renderer.close()
+                    errors = read_output_file(err_spool)
+                    discard(err_spool)
+                    st.error(f"❌ The command wrote {err_renderer.lines:,} line(s) to stderr (shown above).")
+                record_run(session_host_label(), "linux", cmd, command.exit_status, command.duration,
+                           read_output_file(spool) + errors + failure)
+        spool = st.session_state.get("ssh_output_spool")
+        if spool and os.path.exists(spool):
+            with open(spool, "rb") as f:
+                st.download_button("⬇️ Download full output", f, file_name="command_output.log", mime="text/plain")
     else:
         st.info("ℹ️ Please connect to an SSH server to execute Linux commands.")
+
+    show_transfer_panel()
+
+    show_fanout_panel()
+
+    st.header("🗄️ Command History")
+    show_history_browser("linux_history")
+
+# stderr lines kept visible under a command's output
+ERR_TAIL_LINES = 200
+
+# Browser uploads and finished downloads live here, one sub-directory per session;
+# nothing outside it is ever read or written on the app server's behalf
+TRANSFER_DIR = os.path.join("data", ".cache", "sftp")
+# Downloads are handed to the browser through st.download_button, which holds the file in memory
+MAX_BROWSER_DOWNLOAD = 200 * 1024 ** 2
+
+@st.cache_resource
+def _active_transfer_dirs():
+    """Session directories with a transfer still running; pruning skips them."""
+    return set(), threading.Lock()
+
+def _session_transfer_dir():
+    if "sftp_session_dir" not in st.session_state:
+        st.session_state.sftp_session_dir = uuid.uuid4().hex
+    return os.path.join(TRANSFER_DIR, st.session_state.sftp_session_dir)
+
+def _inside(path, directory):
+    """True when `path` resolves to a location inside `directory` (symlinks and .. included)."""
+    root = os.path.realpath(directory)
+    return os.path.commonpath([os.path.realpath(path), root]) == root
+
+def _release_when_done(futures, directory, upload_path=None):
+    """Unprotect `directory` (and drop the uploaded copy) once every transfer has finished."""
+    active, lock = _active_transfer_dirs()
+    remaining = [len(futures)]
+
+    def done(_):
+        with lock:
+            remaining[0] -= 1
+            if remaining[0]:
+                return
+            active.discard(directory)
+        if upload_path:
+            # The browser copy was only needed as the transfer source
+            discard(upload_path)
+
+    for future in futures:
+        future.add_done_callback(done)
+
+def _transfer_clients(entries, username, password):
+    """(label, client) for each host entry, dialing through the pool in parallel."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    def dial(entry):
+        host, port, user = parse_host(entry, username)
+        return f"{user}@{host}", get_ssh_pool().connect(host, user, password, port=port)[1]
+
+    with ThreadPoolExecutor(max_workers=min(20, len(entries))) as pool:
+        return list(pool.map(dial, entries))
+
+def show_transfer_panel():
+    st.header("📦 File Transfer (SFTP)")
+    groups = load_host_groups()
+    direction = st.radio("Direction", [UPLOAD, DOWNLOAD], horizontal=True,
+                         format_func=lambda d: "⬆️ Upload" if d == UPLOAD else "⬇️ Download")
+    targets = (["Current session"] if st.session_state.ssh_client else []) + \
+              ([f"Group: {g}" for g in groups] if direction == UPLOAD else [])
+    if not targets:
+        st.info("ℹ️ Connect to an SSH server (or create a host group) to transfer files.")
+        return
+
+    running = st.session_state.get("sftp_run")
+    busy = running is not None and not all(f.done() for f in running["futures"])
+    with st.form("sftp_form"):
+        target = st.selectbox("Hosts", targets)
+        if direction == UPLOAD:
+            uploaded = st.file_uploader("File to upload")
+            remote_path = st.text_input("Remote path (ending in / keeps the file name)", "/tmp/")
+        else:
+            remote_path = st.text_input("Remote file", placeholder="/var/log/syslog")
+            uploaded = None
+        colA, colB = st.columns(2)
+        with colA:
+            streams = st.slider("Parallel streams per host", 1, MAX_STREAMS, DEFAULT_STREAMS)
+            chunk_mb = st.select_slider("Chunk size (MB)", [1, 2, 4, 8, 16, 32, 64], 8)
+        with colB:
+            compress = st.checkbox("Compress in flight (gzip, needs gzip and dd on the host)")
+            verify = st.checkbox("Verify sha256 afterwards", value=True)
+        if direction == UPLOAD and groups:
+            group_user = st.text_input("Group default username", value="root")
+            group_password = st.text_input("Group password", type="password")
+        go = st.form_submit_button("🚀 Start transfer", disabled=busy)
+
+    if go:
+        _start_transfer(direction, target, groups, uploaded, remote_path, streams, chunk_mb, compress, verify,
+                        group_user if direction == UPLOAD and groups else None,
+                        group_password if direction == UPLOAD and groups else None)
+    run = st.session_state.get("sftp_run")
+    if run is not None:
+        if all(f.done() for f in run["futures"]):
+            _show_transfer_result(run)
+        else:
+            _show_transfer_progress()
+
+def _start_transfer(direction, target, groups, uploaded, remote_path, streams, chunk_mb, compress, verify,
+                    group_user, group_password):
+    if direction == UPLOAD and uploaded is None:
+        st.warning("⚠️ Please choose a file to upload.")
+        return
+    if not remote_path or (direction == DOWNLOAD and remote_path.endswith("/")):
+        st.warning("⚠️ Please enter the remote file path.")
+        return
+
+    session_dir = _session_transfer_dir()
+    active, lock = _active_transfer_dirs()
+    with lock:
+        keep = set(active)
+    os.makedirs(TRANSFER_DIR, exist_ok=True)
+    prune_dir(TRANSFER_DIR, keep=keep | {session_dir})
+    previous = st.session_state.pop("sftp_run", None)
+    if previous is not None and previous["direction"] == DOWNLOAD:
+        discard(previous["local_path"])
+    os.makedirs(session_dir, exist_ok=True)
+
+    name = os.path.basename((uploaded.name if direction == UPLOAD else remote_path).rstrip("/"))
+    local_path = os.path.join(session_dir, name)
+    if not name or not _inside(local_path, session_dir):
+        st.error("❌ Invalid file name.")
+        return
+    if direction == UPLOAD:
+        with open(local_path, "wb") as f:
+            f.write(uploaded.getbuffer())
+        if remote_path.endswith("/"):
+            remote_path += name
+
+    try:
+        if target == "Current session":
+            clients = [(session_host_label(), st.session_state.ssh_client)]
+        else:
+            clients = _transfer_clients(groups[target[len("Group: "):]], group_user, group_password)
+    except Exception as e:
+        st.error(f"❌ Could not connect: {e}")
+        if direction == UPLOAD:
+            discard(local_path)
+        return
+    transfers = [Transfer(client, label, direction, local_path, remote_path, streams=streams,
+                          chunk_size=chunk_mb * 1024 * 1024, compress=compress, verify=verify)
+                 for label, client in clients]
+    with lock:
+        active.add(os.path.abspath(session_dir))
+    futures = start_transfers(transfers)
+    _release_when_done(futures, os.path.abspath(session_dir), local_path if direction == UPLOAD else None)
+    st.session_state.sftp_run = {"transfers": transfers, "futures": futures, "direction": direction,
+                                 "local_path": local_path, "recorded": False}
+
+def _render_transfers(transfers):
+    total = sum(t.size or 0 for t in transfers)
+    moved = sum(t.bytes_done + t.bytes_resumed for t in transfers)
+    rate = sum(t.throughput() for t in transfers)
+    st.progress(moved / total if total else 0.0,
+                text=f"{moved / 1024 ** 2:,.1f} / {total / 1024 ** 2:,.1f} MB · {rate:,.1f} MB/s aggregate")
+    st.dataframe([t.row() for t in transfers], use_container_width=True, hide_index=True)
+
+@fragment(run_every=1)
+def _show_transfer_progress():
+    """Polls the running transfers without holding the script thread; reruns the page once they finish."""
+    run = st.session_state.get("sftp_run")
+    if run is None:
+        return
+    _render_transfers(run["transfers"])
+    if all(f.done() for f in run["futures"]):
+        st.rerun()
+    if st.button("⏹️ Cancel transfer"):
+        for t in run["transfers"]:
+            t.cancel()
+
+def _show_transfer_result(run):
+    transfers = run["transfers"]
+    _render_transfers(transfers)
+    if not run["recorded"]:
+        run["recorded"] = True
+        for t in transfers:
+            record_run(t.host, "sftp", f"{t.direction} {os.path.basename(t.local_path)} "
+                       f"{'->' if t.direction == UPLOAD else '<-'} {t.remote_path}",
+                       0 if t.status == "ok" else 1, t.duration, json.dumps(t.row()))
+    local_path = run["local_path"]
+    if run["direction"] == DOWNLOAD and transfers[0].status == "ok" and os.path.exists(local_path):
+        if os.path.getsize(local_path) > MAX_BROWSER_DOWNLOAD:
+            st.warning(f"⚠️ {os.path.basename(local_path)} is larger than "
+                       f"{MAX_BROWSER_DOWNLOAD // 1024 ** 2} MB and cannot be delivered through the browser.")
+        else:
+            with open(local_path, "rb") as f:
+                st.download_button("⬇️ Save to this computer", f, file_name=os.path.basename(local_path))
+
+def _render_fanout(run, progress, table, panes, seen):
+    counts = run.counts()
+    finished = sum(v for k, v in counts.items() if k not in ("queued", "running"))
+    progress.progress(finished / max(1, len(run.results)),
+                      text=" · ".join(f"{k}: {v}" for k, v in sorted(counts.items())))
+    table.dataframe(run.summary_rows(), use_container_width=True, hide_index=True)
+    for entry, result in run.results.items():
+        # Only panes whose output changed since the last tick are redrawn
+        if seen.get(entry) != (result.version, result.status):
+            seen[entry] = (result.version, result.status)
+            panes[entry].code(result.output or f"({result.status})", language="bash")
+
+def show_fanout_panel():
+    st.header("🌐 Fan-out to Host Group")
+    groups = load_host_groups()
+
+    with st.expander("🗂️ Manage host groups", expanded=not groups):
+        with st.form("host_group_form"):
+            group_name = st.text_input("Group name", placeholder="e.g., web-servers")
+            hosts_text = st.text_area("Hosts (one per line: host, user@host or user@host:port)")
+            if st.form_submit_button("💾 Save group"):
+                hosts = [h.strip() for h in hosts_text.splitlines() if h.strip()]
+                if group_name and hosts:
+                    groups[group_name] = hosts
+                    save_host_groups(groups)
+                    st.success(f"Saved {group_name} ({len(hosts)} hosts)")
+                    st.rerun()
+                else:
+                    st.warning("Please enter a group name and at least one host.")
+
+    if not groups:
+        st.info("ℹ️ Create a host group to run commands across several servers.")
+        return
+
+    with st.form("fanout_form"):
+        group = st.selectbox("Host group", list(groups), format_func=lambda g: f"{g} ({len(groups[g])} hosts)")
+        fan_cmd = st.text_area("Command to run on every host", "uptime")
+        colA, colB = st.columns(2)
+        with colA:
+            fan_user = st.text_input("Default username", value="root")
+            concurrency = st.slider("Concurrent hosts", 1, 200, 20)
+        with colB:
+            fan_password = st.text_input("Password", type="password")
+            host_timeout = st.number_input("Per-host timeout (s)", 5, 3600, 60)
+        start = st.form_submit_button("🚀 Run on group")
+
+    if start and fan_cmd:
+        run = FanOutRun(groups[group], fan_cmd, fan_user, fan_password, concurrency, host_timeout)
+        progress = st.empty()
+        table = st.empty()
+        panes = {}
+        for entry in run.results:
+            with st.expander(f"🖥️ {entry}"):
+                panes[entry] = st.empty()
+        seen = {}
+        while not run.done():
+            _render_fanout(run, progress, table, panes, seen)
+            time.sleep(0.25)
+        _render_fanout(run, progress, table, panes, seen)
+        for entry, result in run.results.items():
+            record_run(entry, "fanout", fan_cmd, result.exit_status, result.duration, result.output)
@@ -0,0 +1,182 @@
+import contextlib
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import streamlit as st
+from smartops.llm_stream import stream_response
+
+CACHE_DB = os.getenv("SMARTOPS_LLM_CACHE_DB", os.path.join("data", ".cache", "llm_cache.sqlite3"))
+MEMORY_ENTRIES = 256
+MAX_DISK_ENTRIES = 5000
+DEFAULT_TTL = 24 * 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    latency REAL NOT NULL,
+    created REAL NOT NULL,
+    expires REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_expires ON responses(expires);
+"""
+
+
+def normalize_prompt(prompt):
+    """Whitespace-insensitive form of a prompt: runs of spaces/newlines collapse to one space."""
+    return re.sub(r"\s+", " ", prompt).strip()
+
+
+def cache_key(prompt, model, params=None):
+    payload = json.dumps([normalize_prompt(prompt), model, params or {}], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier cache of model answers: an in-memory LRU in front of a SQLite
+    table that survives restarts. Every entry carries its own expiry and the
+    latency of the original generation, so hits can report the time they saved.
+    Entries put with `persist=False` stay in memory only and are gone on restart.
+    """
+
+    def __init__(self, path=CACHE_DB, memory_entries=MEMORY_ENTRIES, max_disk_entries=MAX_DISK_ENTRIES):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.saved_seconds = 0.0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            db.execute("PRAGMA journal_mode=WAL")
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        """Cached (response, original latency) or None; expired entries count as misses."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry["expires"] > now:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                self.saved_seconds += entry["latency"]
+                return entry["response"], entry["latency"]
+            self._memory.pop(key, None)
+        with self._connect() as db:
+            row = db.execute("SELECT response, latency, expires FROM responses WHERE key = ? AND expires > ?",
+                             (key, now)).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self._remember(key, {"response": row[0], "latency": row[1], "expires": row[2]})
+            self.disk_hits += 1
+            self.saved_seconds += row[1]
+        return row[0], row[1]
+
+    def put(self, key, model, response, latency, ttl=DEFAULT_TTL, persist=True):
+        now = time.time()
+        entry = {"response": response, "latency": latency, "expires": now + ttl}
+        with self._lock:
+            self._remember(key, entry)
+        if not persist:
+            return
+        with self._connect() as db:
+            db.execute("INSERT OR REPLACE INTO responses (key, model, response, latency, created, expires)"
+                       " VALUES (?, ?, ?, ?, ?, ?)", (key, model, response, latency, now, now + ttl))
+            db.execute("DELETE FROM responses WHERE expires <= ?", (now,))
+            db.execute("DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY created DESC "
+                       "LIMIT -1 OFFSET ?)", (self.max_disk_entries,))
+
+    def note_bypass(self):
+        with self._lock:
+            self.bypassed += 1
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        with self._connect() as db:
+            db.execute("DELETE FROM responses")
+
+    def stats(self):
+        with self._connect() as db:
+            disk = db.execute("SELECT COUNT(*) FROM responses WHERE expires > ?", (time.time(),)).fetchone()[0]
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {"memory_hits": self.memory_hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                    "bypassed": self.bypassed, "hit_rate": hits / lookups if lookups else 0.0,
+                    "saved_seconds": self.saved_seconds, "memory_entries": len(self._memory), "disk_entries": disk}
+
+
+@st.cache_resource
+def get_response_cache():
+    return ResponseCache()
+
+
+def cached_response(model, prompt, placeholder, feature, ttl=DEFAULT_TTL, bypass=False, params=None, persist=True):
+    """
+    Answer from the response cache when possible, otherwise stream a fresh
+    one (see stream_response) and store it for `ttl` seconds. With `bypass`
+    the cache is not read, but the fresh answer still replaces the entry.
+    The key covers the model's generation config as well as `params`.
+    Answers to user-written prompts should pass `persist=False`: they are then
+    kept in this process's memory only, for at most `ttl`, and never written to disk.
+    """
+    cache = get_response_cache()
+    model_name = getattr(model, "model_name", str(model))
+    # Temperature, max tokens etc. change the answer, so they are part of the key
+    params = {**(getattr(model, "_generation_config", None) or {}), **(params or {})}
+    key = cache_key(prompt, model_name, params)
+    if bypass:
+        cache.note_bypass()
+    else:
+        hit = cache.get(key)
+        if hit is not None:
+            placeholder.markdown(hit[0])
+            return hit[0]
+    start = time.perf_counter()
+    answer = stream_response(model, prompt, placeholder, feature)
+    if answer:
+        cache.put(key, model_name, answer, time.perf_counter() - start, ttl, persist)
+    return answer
+
+
+def show_cache_stats():
+    s = get_response_cache().stats()
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Hit rate", f"{s['hit_rate'] * 100:.0f}%")
+    c2.metric("Hits (memory / disk)", f"{s['memory_hits']} / {s['disk_hits']}")
+    c3.metric("Misses", s["misses"])
+    c4.metric("Latency saved", f"{s['saved_seconds']:.1f}s")
+    st.caption(f"{s['memory_entries']} entries in memory · {s['disk_entries']} on disk · {s['bypassed']} bypassed")
+    if st.button("🧹 Clear response cache"):
+        get_response_cache().clear()
+        st.rerun()
@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import deque
+
+import streamlit as st
+
+# The placeholder is redrawn at most this often while tokens arrive
+FLUSH_SECONDS = 0.1
+CURSOR = "▌"
+HISTORY = 200
+
+
+def _chunk_text(chunk):
+    # Chunks without text parts (e.g. safety metadata) raise on .text
+    try:
+        return chunk.text or ""
+    except (ValueError, AttributeError):
+        return ""
+
+
+class LatencyLog:
+    """Recent per-request timings (time to first token and total) for each assistant feature."""
+
+    def __init__(self, history=HISTORY):
+        self._runs = {}
+        self._history = history
+        self._lock = threading.Lock()
+
+    def record(self, feature, ttft, total, chars):
+        with self._lock:
+            self._runs.setdefault(feature, deque(maxlen=self._history)).append(
+                {"ttft": ttft, "total": total, "chars": chars, "ts": time.time()})
+
+    def summary(self):
+        def pct(values, q):
+            values = sorted(v for v in values if v is not None)
+            return values[min(len(values) - 1, int(len(values) * q))] if values else None
+
+        with self._lock:
+            runs = {k: list(v) for k, v in self._runs.items()}
+        rows = []
+        for feature, items in sorted(runs.items()):
+            ttft, total = [r["ttft"] for r in items], [r["total"] for r in items]
+            rows.append({"feature": feature, "requests": len(items),
+                         "ttft_p50_s": pct(ttft, 0.5), "ttft_p95_s": pct(ttft, 0.95),
+                         "total_p50_s": pct(total, 0.5), "total_p95_s": pct(total, 0.95),
+                         "last_ttft_s": items[-1]["ttft"], "last_total_s": items[-1]["total"]})
+        return rows
+
+
+@st.cache_resource
+def get_latency_log():
+    return LatencyLog()
+
+
+def stream_response(model, prompt, placeholder, feature, flush_seconds=FLUSH_SECONDS):
+    """
+    Generate with stream=True, drawing the growing answer into `placeholder`
+    at most every `flush_seconds`; returns the full text. Time to first token
+    and total latency are recorded under `feature`.
+    """
+    start = time.perf_counter()
+    first = None
+    parts = []
+    last_flush = 0.0
+    try:
+        for chunk in model.generate_content(prompt, stream=True):
+            text = _chunk_text(chunk)
+            if not text:
+                continue
+            now = time.perf_counter()
+            if first is None:
+                first = now
+            parts.append(text)
+            if now - last_flush >= flush_seconds:
+                last_flush = now
+                placeholder.markdown("".join(parts) + CURSOR)
+    finally:
+        total = time.perf_counter() - start
+        answer = "".join(parts)
+        get_latency_log().record(feature, first - start if first is not None else None, total, len(answer))
+    placeholder.markdown(answer or "No response generated")
+    return answer
+
+
+def show_latency_stats():
+    rows = get_latency_log().summary()
+    if not rows:
+        st.caption("No requests yet.")
+        return
+    st.dataframe([{k: round(v, 2) if isinstance(v, float) else v for k, v in r.items()} for r in rows],
+                 use_container_width=True, hide_index=True)
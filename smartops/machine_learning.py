@@ -1,12 +1,29 @@
 import io
 import os
+import time
 import pandas as pd
 import streamlit as st
-import matplotlib.pyplot as plt
-import seaborn as sns
-from smartops.utils import show_page_header, SKLEARN_AVAILABLE, MATPLOTLIB_AVAILABLE, TF_AVAILABLE
+from smartops.utils import show_page_header, fragment, SKLEARN_AVAILABLE, MATPLOTLIB_AVAILABLE, TF_AVAILABLE
+from smartops.ml_pipeline import (
+    TITANIC_FEATURES, train_titanic, score_passengers,
+    CHURN_ARCHITECTURE, CHURN_COLUMNS, run_churn_training,
+    train_salary, compare_salary_models,
+)
+from smartops.artifact_store import ArtifactStore
+from smartops.jobs import get_job_runner
+from smartops.churn_inference import load_churn_inference, score_customers
+from smartops.model_registry import get_model_registry, content_hash, file_hash, show_registry_stats
+from smartops.ingest import load_csv, file_cache_key
+from smartops.charts import NATIVE, chart_renderer_picker, show_count_chart, show_confusion_matrix
+
 
 # ================== TITANIC ==================
+def _train_titanic(data):
+    """Fit the survival model on raw CSV bytes; cached by content hash in the model registry."""
+    dataset, load_stats = load_csv(io.BytesIO(data), cache_key=f"titanic-{content_hash(data)[:16]}")
+    return {"dataset": dataset, "load_stats": load_stats, **train_titanic(dataset)}
+
+
 def show_titanic_survival():
     st.header("🚢 Titanic Survival Prediction")
     st.markdown("Upload Titanic dataset and predict survival using logistic regression.")
@@ -14,7 +31,19 @@ def show_titanic_survival():
     uploaded_file = st.file_uploader("Upload Titanic dataset (CSV)", type=["csv"], key="titanic_file")
     if uploaded_file is not None:
         try:
-            dataset = pd.read_csv(uploaded_file)
+            registry = get_model_registry()
+            data = uploaded_file.getvalue()
+            dataset_hash = content_hash(data)
+            with st.spinner("Training model..."):
+                trained, cached = registry.get_or_train(f"titanic:{dataset_hash}", lambda: _train_titanic(data))
+            dataset = trained["dataset"]
+            model = trained["model"]
+            features = trained["features"]
+
+            st.caption(f"📥 {trained['load_stats'].summary()}")
+            with st.expander("⚡ Model Cache", expanded=False):
+                st.caption("✅ Reused model trained on this file" if cached else "🆕 Trained a new model for this file")
+                show_registry_stats(registry)
 
             with st.expander("🔍 View Dataset"):
                 st.subheader("Dataset Overview")
@@ -26,27 +55,14 @@ def show_titanic_survival():
 
             # Visualizations
             st.subheader("📊 Data Visualizations")
+            renderer = chart_renderer_picker("titanic_chart_renderer")
             col1, col2 = st.columns(2)
             with col1:
-                fig1, ax1 = plt.subplots()
-                sns.countplot(data=dataset, x='Sex', hue='Survived', ax=ax1)
-                ax1.set_title('Survival by Gender')
-                st.pyplot(fig1)
-
-                fig3, ax3 = plt.subplots()
-                sns.countplot(data=dataset, x='SibSp', hue='Survived', ax=ax3)
-                ax3.set_title('Survival by Siblings/Spouses')
-                st.pyplot(fig3)
+                show_count_chart(dataset_hash, dataset, 'Sex', 'Survived', 'Survival by Gender', renderer)
+                show_count_chart(dataset_hash, dataset, 'SibSp', 'Survived', 'Survival by Siblings/Spouses', renderer)
             with col2:
-                fig2, ax2 = plt.subplots()
-                sns.countplot(data=dataset, x='Pclass', hue='Survived', ax=ax2)
-                ax2.set_title('Survival by Passenger Class')
-                st.pyplot(fig2)
-
-                fig4, ax4 = plt.subplots()
-                sns.countplot(data=dataset, x='Parch', hue='Survived', ax=ax4)
-                ax4.set_title('Survival by Parents/Children')
-                st.pyplot(fig4)
+                show_count_chart(dataset_hash, dataset, 'Pclass', 'Survived', 'Survival by Passenger Class', renderer)
+                show_count_chart(dataset_hash, dataset, 'Parch', 'Survived', 'Survival by Parents/Children', renderer)
 
             # Preprocessing
             st.subheader("🧹 Data Preprocessing")
@@ -54,40 +70,13 @@ def show_titanic_survival():
             missing_data = dataset[['Pclass','Sex','Age','SibSp','Parch']].isnull().sum()
             st.bar_chart(missing_data)
 
-            def fill_age(row):
-                age = row['Age']
-                pclass = row['Pclass']
-                if pd.isna(age):
-                    return 38 if pclass == 1 else (29 if pclass == 2 else 25)
-                return age
-
-            y = dataset['Survived']
-            X = dataset[['Pclass','Sex','Age','SibSp','Parch']].copy()
-            X['Age'] = X.apply(fill_age, axis=1)
-            X = pd.get_dummies(X, columns=['Sex','Pclass','SibSp','Parch'], drop_first=True)
-
-            from sklearn.model_selection import train_test_split
-            from sklearn.linear_model import LogisticRegression
-            from sklearn.metrics import confusion_matrix, accuracy_score, classification_report
-
-            X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-            model = LogisticRegression(max_iter=1000)
-            model.fit(X_train, y_train)
-            y_pred = model.predict(X_test)
-
             st.subheader("📈 Model Evaluation")
             col1, col2 = st.columns(2)
             with col1:
-                st.metric("Accuracy", f"{accuracy_score(y_test, y_pred) * 100:.2f}%")
-                report = classification_report(y_test, y_pred, output_dict=True)
-                st.json(report)
+                st.metric("Accuracy", f"{trained['accuracy'] * 100:.2f}%")
+                st.json(trained["report"])
             with col2:
-                cm = confusion_matrix(y_test, y_pred)
-                fig, ax = plt.subplots()
-                sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', ax=ax)
-                ax.set_xlabel('Predicted'); ax.set_ylabel('Actual')
-                ax.set_title('Confusion Matrix')
-                st.pyplot(fig)
+                show_confusion_matrix(trained["cm"], renderer)
 
             st.subheader("🔮 Make a Prediction")
             with st.form("prediction_form"):
@@ -101,18 +90,9 @@ def show_titanic_survival():
                     parch = st.selectbox("Parents/Children Aboard", [0,1,2,3,4,5,6])
 
                 if st.form_submit_button("Predict Survival"):
-                    input_data = {'Age': age}
-                    for col in X.columns:
-                        input_data[col] = 0
-                    if f"Sex_{sex}" in input_data:
-                        input_data[f"Sex_{sex}"] = 1
-                    if f"Pclass_{pclass}" in input_data:
-                        input_data[f"Pclass_{pclass}"] = 1
-                    if f"SibSp_{sibsp}" in input_data:
-                        input_data[f"SibSp_{sibsp}"] = 1
-                    if f"Parch_{parch}" in input_data:
-                        input_data[f"Parch_{parch}"] = 1
-                    input_df = pd.DataFrame([{**{c:0 for c in X.columns}, **input_data}])[X.columns]
+                    input_df = features.transform(pd.DataFrame([{
+                        'Pclass': pclass, 'Sex': sex, 'Age': age, 'SibSp': sibsp, 'Parch': parch,
+                    }]))
                     pred = model.predict(input_df)[0]
                     proba = model.predict_proba(input_df)[0][pred] * 100
                     if pred == 1:
@@ -120,6 +100,28 @@ def show_titanic_survival():
                     else:
                         st.error(f"💀 Predicted: DID NOT SURVIVE with {proba:.1f}% confidence")
 
+            st.subheader("📦 Batch Scoring")
+            st.caption("Upload a CSV of passengers (Pclass, Sex, Age, SibSp, Parch) to score them all at once.")
+            batch_file = st.file_uploader("Upload passengers (CSV)", type=["csv"], key="titanic_batch_file")
+            if batch_file is not None:
+                passengers, batch_stats = load_csv(batch_file)
+                st.caption(f"📥 {batch_stats.summary()}")
+                missing = [c for c in TITANIC_FEATURES if c not in passengers.columns]
+                if missing:
+                    st.error(f"CSV is missing columns: {', '.join(missing)}")
+                else:
+                    start = time.perf_counter()
+                    scored = score_passengers(model, features, passengers)
+                    elapsed = time.perf_counter() - start
+                    st.success(f"✅ Scored {len(scored):,} passengers in {elapsed:.2f}s")
+                    st.dataframe(scored.head(100))
+                    st.download_button(
+                        "⬇️ Download predictions",
+                        scored.to_csv(index=False).encode("utf-8"),
+                        file_name="titanic_predictions.csv",
+                        mime="text/csv",
+                    )
+
         except Exception as e:
             st.error(f"❌ Error: {e}")
     else:
@@ -127,65 +129,156 @@ def show_titanic_survival():
 
 
 # ================== CHURN ==================
-def show_churn_prediction():
-    st.header("📊 Churn Prediction Model")
-    st.markdown("Predict customer churn using a neural network model.")
-    try:
-        dataset_path = os.path.join("data", "Churn_Modelling.csv")
-        dataset = pd.read_csv(dataset_path)
-        if st.checkbox("Show Dataset Sample"):
-            st.dataframe(dataset.head())
+@st.cache_data(show_spinner=False)
+def _load_churn_dataset(path, mtime):
+    """Read the churn columns once per file version; returns (content hash, DataFrame, LoadStats)."""
+    dataset, stats = load_csv(path, cache_key=file_cache_key(path), usecols=CHURN_COLUMNS)
+    return file_hash(path), dataset, stats
 
-        y = dataset["Exited"]
-        X = dataset[['CreditScore','Age','Tenure','Balance','NumOfProducts','HasCrCard','IsActiveMember','EstimatedSalary','Geography','Gender']]
 
-        geo = pd.get_dummies(X["Geography"], drop_first=True, prefix='Geo')
-        gender = pd.get_dummies(X["Gender"], drop_first=True, prefix='Gender')
-        X = pd.concat([X[['CreditScore','Age','Tenure','Balance','NumOfProducts','HasCrCard','IsActiveMember','EstimatedSalary']], geo, gender], axis=1)
+@st.cache_resource(show_spinner=False)
+def _load_churn_artifact(path):
+    return ArtifactStore().load(path)
 
-        from sklearn.model_selection import train_test_split
-        from sklearn.preprocessing import StandardScaler
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-        scaler = StandardScaler()
-        X_train = scaler.fit_transform(X_train)
-        X_test = scaler.transform(X_test)
 
-        if not TF_AVAILABLE:
-            st.error("TensorFlow not installed. Install with: pip install tensorflow")
+def _show_churn_metrics(metrics, renderer=NATIVE):
+    st.metric("Test Accuracy", f"{metrics['accuracy']*100:.2f}%")
+
+    st.subheader("📊 Classification Report")
+    st.json(metrics["report"])
+
+    st.subheader("📈 Confusion Matrix")
+    show_confusion_matrix(metrics["cm"], renderer)
+
+
+@fragment(run_every=2)
+def _show_churn_job(job_id):
+    """Polls the background training job; reruns the whole page once it finishes."""
+    runner = get_job_runner()
+    job = runner.get(job_id)
+    if job is None:
+        return
+    snap = job.snapshot()
+    status = snap["status"]
+    st.subheader(f"⚙️ Training job {job.id}")
+    st.caption(f"{snap['description']} · {runner.active_count()} active / {runner.max_workers} slots")
+    epochs = snap.get("epochs") or 1
+    st.progress(min(snap.get("epoch", 0) / epochs, 1.0), text=f"{status} · epoch {snap.get('epoch', 0)}/{epochs}")
+    if snap.get("history"):
+        st.line_chart(pd.DataFrame(snap["history"])[[c for c in ("loss", "val_loss") if c in snap["history"][0]]])
+    if status in ("queued", "running"):
+        if st.button("⏹️ Cancel Training", key=f"cancel_{job.id}"):
+            runner.cancel(job.id)
+    elif status == "failed":
+        st.error(f"❌ Training failed: {job.future.exception()}")
+    elif status == "cancelled":
+        st.warning("Training cancelled.")
+    elif status == "done":
+        st.rerun()
+
+
+def _show_churn_scoring(artifact):
+    """Single and batch scoring with the numpy forward pass (TensorFlow is never imported)."""
+    model = load_churn_inference(artifact)
+
+    st.subheader("🔮 Score a Customer")
+    with st.form("churn_predict_form"):
+        colA, colB = st.columns(2)
+        with colA:
+            credit = st.number_input("Credit Score", 300, 900, 650)
+            age = st.number_input("Age", 18, 100, 40)
+            tenure = st.number_input("Tenure (years)", 0, 10, 5)
+            balance = st.number_input("Balance", 0.0, value=50000.0)
+            products = st.selectbox("Number of Products", [1, 2, 3, 4])
+        with colB:
+            geography = st.selectbox("Geography", ["France", "Germany", "Spain"])
+            gender = st.radio("Gender", ["Female", "Male"])
+            has_card = st.checkbox("Has Credit Card", value=True)
+            active = st.checkbox("Active Member", value=True)
+            salary = st.number_input("Estimated Salary", 0.0, value=100000.0)
+        if st.form_submit_button("Predict Churn"):
+            customer = pd.DataFrame([{
+                'CreditScore': credit, 'Age': age, 'Tenure': tenure, 'Balance': balance,
+                'NumOfProducts': products, 'HasCrCard': int(has_card), 'IsActiveMember': int(active),
+                'EstimatedSalary': salary, 'Geography': geography, 'Gender': gender,
+            }])
+            proba = float(model.predict_proba(customer)[0])
+            if proba >= 0.5:
+                st.error(f"⚠️ Likely to churn ({proba * 100:.1f}%)")
+            else:
+                st.success(f"✅ Likely to stay ({(1 - proba) * 100:.1f}%)")
+
+    st.subheader("📦 Batch Scoring")
+    batch_file = st.file_uploader("Upload customers (CSV)", type=["csv"], key="churn_batch_file")
+    if batch_file is not None:
+        customers, batch_stats = load_csv(batch_file)
+        st.caption(f"📥 {batch_stats.summary()}")
+        missing = [c for c in CHURN_COLUMNS if c != "Exited" and c not in customers.columns]
+        if missing:
+            st.error(f"CSV is missing columns: {', '.join(missing)}")
             return
+        start = time.perf_counter()
+        scored = score_customers(model, customers)
+        elapsed = time.perf_counter() - start
+        st.success(f"✅ Scored {len(scored):,} customers in {elapsed:.2f}s")
+        st.dataframe(scored.head(100))
+        st.download_button("⬇️ Download predictions", scored.to_csv(index=False).encode("utf-8"),
+                           file_name="churn_predictions.csv", mime="text/csv")
 
-        from tensorflow.keras.models import Sequential
-        from tensorflow.keras.layers import Dense
-        from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
 
-        model = Sequential()
-        model.add(Dense(units=6, input_dim=X_train.shape[1], kernel_initializer='he_uniform', activation='relu'))
-        model.add(Dense(units=7, kernel_initializer='he_uniform', activation='relu'))
-        model.add(Dense(units=5, kernel_initializer='he_uniform', activation='relu'))
-        model.add(Dense(units=1, kernel_initializer='glorot_uniform', activation='sigmoid'))
-        model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
+def show_churn_prediction():
+    st.header("📊 Churn Prediction Model")
+    st.markdown("Predict customer churn using a neural network model.")
+    try:
+        dataset_path = os.path.join("data", "Churn_Modelling.csv")
+        dataset_hash, dataset, load_stats = _load_churn_dataset(dataset_path, os.path.getmtime(dataset_path))
+        st.caption(f"📥 {load_stats.summary()}")
+        if st.checkbox("Show Dataset Sample"):
+            st.dataframe(dataset.head())
 
         epochs = st.sidebar.slider("Number of Epochs", 1, 50, 10)
         batch_size = st.sidebar.selectbox("Batch Size", [16,32,64], index=1)
-
-        if st.button("🚀 Train Model"):
-            with st.spinner("Training the model..."):
-                history = model.fit(X_train, y_train, validation_split=0.2, batch_size=batch_size, epochs=epochs, verbose=0)
-                y_pred = (model.predict(X_test) > 0.5).astype(int)
-                st.success("✅ Model training completed!")
-                acc = accuracy_score(y_test, y_pred)
-                st.metric("Test Accuracy", f"{acc*100:.2f}%")
-
-                st.subheader("📊 Classification Report")
-                report = classification_report(y_test, y_pred, output_dict=True)
-                st.json(report)
-
-                st.subheader("📈 Confusion Matrix")
-                cm = confusion_matrix(y_test, y_pred)
-                fig, ax = plt.subplots()
-                sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', ax=ax)
-                ax.set_xlabel('Predicted'); ax.set_ylabel('Actual'); ax.set_title('Confusion Matrix')
-                st.pyplot(fig)
+        params = {"epochs": epochs, "batch_size": batch_size}
+
+        store = ArtifactStore()
+        stored_path = store.find("churn", dataset_hash, CHURN_ARCHITECTURE, params)
+        latest_path = store.find("churn", dataset_hash, CHURN_ARCHITECTURE)
+        warm_start = False
+        if latest_path:
+            warm_start = st.checkbox(
+                f"♻️ Warm start from stored weights ({os.path.basename(latest_path)})",
+                value=False,
+                help="Continue training from the most recent artifact for this dataset and architecture.",
+            )
+
+        runner = get_job_runner()
+        job = runner.get(st.session_state.get("churn_job_id"))
+        if st.button("🚀 Train Model", disabled=job is not None and job.status in ("queued", "running", "cancelling")):
+            if not TF_AVAILABLE:
+                st.error("TensorFlow not installed. Install with: pip install tensorflow")
+                return
+            st.session_state.churn_job_id = runner.submit(
+                "churn", f"Churn · {epochs} epochs · batch {batch_size}",
+                run_churn_training, dataset_path, dataset_hash, params,
+                warm_start_path=latest_path if warm_start else None, artifact_root=store.root,
+            )
+            job = runner.get(st.session_state.churn_job_id)
+
+        if job is not None and job.status == "done":
+            st.success(f"✅ Model training completed! Saved as {job.future.result()['path']}")
+            del st.session_state["churn_job_id"]
+            job = None
+            stored_path = store.find("churn", dataset_hash, CHURN_ARCHITECTURE, params)
+        if job is not None:
+            _show_churn_job(job.id)
+
+        if stored_path:
+            artifact = _load_churn_artifact(stored_path)
+            st.info(f"📦 Loaded stored model {os.path.basename(stored_path)} trained with {epochs} epochs, batch size {batch_size}.")
+            _show_churn_metrics(artifact["metrics"], chart_renderer_picker("churn_chart_renderer"))
+            _show_churn_scoring(artifact)
+        elif job is None:
+            st.info("ℹ️ No stored model for these settings yet. Press Train Model to create one.")
 
     except Exception as e:
         st.error(f"❌ An error occurred: {str(e)}")
@@ -200,7 +293,8 @@ def show_salary_prediction():
     uploaded_file = st.file_uploader("Upload CSV", type=["csv"], key="salary_file")
     if uploaded_file is not None:
         try:
-            dataset = pd.read_csv(uploaded_file)
+            dataset, load_stats = load_csv(uploaded_file, cache_key=f"salary-{content_hash(uploaded_file.getvalue())[:16]}")
+            st.caption(f"📥 {load_stats.summary()}")
             st.subheader("Dataset Preview")
             st.dataframe(dataset.head())
 
@@ -211,18 +305,31 @@ def show_salary_prediction():
             y = dataset['Salary']
             X = dataset.drop(columns=['Salary'])
 
-            from sklearn.model_selection import train_test_split
-            from sklearn.linear_model import LinearRegression
-            from sklearn.metrics import mean_squared_error, r2_score
-
-            X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-            model = LinearRegression()
-            model.fit(X_train, y_train)
-            y_pred = model.predict(X_test)
+            trained = train_salary(X, y)
+            model = trained["model"]
 
             st.subheader("📈 Model Performance")
-            st.write(f"R² Score: {r2_score(y_test, y_pred):.2f}")
-            st.write(f"Mean Squared Error: {mean_squared_error(y_test, y_pred):.2f}")
+            st.write(f"R² Score: {trained['r2']:.2f}")
+            st.write(f"Mean Squared Error: {trained['mse']:.2f}")
+
+            st.subheader("🏁 Model Comparison")
+            compare = st.checkbox("Compare regressors with k-fold cross-validation", key="salary_compare")
+            if compare:
+                folds = st.slider("Folds", 2, 10, 5, key="salary_folds")
+                if len(X) < folds:
+                    st.warning(f"Need at least {folds} rows for {folds}-fold CV.")
+                else:
+                    registry = get_model_registry()
+                    key = f"salary-cv:{folds}:{content_hash(uploaded_file.getvalue())}"
+                    with st.spinner(f"Cross-validating candidates on {os.cpu_count()} cores..."):
+                        (results, best), cached = registry.get_or_train(key, lambda: compare_salary_models(X, y, folds))
+                    st.dataframe(results.style.format({
+                        "r2": "{:.3f}", "r2_std": "{:.3f}", "mse": "{:,.2f}",
+                        "fit_time_s": "{:.4f}", "predict_time_s": "{:.4f}",
+                    }), use_container_width=True)
+                    winner = results.iloc[0]
+                    st.success(f"🏆 Best: {winner['model']} ({winner['params']}) · CV R² {winner['r2']:.3f}. Used for predictions below.")
+                    model = best
 
             st.subheader("🔮 Make a Prediction")
             with st.form("salary_predict_form"):
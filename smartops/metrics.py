@@ -0,0 +1,271 @@
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+from smartops.ssh_pool import get_ssh_pool
+from smartops.ssh_stream import run_command
+
+SAMPLE_SECONDS = 5
+DOCKER_EVERY = 6  # docker stats every 6th tick (30 s): it is much slower than /proc reads
+LOCAL = "localhost"
+# A session's SSH host is sampled while the session keeps renewing its watch (every page rerun)
+WATCH_SECONDS = 10 * 60
+PROBE_TIMEOUT = 4
+DOCKER_TIMEOUT = 20
+MAX_PROBES = 8
+# Series with no new sample for this long are dropped (removed containers, hosts nobody watches any more)
+SERIES_TTL = 24 * 3600
+CONTAINER_SERIES_TTL = 3600
+# (name, bucket seconds, points kept): 1 h of raw samples, 24 h of 1-min and 7 d of 15-min averages
+TIERS = [("raw", SAMPLE_SECONDS, 720), ("1m", 60, 1440), ("15m", 900, 672)]
+
+# One remote call per host per tick gathers everything the /proc parsers need
+REMOTE_PROBE = "head -1 /proc/stat; cat /proc/loadavg; grep -E '^(MemTotal|MemAvailable):' /proc/meminfo; df -Pk / | tail -1"
+DOCKER_STATS = "docker stats --no-stream --format '{{json .}}'"
+
+
+class TieredSeries:
+    """Fixed-size ring buffers per retention tier; coarser tiers hold bucket averages."""
+
+    def __init__(self):
+        self.tiers = {name: deque(maxlen=size) for name, _, size in TIERS}
+        self._buckets = {name: None for name, _, _ in TIERS[1:]}
+
+    def add(self, ts, value):
+        self.tiers["raw"].append((ts, value))
+        for name, width, _ in TIERS[1:]:
+            start = ts - ts % width
+            bucket = self._buckets[name]
+            if bucket and bucket[0] != start:
+                self.tiers[name].append((bucket[0], bucket[1] / bucket[2]))
+                bucket = None
+            self._buckets[name] = (start, value, 1) if bucket is None else (start, bucket[1] + value, bucket[2] + 1)
+
+    def points(self, tier="raw"):
+        return list(self.tiers[tier])
+
+    def last(self):
+        raw = self.tiers["raw"]
+        return raw[-1][1] if raw else None
+
+    def updated(self):
+        raw = self.tiers["raw"]
+        return raw[-1][0] if raw else None
+
+
+def _parse_probe(lines, previous_cpu):
+    """Parse REMOTE_PROBE-style output; returns (metrics dict, cpu counters for the next delta)."""
+    metrics, cpu = {}, None
+    mem = {}
+    for line in lines:
+        parts = line.split()
+        if not parts:
+            continue
+        if parts[0] == "cpu":
+            cpu = [int(v) for v in parts[1:]]
+            if previous_cpu:
+                deltas = [a - b for a, b in zip(cpu, previous_cpu)]
+                total = sum(deltas)
+                idle = deltas[3] + (deltas[4] if len(deltas) > 4 else 0)
+                if total > 0:
+                    metrics["cpu_pct"] = 100.0 * (1 - idle / total)
+        elif parts[0] in ("MemTotal:", "MemAvailable:"):
+            mem[parts[0]] = int(parts[1])
+        elif len(parts) >= 5 and "/" in parts[3] and parts[0].replace(".", "", 1).isdigit():
+            metrics["load1"] = float(parts[0])
+        elif len(parts) >= 6 and parts[-1] == "/" and parts[4].endswith("%"):
+            metrics["disk_pct"] = float(parts[4].rstrip("%"))
+    if mem.get("MemTotal:"):
+        metrics["mem_pct"] = 100.0 * (1 - mem.get("MemAvailable:", 0) / mem["MemTotal:"])
+    return metrics, cpu
+
+
+def _local_probe_lines():
+    lines = []
+    for path, first_only in (("/proc/stat", True), ("/proc/loadavg", False)):
+        try:
+            with open(path) as f:
+                lines.append(f.readline().strip() if first_only else f.read().strip())
+        except OSError:
+            pass
+    try:
+        with open("/proc/meminfo") as f:
+            lines += [l.strip() for l in f if l.startswith(("MemTotal:", "MemAvailable:"))]
+    except OSError:
+        pass
+    usage = shutil.disk_usage("/")
+    lines.append(f"/ {usage.total // 1024} {usage.used // 1024} {usage.free // 1024} "
+                 f"{round(100 * usage.used / usage.total)}% /")
+    return lines
+
+
+def _parse_docker_stats(output):
+    metrics = {}
+    for line in output.splitlines():
+        line = line.strip()
+        if not line.startswith("{"):
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            continue
+        name = row.get("Name") or row.get("Container", "?")
+        for key, field in (("cpu_pct", "CPUPerc"), ("mem_pct", "MemPerc")):
+            try:
+                metrics[f"container:{name}:{key}"] = float(str(row.get(field, "")).rstrip("%"))
+            except ValueError:
+                pass
+    return metrics
+
+
+class MetricsCollector:
+    """
+    Background sampler for the local host and the SSH hosts that sessions are
+    connected to (see `watch`); remote hosts are probed in parallel, each with
+    its own timeout. A host whose previous probe is still running is skipped
+    for the tick. Pages read from the in-memory series and never trigger a remote call.
+    """
+
+    def __init__(self, interval=SAMPLE_SECONDS):
+        self.interval = interval
+        self.series = {}
+        self.activity = deque(maxlen=50)
+        self.last_sample = {}
+        self.running_containers = {}
+        self._cpu = {}
+        self._tick = 0
+        self._watched = {}
+        self._lock = threading.Lock()
+        self._probes = ThreadPoolExecutor(max_workers=MAX_PROBES, thread_name_prefix="metrics-probe")
+        self._in_flight = {}
+        threading.Thread(target=self._loop, daemon=True, name="metrics-collector").start()
+
+    def _record(self, host, metrics, ts, with_docker=False):
+        with self._lock:
+            for name, value in metrics.items():
+                self.series.setdefault((host, name), TieredSeries()).add(ts, value)
+            self.last_sample[host] = ts
+            if with_docker:
+                self.running_containers[host] = {n.split(":")[1] for n in metrics if n.startswith("container:")}
+
+    def _evict(self, now):
+        with self._lock:
+            for key, series in list(self.series.items()):
+                ttl = CONTAINER_SERIES_TTL if key[1].startswith("container:") else SERIES_TTL
+                if now - (series.updated() or 0) > ttl:
+                    del self.series[key]
+            hosts = {h for h, _ in self.series}
+            for host in [h for h in self.last_sample if h not in hosts]:
+                self.last_sample.pop(host)
+                self.running_containers.pop(host, None)
+                self._cpu.pop(host, None)
+
+    def _log(self, message):
+        self.activity.appendleft((time.time(), message))
+
+    def _loop(self):
+        while True:
+            started = time.time()
+            try:
+                self.sample_once()
+            except Exception as e:
+                self._log(f"⚠️ sampler error: {e}")
+            self._tick += 1
+            time.sleep(max(0.0, self.interval - (time.time() - started)))
+
+    def sample_once(self):
+        ts = time.time()
+        with_docker = self._tick % DOCKER_EVERY == 0
+
+        metrics, self._cpu[LOCAL] = _parse_probe(_local_probe_lines(), self._cpu.get(LOCAL))
+        docker_ok = False
+        if with_docker and shutil.which("docker"):
+            try:
+                out = subprocess.run(DOCKER_STATS, shell=True, capture_output=True, text=True, timeout=20).stdout
+                metrics.update(_parse_docker_stats(out))
+                docker_ok = True
+            except (subprocess.SubprocessError, OSError):
+                pass
+        self._record(LOCAL, metrics, ts, docker_ok)
+
+        # Probes are not awaited: a slow host records late instead of delaying the next tick
+        labels = set()
+        for conn in self._watched_connections(ts):
+            host = self._label(conn)
+            labels.add(host)
+            running = self._in_flight.get(host)
+            if running is not None and not running.done():
+                continue
+            self._in_flight[host] = self._probes.submit(self._sample_remote, conn, with_docker, ts)
+        self._in_flight = {h: f for h, f in self._in_flight.items() if h in labels or not f.done()}
+        self._evict(ts)
+
+    def watch(self, key):
+        """Sample the pooled connection for `key` for the next WATCH_SECONDS."""
+        with self._lock:
+            self._watched[key] = time.time() + WATCH_SECONDS
+
+    def _watched_connections(self, now):
+        with self._lock:
+            self._watched = {k: until for k, until in self._watched.items() if until > now}
+            watched = set(self._watched)
+        # connections() does not touch the pool, so sampling never keeps an idle transport alive
+        return [c for c in get_ssh_pool().connections() if c.key in watched]
+
+    @staticmethod
+    def _label(conn):
+        return f"{conn.username}@{conn.host}"
+
+    def _sample_remote(self, conn, with_docker, ts):
+        """Probe one host on a pool thread; failures go to the activity log."""
+        host = self._label(conn)
+        try:
+            status, out = run_command(conn.client, REMOTE_PROBE, timeout=PROBE_TIMEOUT)
+            metrics, self._cpu[host] = _parse_probe(out.splitlines(), self._cpu.get(host))
+            docker_ok = False
+            if with_docker:
+                status, out = run_command(conn.client, DOCKER_STATS, timeout=DOCKER_TIMEOUT)
+                if status == 0:
+                    docker_ok = True
+                    metrics.update(_parse_docker_stats(out))
+            if host not in self.last_sample:
+                self._log(f"🔵 Started sampling {host}")
+            self._record(host, metrics, ts, docker_ok)
+        except Exception as e:
+            self._log(f"⚠️ {host}: {e}")
+
+    def hosts(self):
+        with self._lock:
+            return sorted({h for h, _ in self.series}, key=lambda h: (h != LOCAL, h))
+
+    def metric_names(self, host):
+        with self._lock:
+            return sorted(name for h, name in self.series if h == host)
+
+    def get(self, host, name):
+        with self._lock:
+            return self.series.get((host, name))
+
+    def containers(self, host):
+        """Container names seen in the host's latest docker sample."""
+        with self._lock:
+            return sorted(self.running_containers.get(host, ()))
+
+
+@st.cache_resource
+def get_metrics_collector():
+    """Single collector thread per server process."""
+    return MetricsCollector()
+
+
+def watch_session_host():
+    """Keep sampling the current session's SSH host; called on every rerun of the pages that use it."""
+    key = st.session_state.get("ssh_key")
+    if key:
+        get_metrics_collector().watch(key)
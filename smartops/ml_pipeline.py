@@ -0,0 +1,250 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+# ================== TITANIC FEATURES ==================
+TITANIC_FEATURES = ['Pclass', 'Sex', 'Age', 'SibSp', 'Parch']
+TITANIC_CATEGORICAL = ['Sex', 'Pclass', 'SibSp', 'Parch']
+# Typical passenger age per class, used when Age is missing
+AGE_BY_CLASS = {1: 38, 2: 29, 3: 25}
+
+
+class TitanicFeatures:
+    """
+    Fitted preprocessing for the Titanic model.
+    `fit` records the category levels seen in training so `transform` always
+    yields the same one-hot columns in the same order, whether it is given the
+    training frame, a single passenger, or a large batch.
+    """
+
+    def __init__(self):
+        self.categories = {}
+        self.columns = []
+
+    def fit(self, df):
+        for col in TITANIC_CATEGORICAL:
+            self.categories[col] = sorted(df[col].dropna().unique().tolist())
+        self.columns = list(self._encode(df).columns)
+        return self
+
+    def transform(self, df):
+        return self._encode(df).reindex(columns=self.columns, fill_value=0)
+
+    def fit_transform(self, df):
+        return self.fit(df).transform(df)
+
+    def _encode(self, df):
+        X = df[TITANIC_FEATURES].copy()
+        X['Age'] = X['Age'].fillna(X['Pclass'].map(AGE_BY_CLASS)).fillna(AGE_BY_CLASS[3]).astype(float)
+        for col in TITANIC_CATEGORICAL:
+            levels = self.categories.get(col)
+            # Levels unseen in training become missing (all-zero dummies); pandas will stop doing this implicitly
+            values = X[col] if levels is None else X[col].where(X[col].isin(levels))
+            X[col] = pd.Categorical(values, categories=levels)
+        return pd.get_dummies(X, columns=TITANIC_CATEGORICAL, drop_first=True, dtype=np.uint8)
+
+
+def train_titanic(dataset):
+    """Fit features + logistic regression on a Titanic frame and evaluate on a held-out 20%."""
+    from sklearn.model_selection import train_test_split
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.metrics import confusion_matrix, accuracy_score, classification_report
+
+    features = TitanicFeatures()
+    y = dataset['Survived']
+    X = features.fit_transform(dataset)
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    model = LogisticRegression(max_iter=1000)
+    model.fit(X_train, y_train)
+    y_pred = model.predict(X_test)
+
+    return {
+        "features": features,
+        "model": model,
+        "accuracy": accuracy_score(y_test, y_pred),
+        "report": classification_report(y_test, y_pred, output_dict=True),
+        "cm": confusion_matrix(y_test, y_pred),
+    }
+
+
+def score_passengers(model, features, df):
+    """Vectorized batch scoring: returns `df` with survival probability and predicted label appended."""
+    proba = model.predict_proba(features.transform(df))[:, 1]
+    out = df.copy()
+    out['Survival_Probability'] = proba
+    out['Predicted_Survived'] = (proba >= 0.5).astype(np.uint8)
+    return out
+
+
+# ================== CHURN ==================
+CHURN_NUMERIC = ['CreditScore', 'Age', 'Tenure', 'Balance', 'NumOfProducts', 'HasCrCard', 'IsActiveMember', 'EstimatedSalary']
+CHURN_COLUMNS = CHURN_NUMERIC + ['Geography', 'Gender', 'Exited']
+CHURN_ARCHITECTURE = [
+    {"units": 6, "kernel_initializer": "he_uniform", "activation": "relu"},
+    {"units": 7, "kernel_initializer": "he_uniform", "activation": "relu"},
+    {"units": 5, "kernel_initializer": "he_uniform", "activation": "relu"},
+    {"units": 1, "kernel_initializer": "glorot_uniform", "activation": "sigmoid"},
+]
+
+
+def churn_features(dataset):
+    geo = pd.get_dummies(dataset["Geography"], drop_first=True, prefix='Geo')
+    gender = pd.get_dummies(dataset["Gender"], drop_first=True, prefix='Gender')
+    return pd.concat([dataset[CHURN_NUMERIC], geo, gender], axis=1)
+
+
+def prepare_churn(dataset, scaler=None):
+    """Split and scale the churn data. A stored `scaler` is reused instead of refitting."""
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+
+    y = dataset["Exited"]
+    X = churn_features(dataset)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    if scaler is None:
+        scaler = StandardScaler().fit(X_train)
+    return scaler.transform(X_train), scaler.transform(X_test), y_train, y_test, scaler
+
+
+def build_churn_model(input_dim, architecture=CHURN_ARCHITECTURE):
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import Dense
+
+    model = Sequential()
+    for i, layer in enumerate(architecture):
+        if i == 0:
+            model.add(Dense(input_dim=input_dim, **layer))
+        else:
+            model.add(Dense(**layer))
+    model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
+    return model
+
+
+def run_churn_training(dataset_path, dataset_hash, params, warm_start_path=None, artifact_root=None,
+                       progress=None, cancel_event=None):
+    """
+    Train the churn network end to end and save it to the artifact store.
+    Runs in a job-runner worker process: per-epoch loss/accuracy go into
+    `progress` and training stops early once `cancel_event` is set.
+    """
+    import tensorflow as tf
+    from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
+    from smartops.artifact_store import ArtifactStore, ARTIFACT_DIR
+    from smartops.ingest import load_csv, file_cache_key
+    from smartops.churn_inference import export_churn_inference
+
+    progress = progress if progress is not None else {}
+    epochs = params["epochs"]
+    progress.update({"status": "running", "epoch": 0, "epochs": epochs, "started": time.time()})
+
+    class _Progress(tf.keras.callbacks.Callback):
+        def on_epoch_end(self, epoch, logs=None):
+            logs = logs or {}
+            history = list(progress.get("history", []))
+            history.append({k: float(v) for k, v in logs.items()})
+            progress.update({"epoch": epoch + 1, "loss": float(logs.get("loss", 0.0)), "history": history})
+            if cancel_event is not None and cancel_event.is_set():
+                self.model.stop_training = True
+
+    store = ArtifactStore(artifact_root or ARTIFACT_DIR)
+    base = store.load(warm_start_path) if warm_start_path else None
+    dataset, _ = load_csv(dataset_path, cache_key=file_cache_key(dataset_path), usecols=CHURN_COLUMNS)
+    X_train, X_test, y_train, y_test, scaler = prepare_churn(dataset, base["scaler"] if base else None)
+    model = build_churn_model(X_train.shape[1])
+    if base:
+        model.set_weights(base["weights"])
+    history = model.fit(X_train, y_train, validation_split=0.2, batch_size=params["batch_size"],
+                        epochs=epochs, verbose=0, callbacks=[_Progress()])
+
+    if cancel_event is not None and cancel_event.is_set():
+        progress["status"] = "cancelled"
+        return {"cancelled": True}
+
+    y_pred = (model.predict(X_test, verbose=0) > 0.5).astype(int)
+    metrics = {
+        "accuracy": accuracy_score(y_test, y_pred),
+        "report": classification_report(y_test, y_pred, output_dict=True),
+        "cm": confusion_matrix(y_test, y_pred),
+        "history": history.history,
+        "warm_start_from": warm_start_path,
+    }
+    weights = model.get_weights()
+    parity = {}
+
+    def _export(tmp_dir):
+        # Numpy export lets the page score customers without importing TensorFlow;
+        # it raises on a parity mismatch, so a bad version is never published
+        parity["max_diff"] = export_churn_inference(tmp_dir, weights, CHURN_ARCHITECTURE, scaler, model,
+                                                    X_test[:4096])
+
+    path = store.save("churn", dataset_hash, CHURN_ARCHITECTURE, params, scaler, weights, metrics,
+                      before_publish=_export)
+    progress["status"] = "done"
+    return {"cancelled": False, "path": path, "numpy_max_diff": parity["max_diff"]}
+
+
+# ================== SALARY ==================
+def train_salary(X, y):
+    """Baseline linear regression on an 80/20 split."""
+    from sklearn.model_selection import train_test_split
+    from sklearn.linear_model import LinearRegression
+    from sklearn.metrics import mean_squared_error, r2_score
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    model = LinearRegression()
+    model.fit(X_train, y_train)
+    y_pred = model.predict(X_test)
+    return {"model": model, "r2": r2_score(y_test, y_pred), "mse": mean_squared_error(y_test, y_pred)}
+
+
+def salary_candidates():
+    """Regressors and hyperparameter grids compared by `compare_salary_models`."""
+    from sklearn.linear_model import LinearRegression, Ridge, Lasso
+    from sklearn.tree import DecisionTreeRegressor
+    from sklearn.ensemble import RandomForestRegressor
+
+    return [
+        {"model": [LinearRegression()]},
+        {"model": [Ridge()], "model__alpha": [0.1, 1.0, 10.0, 100.0]},
+        {"model": [Lasso(max_iter=10000)], "model__alpha": [0.1, 1.0, 10.0, 100.0]},
+        {"model": [DecisionTreeRegressor(random_state=42)], "model__max_depth": [2, 4, 8, None]},
+        {"model": [RandomForestRegressor(random_state=42, n_jobs=1)],
+         "model__n_estimators": [50, 200], "model__max_depth": [4, None]},
+    ]
+
+
+def compare_salary_models(X, y, folds=5, n_jobs=-1):
+    """
+    K-fold CV over every candidate/hyperparameter combination in one sweep.
+    Fits are spread over a process pool (`n_jobs=-1` uses every core); the
+    best candidate by mean R² is refit on all rows and returned with the
+    per-candidate results table.
+    """
+    from sklearn.model_selection import GridSearchCV, KFold
+    from sklearn.pipeline import Pipeline
+    from sklearn.linear_model import LinearRegression
+
+    search = GridSearchCV(
+        Pipeline([("model", LinearRegression())]),
+        salary_candidates(),
+        scoring={"r2": "r2", "mse": "neg_mean_squared_error"},
+        refit="r2",
+        cv=KFold(n_splits=folds, shuffle=True, random_state=42),
+        n_jobs=n_jobs,
+    )
+    search.fit(X, y)
+
+    cv = search.cv_results_
+    results = pd.DataFrame({
+        "model": [type(p["model"]).__name__ for p in cv["params"]],
+        "params": [", ".join(f"{k.split('__', 1)[1]}={v}" for k, v in p.items() if k != "model") or "-"
+                   for p in cv["params"]],
+        "r2": cv["mean_test_r2"],
+        "r2_std": cv["std_test_r2"],
+        "mse": -cv["mean_test_mse"],
+        "fit_time_s": cv["mean_fit_time"],
+        "predict_time_s": cv["mean_score_time"],
+    }).sort_values("r2", ascending=False, ignore_index=True)
+    return results, search.best_estimator_
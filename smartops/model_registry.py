@@ -0,0 +1,153 @@
+import hashlib
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import streamlit as st
+
+
+def content_hash(data):
+    """Stable key for an uploaded file: sha256 of its raw bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_hash(path, block_size=1024 * 1024):
+    """sha256 of a file on disk, streamed in blocks so large extracts are never fully in memory."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _estimate_size(value):
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        # Unpicklable entries (e.g. holding a lock or a TF graph) still count toward max_bytes
+        return _memory_size(value)
+
+
+def _memory_size(value, depth=3):
+    """In-memory size: sys.getsizeof plus deep pandas usage, recursing a few levels into containers."""
+    if hasattr(value, "memory_usage") and not isinstance(value, type):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, "sum") else usage)
+    size = sys.getsizeof(value)
+    if depth > 0:
+        if isinstance(value, dict):
+            size += sum(_memory_size(k, depth - 1) + _memory_size(v, depth - 1) for k, v in value.items())
+        elif isinstance(value, (list, tuple, set)):
+            size += sum(_memory_size(v, depth - 1) for v in value)
+    return size
+
+
+class ModelRegistry:
+    """
+    Process-wide LRU store of fitted models and their evaluation results.
+    Entries are evicted least-recently-used first once either the entry count
+    or the estimated byte size goes over its limit.
+    """
+
+    def __init__(self, max_entries=16, max_bytes=256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.train_seconds = 0.0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            return None
+
+    def put(self, key, value):
+        size = _estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._entries.pop(key)
+                self._sizes.pop(key, None)
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._evict()
+
+    def get_or_train(self, key, train_fn):
+        """Return the cached entry for `key`, calling `train_fn()` once on a miss."""
+        value = self.get(key)
+        if value is not None:
+            return value, True
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # Concurrent sessions uploading the same file wait for a single fit
+        with key_lock:
+            try:
+                value = self.get(key)
+                if value is not None:
+                    return value, True
+                start = time.perf_counter()
+                value = train_fn()
+                elapsed = time.perf_counter() - start
+                self.put(key, value)
+                with self._lock:
+                    self.misses += 1
+                    self.train_seconds += elapsed
+            finally:
+                # Also on a hit or a failed fit, so per-key locks never pile up
+                with self._lock:
+                    if self._key_locks.get(key) is key_lock:
+                        del self._key_locks[key]
+        return value, False
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.max_entries or sum(self._sizes.values()) > self.max_bytes
+        ):
+            if len(self._entries) == 1:
+                break
+            old_key, _ = self._entries.popitem(last=False)
+            self._sizes.pop(old_key, None)
+            self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": sum(self._sizes.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "train_seconds": self.train_seconds,
+            }
+
+
+@st.cache_resource
+def get_model_registry():
+    """Single registry shared by every Streamlit session in this process."""
+    return ModelRegistry()
+
+
+def show_registry_stats(registry):
+    s = registry.stats()
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Cached models", s["entries"])
+    c2.metric("Cache hits", s["hits"])
+    c3.metric("Cache misses", s["misses"])
+    c4.metric("Hit rate", f"{s['hit_rate'] * 100:.0f}%")
+    st.caption(f"~{s['bytes'] / 1024:.0f} KB cached · {s['evictions']} evictions · {s['train_seconds']:.2f}s spent training")
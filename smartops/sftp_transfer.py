@@ -0,0 +1,282 @@
+import gzip
+import hashlib
+import json
+import os
+import queue
+import shlex
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from smartops.ssh_pool import get_ssh_pool
+from smartops.ssh_stream import run_command
+
+UPLOAD = "upload"
+DOWNLOAD = "download"
+CHUNK_SIZE = 8 * 1024 * 1024
+BLOCK_SIZE = 32 * 1024  # one SFTP request; paramiko pipelines these without waiting for acks
+DEFAULT_STREAMS = 4
+# Parallel streams share the connection's channel slots (MaxSessions) with commands and samplers
+MAX_STREAMS = 6
+STATE_DIR = os.path.join("data", ".cache", "transfers")
+
+
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def remote_sha256(client, path):
+    """sha256 of a remote file via sha256sum, or None when the host cannot compute it."""
+    status, out = run_command(client, f"sha256sum -- {shlex.quote(path)}", timeout=3600)
+    token = out.split()[0] if out.split() else ""
+    return token if status == 0 and len(token) == 64 else None
+
+
+class Transfer:
+    """
+    One file moved between this machine and an SSH host in fixed-size chunks.
+    `streams` workers each open their own channel and take chunks from a shared
+    queue. Chunks go over pipelined SFTP, or, with `compress`, gzip-compressed
+    through `dd` on an exec channel. Finished chunks are recorded in a state
+    file so an interrupted transfer resumes where it stopped.
+    """
+
+    def __init__(self, client, host, direction, local_path, remote_path, streams=DEFAULT_STREAMS,
+                 chunk_size=CHUNK_SIZE, compress=False, verify=True):
+        self.client = client
+        self.host = host
+        self.direction = direction
+        self.local_path = os.path.abspath(local_path)
+        self.remote_path = remote_path
+        self.streams = max(1, min(streams, MAX_STREAMS))
+        self.chunk_size = chunk_size
+        self.compress = compress
+        self.verify = verify
+        self.size = None
+        self.status = "queued"
+        self.error = None
+        self.verified = None
+        self.bytes_done = 0
+        self.bytes_resumed = 0
+        self.wire_bytes = 0
+        self.started = None
+        self.duration = None
+        self._done_chunks = set()
+        self._state = None
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+
+    # ---- resume state ----
+    def _state_path(self, source_mtime):
+        key = json.dumps([self.direction, self.host, self.local_path, self.remote_path,
+                          self.size, source_mtime, self.chunk_size])
+        return os.path.join(STATE_DIR, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def _load_state(self, path):
+        try:
+            with open(path) as f:
+                return set(json.load(f)["done"])
+        except (OSError, ValueError, KeyError):
+            return set()
+
+    def _save_state(self):
+        with open(self._state, "w") as f:
+            json.dump({"host": self.host, "remote": self.remote_path, "local": self.local_path,
+                       "done": sorted(self._done_chunks)}, f)
+
+    # ---- chunk transports ----
+    def _ranges(self):
+        return [(i, i * self.chunk_size, min(self.chunk_size, self.size - i * self.chunk_size))
+                for i in range((self.size + self.chunk_size - 1) // self.chunk_size)]
+
+    def _advance(self, n, wire=None):
+        with self._lock:
+            self.bytes_done += n
+            self.wire_bytes += n if wire is None else wire
+
+    def _sftp_upload(self, remote, src, offset, length):
+        src.seek(offset)
+        remote.seek(offset)
+        while length > 0:
+            data = src.read(min(BLOCK_SIZE, length))
+            remote.write(data)
+            length -= len(data)
+            self._advance(len(data))
+        remote.flush()
+
+    def _sftp_download(self, remote, dst, offset, length):
+        dst.seek(offset)
+        blocks = [(o, min(BLOCK_SIZE, offset + length - o)) for o in range(offset, offset + length, BLOCK_SIZE)]
+        for data in remote.readv(blocks):
+            dst.write(data)
+            self._advance(len(data))
+
+    def _exec(self, command, payload=None):
+        channel = self.client.get_transport().open_session()
+        try:
+            channel.exec_command(command)
+            if payload is not None:
+                channel.sendall(payload)
+                channel.shutdown_write()
+            received = []
+            for data in iter(lambda: channel.recv(1024 * 1024), b""):
+                received.append(data)
+            status = channel.recv_exit_status()
+            if status != 0:
+                err = channel.recv_stderr(4096).decode("utf-8", errors="replace").strip()
+                raise RuntimeError(err or f"'{command.split()[0]}' exited with {status}")
+            return b"".join(received)
+        finally:
+            channel.close()
+
+    def _gzip_upload(self, src, index, offset, length):
+        src.seek(offset)
+        packed = gzip.compress(src.read(length), compresslevel=1)
+        target = shlex.quote(self.remote_path)
+        self._exec(f"gzip -dc | dd of={target} ibs=65536 obs={self.chunk_size} seek={index} conv=notrunc 2>/dev/null",
+                   packed)
+        self._advance(length, len(packed))
+
+    def _gzip_download(self, dst, index, offset, length):
+        source = shlex.quote(self.remote_path)
+        packed = self._exec(f"dd if={source} ibs={self.chunk_size} skip={index} count=1 obs=65536 2>/dev/null | gzip -1c")
+        data = gzip.decompress(packed)
+        if len(data) != length:
+            raise RuntimeError(f"chunk {index}: got {len(data)} bytes, expected {length}")
+        dst.seek(offset)
+        dst.write(data)
+        self._advance(length, len(packed))
+
+    def _worker(self, chunks):
+        local_mode = "rb" if self.direction == UPLOAD else "r+b"
+        with get_ssh_pool().channel_slot(self.client), open(self.local_path, local_mode) as local:
+            sftp = remote = None
+            if not self.compress:
+                sftp = self.client.open_sftp()
+                remote = sftp.open(self.remote_path, "r+b" if self.direction == UPLOAD else "rb")
+                remote.set_pipelined(True)
+            try:
+                while not self._cancel.is_set():
+                    try:
+                        index, offset, length = chunks.get_nowait()
+                    except queue.Empty:
+                        return
+                    if self.compress:
+                        (self._gzip_upload if self.direction == UPLOAD else self._gzip_download)(local, index, offset, length)
+                    elif self.direction == UPLOAD:
+                        self._sftp_upload(remote, local, offset, length)
+                    else:
+                        self._sftp_download(remote, local, offset, length)
+                    local.flush()
+                    with self._lock:
+                        self._done_chunks.add(index)
+                        self._save_state()
+            except Exception:
+                # Stop the sibling workers; the state file keeps what finished
+                self._cancel.set()
+                raise
+            finally:
+                if remote is not None:
+                    remote.close()
+                    sftp.close()
+
+    # ---- driver ----
+    def _prepare(self):
+        sftp = self.client.open_sftp()
+        try:
+            info = os.stat(self.local_path) if self.direction == UPLOAD else sftp.stat(self.remote_path)
+            self.size, mtime = info.st_size, int(info.st_mtime)
+            os.makedirs(STATE_DIR, exist_ok=True)
+            self._state = self._state_path(mtime)
+            self._done_chunks = self._load_state(self._state)
+            if self.direction == UPLOAD:
+                if not self._done_chunks:
+                    sftp.open(self.remote_path, "wb").close()
+            else:
+                os.makedirs(os.path.dirname(self.local_path) or ".", exist_ok=True)
+                if not self._done_chunks or not os.path.exists(self.local_path):
+                    self._done_chunks = set()
+                    open(self.local_path, "wb").close()
+        finally:
+            sftp.close()
+
+    def _finish(self):
+        if self.direction == UPLOAD:
+            sftp = self.client.open_sftp()
+            try:
+                sftp.truncate(self.remote_path, self.size)
+            finally:
+                sftp.close()
+        else:
+            os.truncate(self.local_path, self.size)
+        if self.verify:
+            self.status = "verifying"
+            with ThreadPoolExecutor(2) as pool:
+                remote = pool.submit(remote_sha256, self.client, self.remote_path)
+                local = pool.submit(sha256_file, self.local_path)
+            if remote.result() is None:
+                self.verified = None
+            else:
+                self.verified = remote.result() == local.result()
+                if not self.verified:
+                    raise RuntimeError("sha256 mismatch after transfer")
+        os.remove(self._state)
+
+    def run(self):
+        self.status = "running"
+        self.started = time.perf_counter()
+        try:
+            self._prepare()
+            pending = [c for c in self._ranges() if c[0] not in self._done_chunks]
+            self.bytes_resumed = self.size - sum(length for _, _, length in pending)
+            chunks = queue.Queue()
+            for chunk in pending:
+                chunks.put(chunk)
+            self._save_state()
+            workers = min(self.streams, max(1, len(pending)))
+            with ThreadPoolExecutor(workers, thread_name_prefix="sftp") as pool:
+                for future in [pool.submit(self._worker, chunks) for _ in range(workers)]:
+                    future.result()
+            if self._cancel.is_set():
+                self.status = "cancelled"
+                return
+            self._finish()
+            self.status = "ok"
+        except Exception as e:
+            self._cancel.set()
+            self.status, self.error = "error", str(e)
+            if self.verified is False and os.path.exists(self._state):
+                # Corrupt result: the next attempt must start from scratch
+                os.remove(self._state)
+        finally:
+            self.duration = time.perf_counter() - self.started
+
+    def cancel(self):
+        self._cancel.set()
+
+    def throughput(self):
+        """MB/s of data actually moved in this run (resumed chunks excluded)."""
+        elapsed = (self.duration if self.duration is not None
+                   else time.perf_counter() - self.started if self.started else 0)
+        return self.bytes_done / 1024 ** 2 / elapsed if elapsed else 0.0
+
+    def row(self):
+        total = self.size or 0
+        return {"host": self.host, "status": self.status,
+                "progress": f"{(self.bytes_done + self.bytes_resumed) / total * 100:.0f}%" if total else "-",
+                "size_mb": round(total / 1024 ** 2, 1), "resumed_mb": round(self.bytes_resumed / 1024 ** 2, 1),
+                "mb_per_s": round(self.throughput(), 1),
+                "wire_ratio": round(self.wire_bytes / self.bytes_done, 2) if self.bytes_done else None,
+                "sha256": {True: "ok", False: "mismatch", None: "-"}[self.verified], "error": self.error or ""}
+
+
+def start_transfers(transfers):
+    """Run transfers concurrently in the background; returns the list of futures."""
+    pool = ThreadPoolExecutor(max_workers=max(1, len(transfers)), thread_name_prefix="transfer")
+    futures = [pool.submit(t.run) for t in transfers]
+    pool.shutdown(wait=False)
+    return futures
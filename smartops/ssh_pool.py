@@ -0,0 +1,253 @@
+import contextlib
+import hashlib
+import socket
+import threading
+import time
+
+import paramiko
+import streamlit as st
+
+KEEPALIVE_SECONDS = 30
+IDLE_TIMEOUT = 15 * 60
+MAX_CHANNELS = 8
+# How long a caller waits for a free channel before giving up
+SLOT_TIMEOUT = 30
+
+
+class ChannelLimitError(RuntimeError):
+    """Every channel slot on a pooled connection stayed busy for the whole wait."""
+
+
+class PooledConnection:
+    def __init__(self, key, client, max_channels=MAX_CHANNELS):
+        self.key = key
+        self.client = client
+        self.created = time.time()
+        self.last_used = self.created
+        self.uses = 0
+        self.active_channels = 0
+        self.max_channels = max_channels
+        # OpenSSH refuses sessions beyond MaxSessions (10 by default); stay under it
+        self.channels = threading.BoundedSemaphore(max_channels)
+
+    @property
+    def host(self):
+        return self.key[0]
+
+    @property
+    def username(self):
+        return self.key[2]
+
+    def healthy(self):
+        transport = self.client.get_transport()
+        if transport is None or not transport.is_active() or not transport.is_authenticated():
+            return False
+        try:
+            transport.send_ignore()
+        except Exception:
+            return False
+        return True
+
+    def touch(self, use=True):
+        self.last_used = time.time()
+        if use:
+            self.uses += 1
+
+    def close(self):
+        try:
+            self.client.close()
+        except Exception:
+            pass
+
+
+def _set_nodelay(transport):
+    """
+    Disable Nagle on the transport's socket, as OpenSSH does: otherwise every small
+    request waits on the peer's delayed ACK (~40 ms per command).
+    """
+    try:
+        transport.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except (AttributeError, OSError):
+        pass  # not a TCP socket (e.g. a ProxyCommand)
+
+
+class SSHPool:
+    """
+    Process-wide pool of authenticated SSH transports keyed by host, port, user and a
+    credential fingerprint, so every page and session that connects with the same
+    login reuses one live transport and opens channels on it instead of redialing.
+    """
+
+    def __init__(self, idle_timeout=IDLE_TIMEOUT, keepalive=KEEPALIVE_SECONDS):
+        self.idle_timeout = idle_timeout
+        self.keepalive = keepalive
+        self._conns = {}
+        self._lock = threading.Lock()
+        self._dial_locks = {}
+        self.dials = 0
+        self.reuses = 0
+        self._reaper = threading.Thread(target=self._reap_loop, daemon=True)
+        self._reaper.start()
+
+    @staticmethod
+    def make_key(host, username, password, port=22):
+        fingerprint = hashlib.sha256(f"{username}\0{password}".encode("utf-8")).hexdigest()[:16]
+        return (host, int(port), username, fingerprint)
+
+    def connect(self, host, username, password, port=22, timeout=10):
+        """Return (key, SSHClient): a live pooled connection, dialing only if none is usable."""
+        key = self.make_key(host, username, password, port)
+        conn = self._live(key, reuse=True)
+        if conn is not None:
+            return key, conn.client
+        with self._lock:
+            dial_lock = self._dial_locks.setdefault(key, threading.Lock())
+        with dial_lock:
+            try:
+                conn = self._live(key, reuse=True)
+                if conn is not None:
+                    return key, conn.client
+                client = paramiko.SSHClient()
+                client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+                client.connect(
+                    hostname=host,
+                    port=int(port),
+                    username=username,
+                    password=password,
+                    timeout=timeout,
+                    look_for_keys=False,
+                    allow_agent=False,
+                )
+                transport = client.get_transport()
+                transport.set_keepalive(self.keepalive)
+                _set_nodelay(transport)
+                conn = PooledConnection(key, client)
+                conn.touch()
+                with self._lock:
+                    self._conns[key] = conn
+                    self.dials += 1
+            finally:
+                with self._lock:
+                    if self._dial_locks.get(key) is dial_lock:
+                        del self._dial_locks[key]
+        return key, client
+
+    def get(self, key):
+        """Live client for a key from an earlier `connect`, or None if it was closed or evicted."""
+        conn = self._live(key) if key else None
+        return conn.client if conn else None
+
+    def connection(self, key):
+        return self._live(key) if key else None
+
+    def _live(self, key, reuse=False):
+        """Healthy pooled connection for `key`; `reuse` counts it as a dial that was avoided."""
+        with self._lock:
+            conn = self._conns.get(key)
+        if conn is None:
+            return None
+        if not conn.healthy():
+            self._drop(key, conn)
+            return None
+        # Page reruns keep the login alive but are not counted as reuses
+        conn.touch(use=reuse)
+        if reuse:
+            with self._lock:
+                self.reuses += 1
+        return conn
+
+    @contextlib.contextmanager
+    def channel_slot(self, client, timeout=SLOT_TIMEOUT):
+        """
+        Hold one of the connection's channel slots while a channel is open on `client`.
+        Raises ChannelLimitError when none frees up within `timeout` seconds.
+        """
+        with self._lock:
+            conn = next((c for c in self._conns.values() if c.client is client), None)
+        if conn is None:
+            yield
+            return
+        if not conn.channels.acquire(timeout=timeout):
+            raise ChannelLimitError(f"all {conn.max_channels} SSH channels to {conn.username}@{conn.host} "
+                                    f"are busy; try again when a running command or transfer finishes")
+        # Open channels do not count as use (background samplers must not keep a login alive),
+        # but they do protect the connection from the idle reaper while they run
+        try:
+            with self._lock:
+                conn.active_channels += 1
+            try:
+                yield
+            finally:
+                with self._lock:
+                    conn.active_channels -= 1
+        finally:
+            conn.channels.release()
+
+    def _drop(self, key, conn):
+        with self._lock:
+            if self._conns.get(key) is conn:
+                del self._conns[key]
+        conn.close()
+
+    def close(self, key):
+        with self._lock:
+            conn = self._conns.pop(key, None)
+        if conn:
+            conn.close()
+
+    def _reap_loop(self):
+        while True:
+            time.sleep(min(60, max(1, self.idle_timeout / 4)))
+            self.reap()
+
+    def reap(self):
+        """Close connections idle longer than `idle_timeout` or whose transport died."""
+        now = time.time()
+        with self._lock:
+            items = list(self._conns.items())
+        for key, conn in items:
+            idle = conn.active_channels == 0 and now - conn.last_used > self.idle_timeout
+            if idle or not conn.healthy():
+                self._drop(key, conn)
+
+    def connections(self):
+        """Snapshot of pooled connections (for background samplers; does not touch idle timers)."""
+        with self._lock:
+            return list(self._conns.values())
+
+    def stats(self):
+        with self._lock:
+            conns = list(self._conns.values())
+            return {
+                "connections": len(conns),
+                "dials": self.dials,
+                "reuses": self.reuses,
+                "hosts": [
+                    {"host": c.host, "user": c.username, "uses": c.uses,
+                     "idle_s": round(time.time() - c.last_used, 1)}
+                    for c in conns
+                ],
+            }
+
+
+@st.cache_resource
+def get_ssh_pool():
+    """One pool per server process, shared by every page and session."""
+    return SSHPool()
+
+
+def session_ssh_client():
+    """The current session's pooled client, refreshed from the pool on every rerun."""
+    client = get_ssh_pool().get(st.session_state.get("ssh_key"))
+    st.session_state.ssh_client = client
+    return client
+
+
+def session_host_label():
+    key = st.session_state.get("ssh_key")
+    return f"{key[2]}@{key[0]}" if key else "unknown"
+
+
+def show_pool_stats():
+    s = get_ssh_pool().stats()
+    st.caption(f"♻️ SSH pool: {s['connections']} live connection(s) · {s['dials']} dials · {s['reuses']} reuses")
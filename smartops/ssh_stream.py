@@ -0,0 +1,121 @@
+import codecs
+import select
+import time
+
+# Receive buffer grows while reads keep filling it, so bulk output takes few syscalls
+MIN_RECV = 32 * 1024
+MAX_RECV = 1024 * 1024
+POLL_SECONDS = 1.0
+
+STDOUT = "stdout"
+STDERR = "stderr"
+
+
+class CommandCancelled(RuntimeError):
+    """Raised from iteration once the command's `cancel` event is set; the channel is already closed."""
+
+
+class RemoteCommand:
+    """
+    Runs one command on a new channel of an SSH client and yields decoded
+    (stream, text) chunks as they arrive. The reader blocks in select() on the
+    channel's event pipe instead of spinning, so an idle command costs no CPU.
+    Chunks are at most MAX_RECV bytes; nothing is buffered beyond the current
+    chunk. After iteration `exit_status` holds the remote exit code. `timeout`
+    and the optional `cancel` event are checked at least every POLL_SECONDS,
+    even while the command is silent.
+    """
+
+    def __init__(self, client, command, get_pty=False, timeout=None, cancel=None):
+        self.client = client
+        self.command = command
+        self.get_pty = get_pty
+        self.timeout = timeout
+        self.cancel = cancel
+        self.exit_status = None
+        self.bytes_received = 0
+        self.first_byte_at = None
+        self.started = None
+        self.finished = None
+        self.channel = None
+
+    def __iter__(self):
+        from smartops.ssh_pool import get_ssh_pool
+
+        with get_ssh_pool().channel_slot(self.client):
+            self.started = time.perf_counter()
+            channel = self.client.get_transport().open_session()
+            self.channel = channel
+            try:
+                if self.get_pty:
+                    channel.get_pty()
+                channel.exec_command(self.command)
+                yield from self._read(channel)
+                self.exit_status = channel.recv_exit_status()
+            finally:
+                self.finished = time.perf_counter()
+                channel.close()
+
+    def _read(self, channel):
+        decoders = {
+            STDOUT: codecs.getincrementaldecoder("utf-8")(errors="replace"),
+            STDERR: codecs.getincrementaldecoder("utf-8")(errors="replace"),
+        }
+        sizes = {STDOUT: MIN_RECV, STDERR: MIN_RECV}
+        readers = {STDOUT: (channel.recv_ready, channel.recv), STDERR: (channel.recv_stderr_ready, channel.recv_stderr)}
+        deadline = time.monotonic() + self.timeout if self.timeout else None
+        fd = channel.fileno()
+
+        while True:
+            # Snapshot EOF before draining: everything sent before EOF is already buffered
+            eof = channel.eof_received or channel.closed
+            got_data = False
+            for stream, (ready, recv) in readers.items():
+                while ready():
+                    # Checked per chunk too: a command that never goes quiet must still time out
+                    self._check_stop(channel, deadline)
+                    data = recv(sizes[stream])
+                    if not data:
+                        break
+                    got_data = True
+                    if self.first_byte_at is None:
+                        self.first_byte_at = time.perf_counter()
+                    self.bytes_received += len(data)
+                    if len(data) >= sizes[stream]:
+                        sizes[stream] = min(sizes[stream] * 2, MAX_RECV)
+                    text = decoders[stream].decode(data)
+                    if text:
+                        yield stream, text
+            if got_data:
+                continue
+            if eof:
+                break
+            self._check_stop(channel, deadline)
+            wait = POLL_SECONDS if deadline is None else max(0.0, min(POLL_SECONDS, deadline - time.monotonic()))
+            select.select([fd], [], [], wait)
+
+        for stream, decoder in decoders.items():
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                yield stream, tail
+
+    def _check_stop(self, channel, deadline):
+        if self.cancel is not None and self.cancel.is_set():
+            channel.close()
+            raise CommandCancelled(f"command cancelled: {self.command}")
+        if deadline is not None and time.monotonic() > deadline:
+            channel.close()
+            raise TimeoutError(f"command timed out after {self.timeout}s: {self.command}")
+
+    @property
+    def duration(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+
+def run_command(client, command, get_pty=False, timeout=None, stderr_prefix="[ERROR] "):
+    """Run to completion; returns (exit status, combined output with stderr chunks prefixed)."""
+    cmd = RemoteCommand(client, command, get_pty=get_pty, timeout=timeout)
+    output = [text if stream == STDOUT else f"{stderr_prefix}{text}" for stream, text in cmd]
+    return cmd.exit_status, "".join(output)
@@ -0,0 +1,155 @@
+import gzip
+import os
+import shutil
+import tempfile
+import time
+from collections import deque
+
+TAIL_LINES = 500
+# Longer lines are hard-wrapped, so output without newlines is still drawn in bounded pieces
+MAX_LINE_CHARS = 4096
+FLUSH_SECONDS = 0.1
+SPOOL_DIR = os.path.join(tempfile.gettempdir(), "smartops-output")
+# Spools outlive their page (downloads, history); older or excess files are removed as new ones are created
+SPOOL_MAX_AGE = 24 * 3600
+SPOOL_MAX_BYTES = 512 * 1024 ** 2
+
+
+def prune_dir(directory, max_age=SPOOL_MAX_AGE, max_bytes=SPOOL_MAX_BYTES, keep=()):
+    """
+    Delete entries older than `max_age`, then the oldest until the rest fit in
+    `max_bytes`. Sub-directories count as one entry (newest mtime, total size);
+    paths in `keep` are never removed.
+    """
+    entries = []
+    now = time.time()
+    keep = {os.path.abspath(p) for p in keep}
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return
+    for name in names:
+        full = os.path.join(directory, name)
+        if os.path.abspath(full) in keep:
+            continue
+        try:
+            mtime, size = _entry_stats(full)
+        except OSError:
+            continue
+        if now - mtime > max_age:
+            discard(full)
+        else:
+            entries.append((mtime, size, full))
+    total = sum(size for _, size, _ in entries)
+    for _, size, full in sorted(entries):
+        if total <= max_bytes:
+            break
+        discard(full)
+        total -= size
+
+
+def _entry_stats(path):
+    st_ = os.stat(path)
+    if not os.path.isdir(path):
+        return st_.st_mtime, st_.st_size
+    mtime, size = st_.st_mtime, 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                f = os.stat(os.path.join(root, name))
+            except OSError:
+                continue
+            mtime, size = max(mtime, f.st_mtime), size + f.st_size
+    return mtime, size
+
+
+def discard(path):
+    """Remove a spool (or other scratch) file or directory if it is still there."""
+    if not path:
+        return
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+        return
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class StreamRenderer:
+    """
+    Renders a growing text stream into a Streamlit placeholder without
+    redrawing the full history: only the last `tail_lines` lines are kept in a
+    ring buffer and the placeholder is refreshed at most every `flush_seconds`.
+    Lines (and the unfinished last line) are wrapped at `max_line_chars`.
+    Everything received is spooled to a temp file (gzip when `compress`) for download.
+    """
+
+    def __init__(self, holder, stats_holder=None, tail_lines=TAIL_LINES, flush_seconds=FLUSH_SECONDS, language="bash",
+                 compress=False, max_line_chars=MAX_LINE_CHARS):
+        self.holder = holder
+        self.max_line_chars = max_line_chars
+        self.stats_holder = stats_holder
+        self.flush_seconds = flush_seconds
+        self.language = language
+        self.tail = deque(maxlen=tail_lines)
+        self.partial = ""
+        self.lines = 0
+        self.chars = 0
+        self.bytes = 0
+        self.started = time.perf_counter()
+        self._last_flush = 0.0
+        os.makedirs(SPOOL_DIR, exist_ok=True)
+        prune_dir(SPOOL_DIR)
+        fd, self.spool_path = tempfile.mkstemp(dir=SPOOL_DIR, prefix="cmd-", suffix=".log.gz" if compress else ".log")
+        if compress:
+            os.close(fd)
+            self._spool = gzip.open(self.spool_path, "wt", encoding="utf-8", compresslevel=6)
+        else:
+            self._spool = os.fdopen(fd, "w", encoding="utf-8")
+
+    def feed(self, text, total_bytes=None):
+        self._spool.write(text)
+        self.chars += len(text)
+        self.bytes = total_bytes if total_bytes is not None else self.chars
+        parts = (self.partial + text).split("\n")
+        self.partial = parts.pop()
+        cap = self.max_line_chars
+        if len(self.partial) > cap:
+            # Only the unfinished remainder stays pending; full-width pieces become lines
+            cut = len(self.partial) - len(self.partial) % cap
+            parts.append(self.partial[:cut])
+            self.partial = self.partial[cut:]
+        for part in parts:
+            if len(part) > cap:
+                pieces = [part[i:i + cap] for i in range(0, len(part), cap)]
+                self.lines += len(pieces)
+                self.tail.extend(pieces)
+            else:
+                self.lines += 1
+                self.tail.append(part)
+        if time.perf_counter() - self._last_flush >= self.flush_seconds:
+            self.flush()
+
+    def flush(self):
+        self._last_flush = time.perf_counter()
+        visible = "\n".join(self.tail)
+        if self.partial:
+            visible = f"{visible}\n{self.partial}" if visible else self.partial
+        self.holder.code(visible, language=self.language)
+        if self.stats_holder is not None:
+            self.stats_holder.caption(self.stats_text())
+
+    def stats_text(self):
+        elapsed = max(time.perf_counter() - self.started, 1e-6)
+        shown = f" · showing last {len(self.tail):,}" if self.lines > len(self.tail) else ""
+        return (f"{self.lines:,} lines · {self.bytes / 1024:,.1f} KB received · "
+                f"{self.lines / elapsed:,.0f} lines/s · {elapsed:.1f}s{shown}")
+
+    def close(self):
+        """Final flush; returns the spool file path."""
+        if self.partial:
+            self.lines += 1
+        self.flush()
+        self._spool.close()
+        return self.spool_path
@@ -1,13 +1,52 @@
+import importlib
+import importlib.util
+import sys
+import time
+import types
 import streamlit as st
 
-# Availability flags
+# Seconds spent importing each module through timed_import / lazy_import
+IMPORT_TIMES = {}
+
+# Availability flags (spec lookup only; nothing is imported here)
 def _check(pkg):
     try:
-        __import__(pkg)
-        return True
+        return importlib.util.find_spec(pkg) is not None
     except Exception:
         return False
 
+def timed_import(name):
+    """Import `name` and record how long it took the first time."""
+    if name in sys.modules:
+        return sys.modules[name]
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    IMPORT_TIMES.setdefault(name, time.perf_counter() - start)
+    return module
+
+class LazyModule(types.ModuleType):
+    """Module proxy that performs the real import on first attribute access."""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            module = timed_import(self.__name__)
+            self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+def lazy_import(name):
+    return LazyModule(name)
+
 CV2_AVAILABLE = _check("cv2")
 MEDIAPIPE_AVAILABLE = _check("mediapipe")
 WEBRTC_AVAILABLE = _check("streamlit_webrtc")
@@ -15,6 +54,10 @@ SKLEARN_AVAILABLE = _check("sklearn")
 MATPLOTLIB_AVAILABLE = _check("matplotlib") and _check("seaborn")
 DOCKER_AVAILABLE = _check("docker")
 TF_AVAILABLE = _check("tensorflow")
+PYARROW_AVAILABLE = _check("pyarrow")
+
+# st.fragment replaced st.experimental_fragment in Streamlit 1.37
+fragment = getattr(st, "fragment", None) or st.experimental_fragment
 
 def initialize_app():
     """
@@ -31,3 +74,15 @@ def show_page_header(title, subtitle=None):
         st.title(title)
         if subtitle:
             st.caption(subtitle)
+
+def show_import_report():
+    """Per-module import cost recorded so far in this process."""
+    if not IMPORT_TIMES:
+        st.caption("No modules imported yet.")
+        return
+    rows = sorted(IMPORT_TIMES.items(), key=lambda kv: kv[1], reverse=True)
+    st.dataframe(
+        [{"module": name, "import_ms": round(seconds * 1000, 1)} for name, seconds in rows],
+        use_container_width=True, hide_index=True,
+    )
+    st.caption(f"Total: {sum(IMPORT_TIMES.values()) * 1000:.0f} ms")
@@ -0,0 +1,42 @@
+import logging
+
+import pytest
+
+from benchmarks.fake_ssh import FakeSSHServer
+
+
+class RecordingHolder:
+    """Stands in for st.empty(); keeps what the renderer last drew."""
+
+    def __init__(self):
+        self.text = ""
+        self.caption_text = ""
+
+    def code(self, text, **kwargs):
+        self.text = text
+
+    def caption(self, text, **kwargs):
+        self.caption_text = text
+
+
+@pytest.fixture(scope="session")
+def fake_ssh():
+    """In-process fake SSH server (see benchmarks/fake_ssh.py)."""
+    # Clients hanging up mid-command is routine in these tests
+    logging.getLogger("paramiko").addHandler(logging.NullHandler())
+    with FakeSSHServer(output_bytes=4096) as server:
+        yield server
+
+
+@pytest.fixture
+def ssh_client(fake_ssh):
+    """Pooled client for the fake server, as the pages get it from the session's login."""
+    from smartops.ssh_pool import get_ssh_pool
+
+    _, client = get_ssh_pool().connect("127.0.0.1", fake_ssh.username, fake_ssh.password, port=fake_ssh.port)
+    return client
+
+
+@pytest.fixture
+def holder():
+    return RecordingHolder()
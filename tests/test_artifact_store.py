@@ -0,0 +1,71 @@
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from smartops.artifact_store import ArtifactStore
+
+ARCH = {"layers": [8, 4, 1]}
+
+
+def _save(store, params=None, before_publish=None):
+    return store.save("churn", "d" * 64, ARCH, params or {"epochs": 5}, {"mean": [0.5]},
+                      [np.ones((2, 2)), np.zeros(3)], {"accuracy": np.float64(0.9)}, before_publish)
+
+
+def test_publish_and_load(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    first = _save(store)
+    second = _save(store, {"epochs": 10})
+    assert [os.path.basename(p) for p in (first, second)] == ["v0001", "v0002"]
+
+    loaded = store.load(second)
+    assert loaded["meta"]["version"] == 2
+    assert loaded["scaler"] == {"mean": [0.5]}
+    np.testing.assert_array_equal(loaded["weights"][0], np.ones((2, 2)))
+    assert loaded["metrics"] == {"accuracy": 0.9}
+
+    assert store.find("churn", "d" * 64, ARCH) == second
+    assert store.find("churn", "d" * 64, ARCH, {"epochs": 5}) == first
+    assert store.find("churn", "d" * 64, ARCH, {"epochs": 99}) is None
+    assert store.find("churn", "e" * 64, ARCH) is None
+
+
+def test_vetoed_version_is_rolled_back(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    published = _save(store)
+
+    def veto(tmp):
+        with open(os.path.join(tmp, "inference.npz"), "wb") as f:
+            f.write(b"partial")
+        raise ValueError("export failed")
+
+    with pytest.raises(ValueError):
+        _save(store, before_publish=veto)
+    family = os.path.dirname(published)
+    # No new version and no scratch directory left behind
+    assert os.listdir(family) == ["v0001"]
+    assert store.find("churn", "d" * 64, ARCH) == published
+
+
+def test_extra_files_are_published(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+
+    def export(tmp):
+        np.savez(os.path.join(tmp, "inference.npz"), np.arange(3))
+
+    path = _save(store, before_publish=export)
+    assert sorted(os.listdir(path)) == ["inference.npz", "meta.json", "metrics.json", "scaler.pkl", "weights.npz"]
+
+
+def test_concurrent_writers_get_distinct_versions(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    paths = []
+    threads = [threading.Thread(target=lambda: paths.append(_save(store))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(os.path.basename(p) for p in paths) == [f"v{i:04d}" for i in range(1, 9)]
+    assert all(store.load(p)["meta"]["version"] == int(os.path.basename(p)[1:]) for p in paths)
@@ -0,0 +1,39 @@
+import json
+
+from smartops.docker_backend import CliBackend, _ports, _size, parse_ps
+
+
+def _row(i, **extra):
+    return json.dumps({"ID": f"{i:064x}", "Names": f"web-{i}", "Image": "nginx:latest", "State": "running",
+                       "Status": "Up 2 hours", "Ports": "0.0.0.0:80->80/tcp", **extra})
+
+
+def test_parse_ps_rows():
+    containers = parse_ps(f"{_row(1)}\n{_row(2, State='exited', Ports='')}\n")
+    assert list(containers) == [f"{1:064x}", f"{2:064x}"]
+    assert containers[f"{2:064x}"] == {"id": f"{2:064x}", "name": "web-2", "image": "nginx:latest",
+                                       "state": "exited", "status": "Up 2 hours", "ports": ""}
+
+
+def test_parse_ps_skips_noise():
+    # Warnings, a pty's carriage returns and truncated JSON must not break the listing
+    output = f"WARNING: something\r\n  {_row(1)}\r\n{{\"ID\": \"trunc\n\n"
+    assert list(parse_ps(output)) == [f"{1:064x}"]
+    assert parse_ps("") == {}
+
+
+def test_cli_backend_filters_by_id():
+    commands = []
+
+    def run(command):
+        commands.append(command)
+        return 0, _row(1)
+
+    assert list(CliBackend(run).list_containers({"b", "a"})) == [f"{1:064x}"]
+    assert commands[0].endswith("--filter id=a --filter id=b")
+
+
+def test_api_formatting_matches_cli():
+    ports = [{"PrivatePort": 443, "Type": "tcp"}, {"IP": "0.0.0.0", "PrivatePort": 80, "PublicPort": 8080, "Type": "tcp"}]
+    assert _ports(ports) == "0.0.0.0:8080->80/tcp, 443/tcp"
+    assert (_size(512), _size(1500), _size(2_500_000_000)) == ("512B", "1.5kB", "2.5GB")
@@ -0,0 +1,35 @@
+import time
+
+from smartops.docker_logs import LogFilter, MAX_LINE_CHARS, stream_logs
+from smartops.stream_render import StreamRenderer, discard
+
+
+def _fetch(client, holder, follow=False, follow_seconds=None, log_filter=None):
+    renderer = StreamRenderer(holder, flush_seconds=0)
+    log_filter = log_filter or LogFilter()
+    started = time.monotonic()
+    try:
+        stream_logs(client, "web", renderer, log_filter, follow=follow, follow_seconds=follow_seconds)
+    finally:
+        discard(renderer.close())
+    return holder.text.split("\n"), time.monotonic() - started
+
+
+def test_long_lines_are_clipped(ssh_client, holder):
+    lines, _ = _fetch(ssh_client, holder)
+    # stdout and stderr interleave in arrival order
+    assert sorted(lines) == ["ERROR failed to bind", "INFO started", "WARN slow request", "x" * MAX_LINE_CHARS]
+
+
+def test_filter_runs_before_rendering(ssh_client, holder):
+    log_filter = LogFilter(level="WARN")
+    lines, _ = _fetch(ssh_client, holder, log_filter=log_filter)
+    assert sorted(lines) == ["ERROR failed to bind", "WARN slow request"]
+    assert log_filter.dropped == 2
+
+
+def test_follow_stops_after_window(ssh_client, holder):
+    lines, elapsed = _fetch(ssh_client, holder, follow=True, follow_seconds=1)
+    # The stream never goes quiet, so only the deadline can end it
+    assert 0.9 < elapsed < 3
+    assert any(line.startswith("INFO tick") for line in lines)
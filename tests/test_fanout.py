@@ -0,0 +1,35 @@
+import time
+
+from smartops.fanout import FanOutRun, parse_host
+
+
+def _wait(run, seconds):
+    deadline = time.monotonic() + seconds
+    while not run.done() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return run.done()
+
+
+def test_parse_host():
+    assert parse_host("web1", "root") == ("web1", 22, "root")
+    assert parse_host("deploy@web2:2222", "root") == ("web2", 2222, "deploy")
+
+
+def test_cancel_stops_silent_command(fake_ssh):
+    entry = f"{fake_ssh.username}@127.0.0.1:{fake_ssh.port}"
+    run = FanOutRun([entry], "sleep 600", fake_ssh.username, fake_ssh.password, timeout=600)
+    deadline = time.monotonic() + 5
+    while run.results[entry].status != "running" and time.monotonic() < deadline:
+        time.sleep(0.05)
+    time.sleep(0.3)
+    run.cancel()
+    # The command never prints, so only the poll between reads can notice the cancel
+    assert _wait(run, 3)
+    assert run.results[entry].status == "cancelled"
+
+
+def test_timeout_on_silent_command(fake_ssh):
+    entry = f"{fake_ssh.username}@127.0.0.1:{fake_ssh.port}"
+    run = FanOutRun([entry], "sleep 600", fake_ssh.username, fake_ssh.password, timeout=1)
+    assert _wait(run, 5)
+    assert run.results[entry].status == "timeout"
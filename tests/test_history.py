@@ -0,0 +1,38 @@
+from smartops.history import CommandHistory, MAX_OUTPUT_CHARS
+
+
+def _history(tmp_path, **kwargs):
+    return CommandHistory(str(tmp_path / "history.sqlite3"), **kwargs)
+
+
+def test_retention_drops_oldest_runs_and_their_index(tmp_path):
+    history = _history(tmp_path, max_bytes=10_000)
+    ids = [history.record("web1", "linux", f"job{i}", 0, 0.1, f"marker{i} " + "." * 3000) for i in range(5)]
+    stats = history.stats()
+    assert stats["stored_bytes"] <= 10_000
+    assert stats["runs"] == 3
+    assert history.output(ids[0]) is None
+    assert history.output(ids[-1]).startswith("marker4")
+    if history.fts:
+        # Deleted runs are gone from the full-text index as well
+        assert history.search("marker0") == []
+        assert [r["command"] for r in history.search("marker4")] == ["job4"]
+
+
+def test_large_output_is_compressed_and_capped(tmp_path):
+    history = _history(tmp_path)
+    output = "line\n" * (MAX_OUTPUT_CHARS // 4)
+    run_id = history.record("web1", "linux", "yes line", 0, 1.0, output)
+    stored = history.output(run_id)
+    assert len(stored) < len(output)
+    assert "chars omitted" in stored
+    assert history.stats()["stored_bytes"] < MAX_OUTPUT_CHARS // 100
+
+
+def test_search_filters(tmp_path):
+    history = _history(tmp_path)
+    history.record("web1", "linux", "df -h", 0, 0.1, "disk ok")
+    history.record("db1", "docker", "docker ps", 0, 0.1, "kernel panic")
+    assert [r["host"] for r in history.search(host="db1")] == ["db1"]
+    assert [r["command"] for r in history.search("df")] == ["df -h"]
+    assert history.hosts() == ["db1", "web1"]
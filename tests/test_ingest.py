@@ -0,0 +1,45 @@
+import io
+
+import pandas as pd
+import pytest
+
+from smartops import ingest
+
+CSV = "id,sex,name,fare\n" + "".join(f"{i},{'male' if i % 3 else 'female'},Name {i},{i * 1.5}\n" for i in range(100))
+
+
+def test_sample_schema_kinds():
+    kinds = ingest.sample_schema(io.StringIO(CSV))
+    assert kinds == {"id": "int", "sex": "category", "name": "string", "fare": "float"}
+
+
+def test_chunked_read_keeps_categories_across_chunks():
+    df, chunks = ingest.read_csv_chunked(io.StringIO(CSV), chunksize=30)
+    assert chunks == 4
+    assert isinstance(df["sex"].dtype, pd.CategoricalDtype)
+    assert set(df["sex"].cat.categories) == {"male", "female"}
+    assert len(df) == 100
+
+
+@pytest.mark.skipif(not ingest.PYARROW_AVAILABLE, reason="pyarrow not installed")
+def test_usecols_miss_caches_only_those_columns(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest, "CACHE_DIR", str(tmp_path))
+    path = tmp_path / "data.csv"
+    path.write_text(CSV)
+    usecols = ["fare", "sex"]
+
+    df, stats = ingest.load_csv(str(path), cache_key="data", usecols=usecols)
+    assert stats.source == "csv"
+    assert list(df.columns) == usecols
+    [cached] = tmp_path.glob("*.feather")
+    assert pd.read_feather(cached).columns.tolist() == usecols
+
+    again, stats = ingest.load_csv(str(path), cache_key="data", usecols=usecols)
+    assert stats.source == "cache"
+    assert "memory not traced" in stats.summary()
+    pd.testing.assert_frame_equal(again, df)
+
+    # Other columns are a different cache entry, not a read of the narrower file
+    full, stats = ingest.load_csv(str(path), cache_key="data")
+    assert stats.source == "csv"
+    assert full.shape == (100, 4)
@@ -0,0 +1,47 @@
+import time
+
+from smartops.llm_cache import ResponseCache, cache_key
+
+
+def test_key_ignores_whitespace_but_not_params():
+    assert cache_key("a  b\n", "m") == cache_key(" a b", "m")
+    assert cache_key("a b", "m", {"temperature": 0.2}) != cache_key("a b", "m", {"temperature": 0.9})
+
+
+def test_entries_expire(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"))
+    cache.put("k", "m", "answer", 1.5, ttl=0.2)
+    assert cache.get("k") == ("answer", 1.5)
+    time.sleep(0.3)
+    assert cache.get("k") is None
+    assert (cache.memory_hits, cache.misses) == (1, 1)
+    assert cache.stats()["disk_entries"] == 0
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    ResponseCache(path).put("k", "m", "answer", 2.0)
+    cache = ResponseCache(path)
+    assert cache.get("k") == ("answer", 2.0)
+    assert cache.disk_hits == 1
+    assert cache.get("k") == ("answer", 2.0)
+    assert cache.memory_hits == 1
+
+
+def test_unpersisted_entries_stay_in_memory(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ResponseCache(path)
+    cache.put("k", "m", "private", 1.0, persist=False)
+    assert cache.get("k") == ("private", 1.0)
+    assert cache.stats()["disk_entries"] == 0
+    assert ResponseCache(path).get("k") is None
+
+
+def test_memory_tier_is_bounded(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), memory_entries=2)
+    for key in "abc":
+        cache.put(key, "m", key, 0.1)
+    assert cache.stats()["memory_entries"] == 2
+    # The evicted entry is still served from disk
+    assert cache.get("a") == ("a", 0.1)
+    assert cache.disk_hits == 1
@@ -0,0 +1,44 @@
+import os
+
+import pandas as pd
+import pytest
+
+from smartops.ml_pipeline import AGE_BY_CLASS, TitanicFeatures
+
+TITANIC = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "Titanic-Dataset.csv")
+
+
+@pytest.fixture(scope="module")
+def titanic():
+    return pd.read_csv(TITANIC)
+
+
+@pytest.fixture(scope="module")
+def features(titanic):
+    return TitanicFeatures().fit(titanic)
+
+
+def test_single_row_matches_batch(titanic, features):
+    batch = features.transform(titanic)
+    for i in (0, 5, 100, len(titanic) - 1):
+        row = features.transform(titanic.iloc[[i]])
+        assert list(row.columns) == features.columns
+        pd.testing.assert_frame_equal(row, batch.iloc[[i]])
+
+
+def test_unseen_levels_encode_as_zero(features):
+    passengers = pd.DataFrame([{"Pclass": 2, "Sex": "female", "Age": None, "SibSp": 42, "Parch": 0},
+                               {"Pclass": 3, "Sex": "male", "Age": 30, "SibSp": 1, "Parch": 2}])
+    out = features.transform(passengers)
+    assert list(out.columns) == features.columns
+    assert not out.iloc[0].filter(like="SibSp_").any()
+    assert out["Age"].iloc[0] == AGE_BY_CLASS[2]
+    # An unseen level in one row does not disturb the encoding of the others
+    assert (out["SibSp_1"].iloc[1], out["Parch_2"].iloc[1], out["Sex_male"].iloc[1]) == (1, 1, 1)
+
+
+def test_columns_survive_reordered_input(titanic, features):
+    shuffled = titanic.sample(frac=1, random_state=0)[::-1]
+    out = features.transform(shuffled)
+    assert list(out.columns) == features.columns
+    pd.testing.assert_frame_equal(out.loc[titanic.index], features.transform(titanic))
@@ -0,0 +1,62 @@
+import threading
+import time
+
+from smartops.model_registry import ModelRegistry, _estimate_size
+
+
+def test_lru_by_entry_count():
+    registry = ModelRegistry(max_entries=2)
+    registry.put("a", 1)
+    registry.put("b", 2)
+    assert registry.get("a") == 1  # "b" is now least recently used
+    registry.put("c", 3)
+    assert registry.get("b") is None
+    assert (registry.get("a"), registry.get("c")) == (1, 3)
+    assert registry.stats()["evictions"] == 1
+
+
+def test_size_limit_and_accounting():
+    blob = b"x" * 1000
+    registry = ModelRegistry(max_bytes=2500)
+    registry.put("a", blob)
+    registry.put("b", blob)
+    assert registry.stats()["bytes"] == 2 * _estimate_size(blob)
+    registry.put("c", blob)
+    assert registry.get("a") is None
+    assert registry.stats()["entries"] == 2
+    # Replacing an entry swaps its size instead of adding to it
+    registry.put("c", b"y")
+    assert registry.stats()["bytes"] == _estimate_size(blob) + _estimate_size(b"y")
+
+
+def test_oversized_entry_is_kept_alone():
+    registry = ModelRegistry(max_bytes=10)
+    registry.put("small", b"")
+    registry.put("big", b"x" * 1000)
+    assert registry.get("small") is None
+    assert registry.get("big") is not None
+
+
+def test_unpicklable_entries_are_sized():
+    assert _estimate_size({"lock": threading.Lock(), "data": list(range(100))}) > 0
+
+
+def test_concurrent_misses_train_once():
+    registry = ModelRegistry()
+    calls = []
+
+    def train():
+        calls.append(1)
+        time.sleep(0.2)
+        return "model"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get_or_train("k", train)))
+               for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert sorted(cached for _, cached in results) == [False, True, True, True]
+    assert registry.stats()["misses"] == 1
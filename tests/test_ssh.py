@@ -0,0 +1,74 @@
+import contextlib
+import time
+
+import pytest
+
+from smartops.devops_tools import execute_docker_command
+from smartops.ssh_pool import ChannelLimitError, SSHPool
+from smartops.ssh_stream import RemoteCommand, STDERR, STDOUT, run_command
+
+
+def test_remote_command_streams_both_streams(ssh_client):
+    cmd = RemoteCommand(ssh_client, "bench:100000:0:50")
+    received = {STDOUT: 0, STDERR: 0}
+    for stream, text in cmd:
+        received[stream] += len(text)
+    assert cmd.exit_status == 0
+    assert cmd.bytes_received == 100000
+    assert received[STDOUT] and received[STDERR]
+
+
+def test_run_command_exit_status(ssh_client):
+    assert run_command(ssh_client, "false") == (1, "")
+
+
+@pytest.mark.parametrize("command", ["sleep 600", "docker logs --follow web"])
+def test_timeout_fires_for_silent_and_chatty_commands(ssh_client, command):
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        for _ in RemoteCommand(ssh_client, command, timeout=1):
+            pass
+    assert time.monotonic() - started < 3
+
+
+def test_execute_docker_command(ssh_client):
+    status, out = execute_docker_command(ssh_client, "--version")
+    assert status == 0
+    assert out.startswith("Docker version")
+
+
+def test_execute_docker_command_reports_failure(fake_ssh):
+    pool = SSHPool()
+    key, client = pool.connect("127.0.0.1", fake_ssh.username, fake_ssh.password, port=fake_ssh.port)
+    pool.close(key)
+    status, out = execute_docker_command(client, "--version")
+    assert status == 1
+    assert out.startswith("[ERROR] Failed to execute Docker command")
+
+
+def test_pool_reuses_one_transport(fake_ssh):
+    pool = SSHPool()
+    key, client = pool.connect("127.0.0.1", fake_ssh.username, fake_ssh.password, port=fake_ssh.port)
+    again_key, again = pool.connect("127.0.0.1", fake_ssh.username, fake_ssh.password, port=fake_ssh.port)
+    assert (again_key, again) == (key, client)
+    assert (pool.dials, pool.reuses) == (1, 1)
+    # Reruns look the login up without counting a reuse
+    assert pool.get(key) is client
+    assert pool.reuses == 1
+    pool.close(key)
+    assert pool.get(key) is None
+
+
+def test_channel_slot_times_out_when_all_busy(fake_ssh):
+    pool = SSHPool()
+    key, client = pool.connect("127.0.0.1", fake_ssh.username, fake_ssh.password, port=fake_ssh.port)
+    conn = pool.connection(key)
+    with contextlib.ExitStack() as held:
+        for _ in range(conn.max_channels):
+            held.enter_context(pool.channel_slot(client))
+        assert conn.active_channels == conn.max_channels
+        with pytest.raises(ChannelLimitError):
+            with pool.channel_slot(client, timeout=0.1):
+                pass
+    assert conn.active_channels == 0
+    pool.close(key)
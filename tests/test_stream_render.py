@@ -0,0 +1,59 @@
+import gzip
+import os
+import time
+
+from smartops.stream_render import StreamRenderer, discard, prune_dir
+
+
+def _renderer(holder, **kwargs):
+    return StreamRenderer(holder, holder, flush_seconds=0, **kwargs)
+
+
+def test_tail_is_bounded_and_spool_is_complete(holder):
+    renderer = _renderer(holder, tail_lines=10)
+    text = "".join(f"line {i}\n" for i in range(1000))
+    for i in range(0, len(text), 77):
+        renderer.feed(text[i:i + 77])
+    spool = renderer.close()
+    try:
+        assert holder.text.split("\n") == [f"line {i}" for i in range(990, 1000)]
+        assert renderer.lines == 1000
+        assert "showing last 10" in holder.caption_text
+        with open(spool) as f:
+            assert f.read() == text
+    finally:
+        discard(spool)
+
+
+def test_long_and_unterminated_lines_are_wrapped(holder):
+    renderer = _renderer(holder, tail_lines=100, max_line_chars=10)
+    renderer.feed("a" * 25 + "\n")
+    renderer.feed("b" * 35)
+    # Only the unfinished remainder stays pending
+    assert renderer.partial == "b" * 5
+    assert holder.text.split("\n") == ["a" * 10, "a" * 10, "a" * 5, "b" * 10, "b" * 10, "b" * 10, "b" * 5]
+    discard(renderer.close())
+    assert renderer.lines == 7
+
+
+def test_compressed_spool(holder):
+    renderer = _renderer(holder, compress=True)
+    renderer.feed("hello\n" * 100)
+    spool = renderer.close()
+    try:
+        with gzip.open(spool, "rt") as f:
+            assert f.read() == "hello\n" * 100
+    finally:
+        discard(spool)
+
+
+def test_prune_dir_age_size_and_keep(tmp_path):
+    old, kept, big, new = (tmp_path / n for n in ("old", "kept", "big", "new"))
+    for path, size in ((old, 10), (kept, 10), (big, 100), (new, 10)):
+        path.write_bytes(b"x" * size)
+    week_ago = time.time() - 7 * 24 * 3600
+    os.utime(old, (week_ago, week_ago))
+    os.utime(kept, (week_ago, week_ago))
+    os.utime(big, (time.time() - 60, time.time() - 60))
+    prune_dir(str(tmp_path), max_age=24 * 3600, max_bytes=50, keep=[str(kept)])
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["kept", "new"]